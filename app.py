@@ -7,6 +7,10 @@ import atexit
 import signal
 import os
 from utils.data_loader import warm_up_cache
+from utils.export import register_export_routes
+from utils.metrics import register_metrics
+from utils.profiler import register_profiler
+from utils.compression import register_compression
 # Initialize Dash app
 app = dash.Dash(
     __name__, 
@@ -24,6 +28,22 @@ app.config.suppress_callback_exceptions = True
 # Set the layout
 app.layout = create_dashboard_layout()
 
+# Streaming event exports (CSV, Parquet, Arrow) served straight from Flask
+register_export_routes(app.server)
+
+# Per-callback latency histograms, served in Prometheus format at /metrics
+register_metrics(app.server)
+
+# Opt-in cProfile capture of callbacks (PROFILE_CALLBACKS=N or /profile?count=N)
+register_profiler(app.server)
+
+# Gzip responses for clients that accept it; registered last so it runs first
+# among the after_request hooks and the metrics above see the bytes sent
+register_compression(app.server)
+
+# WSGI entry point for production servers (see wsgi.py and gunicorn.conf.py)
+server = app.server
+
 # Function to clean up multiprocessing resources when the app exits
 def cleanup_resources():
     """Clean up multiprocessing resources to prevent semaphore leaks"""
@@ -38,18 +58,17 @@ def cleanup_resources():
     except:
         pass
 
-# Register the cleanup function to run when the program exits
-atexit.register(cleanup_resources)
-
 # Handle SIGTERM and SIGINT signals to ensure proper cleanup
 def signal_handler(sig, frame):
     cleanup_resources()
     os._exit(0)
 
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
-
 if __name__ == '__main__':
+    # Development server only: under gunicorn the arbiter owns the signals and
+    # shuts workers down gracefully (see gunicorn.conf.py)
+    atexit.register(cleanup_resources)
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
     
     # Set environment variable to limit semaphores
     os.environ["OBJC_DISABLE_INITIALIZE_FORK_SAFETY"] = "YES"
@@ -0,0 +1,327 @@
+/* Event Explorer clientside callbacks
+ *
+ * Two modes share the figure code below:
+ * - browser: the selected match's events arrive once as compact column arrays
+ *   (event_store.compact_event_arrays) and the summary, timeline, distribution
+ *   and heatmap are recomputed here on every slider or dropdown change
+ *   without a server round trip;
+ * - server: the server filters and bins the events per change
+ *   (event_store.explorer_views) and only the O(bins) aggregates are sent.
+ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    explorer: (function () {
+        var PITCH_LENGTH = 120;
+        var PITCH_WIDTH = 80;
+        // Plotly Express default colorway, so traces keep their usual colors
+        var COLORWAY = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+                        '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52'];
+        var LEGEND = {
+            orientation: 'h', yanchor: 'bottom', y: 1.02, xanchor: 'right', x: 1,
+            bgcolor: 'rgba(255,255,255,0.8)', bordercolor: 'rgba(0,0,0,0.1)', borderwidth: 1
+        };
+
+        function noUpdate() {
+            return window.dash_clientside.no_update;
+        }
+
+        function message(text) {
+            return {
+                data: [],
+                layout: {
+                    xaxis: {visible: false}, yaxis: {visible: false},
+                    annotations: [{text: text, xref: 'paper', yref: 'paper', x: 0.5, y: 0.5, showarrow: false}]
+                }
+            };
+        }
+
+        // Events of the spec's match are only usable once the store has caught up
+        function ready(spec, events) {
+            return spec && events && events.match_id === spec.match_id;
+        }
+
+        // Row indices selected by the spec (mirrors event_store._filtered_positions)
+        function select(spec, events, timeOnly) {
+            var start = spec.time_range[0], end = spec.time_range[1];
+            var typeCode = timeOnly || spec.event_type === 'all' || spec.event_type === 'Card'
+                ? null : events.types.indexOf(spec.event_type);
+            var playerCode = timeOnly || spec.player === 'all' ? null : events.players.indexOf(spec.player);
+            // -1 is also the code of a missing type or player; a value absent from this match selects nothing
+            if (typeCode === -1 || playerCode === -1) return [];
+            var cardsOnly = !timeOnly && spec.event_type === 'Card';
+            var rows = [];
+            for (var i = 0; i < events.minute.length; i++) {
+                var minute = events.minute[i];
+                if (minute < start || minute > end) continue;
+                if (typeCode !== null && events.type[i] !== typeCode) continue;
+                if (playerCode !== null && events.player[i] !== playerCode) continue;
+                if (cardsOnly && !events.card[i]) continue;
+                rows.push(i);
+            }
+            return rows;
+        }
+
+        function countBy(rows, codes) {
+            var counts = {};
+            rows.forEach(function (i) {
+                counts[codes[i]] = (counts[codes[i]] || 0) + 1;
+            });
+            return counts;
+        }
+
+        // View data in the shapes of event_store.explorer_views, from the browser's event arrays
+        var fromEvents = {
+            summary: function (spec, events) {
+                var rows = select(spec, events, false);
+                var players = {};
+                rows.forEach(function (i) {
+                    if (events.player[i] >= 0) players[events.player[i]] = true;
+                });
+                var types = countBy(rows, events.type);
+                var common = null;
+                Object.keys(types).forEach(function (code) {
+                    if (code >= 0 && (common === null || types[code] > types[common])) common = code;
+                });
+                return {
+                    total: rows.length,
+                    players: Object.keys(players).length,
+                    common_type: common === null ? null : events.types[common],
+                    common_count: common === null ? 0 : types[common]
+                };
+            },
+
+            timeline: function (spec, events) {
+                var counts = {};
+                select(spec, events, false).forEach(function (i) {
+                    if (events.type[i] < 0) return;
+                    var byMinute = counts[events.type[i]] = counts[events.type[i]] || {};
+                    byMinute[events.minute[i]] = (byMinute[events.minute[i]] || 0) + 1;
+                });
+                return Object.keys(counts).sort(function (a, b) {
+                    return events.types[a] < events.types[b] ? -1 : 1;
+                }).map(function (code) {
+                    var minutes = Object.keys(counts[code]).map(Number).sort(function (a, b) { return a - b; });
+                    return {type: events.types[code], minutes: minutes,
+                            counts: minutes.map(function (m) { return counts[code][m]; })};
+                });
+            },
+
+            distribution: function (spec, events) {
+                var byTeam = {};
+                select(spec, events, true).forEach(function (i) {
+                    if (events.team[i] < 0 || events.type[i] < 0) return;
+                    var team = events.teams[events.team[i]], type = events.types[events.type[i]];
+                    var counts = byTeam[team] = byTeam[team] || {};
+                    counts[type] = (counts[type] || 0) + 1;
+                });
+                return byTeam;
+            },
+
+            // Same bins as spatial.heatmap_pyramid: equal-width bins over the clipped pitch
+            heatmap: function (spec, events, resolution) {
+                var bins = resolution.split('x').map(Number);
+                var nx = bins[0], ny = bins[1];
+                var counts = [];
+                for (var j = 0; j < ny; j++) counts.push(new Array(nx).fill(0));
+                var located = 0;
+                select(spec, events, false).forEach(function (i) {
+                    var x = events.x[i], y = events.y[i];
+                    if (x === null || y === null) return;
+                    var ix = Math.min(Math.floor(Math.min(Math.max(x, 0), PITCH_LENGTH) / PITCH_LENGTH * nx), nx - 1);
+                    var iy = Math.min(Math.floor(Math.min(Math.max(y, 0), PITCH_WIDTH) / PITCH_WIDTH * ny), ny - 1);
+                    counts[iy][ix] += 1;
+                    located += 1;
+                });
+                return located ? counts : null;
+            }
+        };
+
+        // A view's data from the browser's events, else from the server's aggregates
+        // for the same spec; undefined while neither has caught up
+        function viewData(view, spec, events, aggregates, resolution) {
+            if (ready(spec, events)) return fromEvents[view](spec, events, resolution);
+            if (aggregates && aggregates.key === spec.key && (!resolution || aggregates.resolution === resolution)) {
+                return aggregates[view];
+            }
+            return undefined;
+        }
+
+        return {
+            // Same spec as event_store.make_filter, so server callbacks can read it
+            filterSpec: function (matchId, eventType, player, timeRange) {
+                if (!matchId) return null;
+                eventType = eventType || 'all';
+                player = player || 'all';
+                var start = timeRange ? Math.trunc(timeRange[0]) : 0;
+                var end = timeRange ? Math.trunc(timeRange[1]) : 200;
+                return {
+                    match_id: matchId,
+                    event_type: eventType,
+                    player: player,
+                    time_range: [start, end],
+                    key: matchId + '|' + eventType + '|' + player + '|' + start + '-' + end
+                };
+            },
+
+            // Asks the server for binned views, in the server mode only
+            serverRequest: function (spec, resolution, mode) {
+                if (mode !== 'server' || !spec) return noUpdate();
+                return {spec: spec, resolution: resolution || '24x16'};
+            },
+
+            summary: function (spec, events, aggregates) {
+                if (!spec) return ['0', '0', '0', 'Most Common: N/A', '0min'];
+                var summary = viewData('summary', spec, events, aggregates);
+                if (summary === undefined) return [noUpdate(), noUpdate(), noUpdate(), noUpdate(), noUpdate()];
+                return [
+                    String(summary.total),
+                    String(summary.players),
+                    String(summary.common_count),
+                    'Most Common: ' + (summary.common_type === null ? 'N/A' : summary.common_type),
+                    (spec.time_range[1] - spec.time_range[0]) + 'min'
+                ];
+            },
+
+            timeline: function (spec, events, aggregates) {
+                if (!spec) return message('Select a match to view timeline');
+                var timeline = viewData('timeline', spec, events, aggregates);
+                if (timeline === undefined) return noUpdate();
+                if (!timeline.length) return message('No events match the current filters');
+
+                var traces = timeline.map(function (series) {
+                    return {
+                        type: 'scatter',
+                        mode: 'lines+markers',
+                        name: series.type,
+                        x: series.minutes,
+                        y: series.counts,
+                        line: {shape: 'spline', width: 3},
+                        marker: {size: 6},
+                        hovertemplate: 'Match Minute=%{x}<br>Number of Events=%{y}'
+                    };
+                });
+
+                var vline = function (x) {
+                    return {type: 'line', xref: 'x', yref: 'paper', x0: x, x1: x, y0: 0, y1: 1,
+                            line: {dash: 'dash', color: '#e74c3c'}};
+                };
+                var label = function (x, text) {
+                    return {x: x, y: 1, xref: 'x', yref: 'paper', text: text, showarrow: false, yanchor: 'bottom'};
+                };
+                return {
+                    data: traces,
+                    layout: {
+                        height: 500,
+                        colorway: COLORWAY,
+                        hovermode: 'x unified',
+                        plot_bgcolor: 'rgba(0,0,0,0)',
+                        paper_bgcolor: 'rgba(0,0,0,0)',
+                        font: {color: '#2c3e50', family: 'Arial, sans-serif'},
+                        margin: {l: 40, r: 40, t: 40, b: 40},
+                        legend: Object.assign({title: {text: 'type'}}, LEGEND),
+                        shapes: [vline(45), vline(90)],
+                        annotations: [label(45, 'Half Time'), label(90, 'Full Time')],
+                        xaxis: {title: {text: 'Match Minute', font: {size: 14}}, showgrid: true,
+                                gridcolor: 'rgba(211,211,211,0.3)', tickmode: 'linear', tick0: 0, dtick: 15},
+                        yaxis: {title: {text: 'Number of Events', font: {size: 14}}, showgrid: true,
+                                gridcolor: 'rgba(211,211,211,0.3)'}
+                    }
+                };
+            },
+
+            // Only the time range applies here; the type and player filters are ignored
+            distribution: function (spec, events, aggregates, match) {
+                if (!spec) return message('Please select a match to view event distribution.');
+                if (!match || match.match_id !== spec.match_id) return noUpdate();
+                var distribution = viewData('distribution', spec, events, aggregates);
+                if (distribution === undefined) return noUpdate();
+
+                var colors = {};
+                colors[match.home_team] = '#2ecc71';
+                colors[match.away_team] = '#3498db';
+
+                var traces = [match.home_team, match.away_team].map(function (team) {
+                    var counts = distribution[team] || {};
+                    // Most frequent first, ties by name, whichever side counted them
+                    var ranked = Object.keys(counts).sort(function (a, b) {
+                        return counts[b] - counts[a] || (a < b ? -1 : a > b ? 1 : 0);
+                    });
+                    var names = ranked.slice();
+                    var values = ranked.map(function (name) { return counts[name]; });
+                    // Only keep top events for cleaner visualization
+                    if (ranked.length > 8) {
+                        var other = values.slice(7).reduce(function (a, b) { return a + b; }, 0);
+                        names = names.slice(0, 7).concat(['Other Events']);
+                        values = values.slice(0, 7).concat([other]);
+                    }
+                    return {
+                        type: 'bar', name: team, x: names, y: values, text: values,
+                        marker: {color: colors[team]}, textposition: 'auto', textfont: {size: 12}
+                    };
+                });
+
+                return {
+                    data: traces,
+                    layout: {
+                        title: {text: 'Event Distribution: ' + match.home_team + ' vs ' + match.away_team,
+                                x: 0.5, font: {size: 18, color: '#2c3e50'}},
+                        barmode: 'group',
+                        height: 500,
+                        plot_bgcolor: 'rgba(0,0,0,0)',
+                        paper_bgcolor: 'rgba(0,0,0,0)',
+                        font: {color: '#2c3e50', family: 'Arial, sans-serif'},
+                        margin: {l: 40, r: 40, t: 80, b: 40},
+                        legend: Object.assign({title: {text: 'Team'}}, LEGEND),
+                        xaxis: {categoryorder: 'total descending', tickangle: -45},
+                        yaxis: {title: {text: 'Number of Events', font: {size: 14}}, showgrid: true,
+                                gridcolor: 'rgba(211,211,211,0.3)'}
+                    }
+                };
+            },
+
+            heatmap: function (spec, events, aggregates, resolution, template) {
+                if (!spec) return message('Please select a match to view the event heatmap.');
+                resolution = resolution || '24x16';
+                var counts = viewData('heatmap', spec, events, aggregates, resolution);
+                if (counts === undefined) return noUpdate();
+                if (counts === null) return message('No valid location data available for the selected filters.');
+                var ny = counts.length, nx = counts[0].length;
+
+                var centers = function (n, size) {
+                    var values = [];
+                    for (var k = 0; k < n; k++) values.push((k + 0.5) * size / n);
+                    return values;
+                };
+                var title = spec.event_type !== 'all' ? spec.event_type : 'All Events';
+                return {
+                    data: [{
+                        type: 'heatmap',
+                        x: centers(nx, PITCH_LENGTH),
+                        y: centers(ny, PITCH_WIDTH),
+                        // Empty bins left transparent so the pitch shows through
+                        z: counts.map(function (row) { return row.map(function (c) { return c > 0 ? c : null; }); }),
+                        colorscale: 'Viridis',
+                        reversescale: true,
+                        showscale: true,
+                        hovertemplate: 'Events: %{z}<extra></extra>',
+                        colorbar: {title: {text: 'Events'}},
+                        opacity: 0.7
+                    }],
+                    layout: {
+                        template: template,
+                        title: {text: title + ' Heatmap', x: 0.5, font: {size: 18, color: '#2c3e50'}},
+                        width: 1000,
+                        height: 600,
+                        plot_bgcolor: 'rgba(0, 0, 0, 0)',
+                        paper_bgcolor: 'rgba(0, 0, 0, 0)',
+                        xaxis: {showgrid: false, zeroline: false, showticklabels: false, range: [-5, PITCH_LENGTH + 5]},
+                        yaxis: {showgrid: false, zeroline: false, showticklabels: false, scaleanchor: 'x',
+                                scaleratio: 1, range: [-5, PITCH_WIDTH + 5]},
+                        margin: {l: 20, r: 20, t: 50, b: 20},
+                        autosize: true
+                    }
+                };
+            }
+        };
+    })()
+});
@@ -0,0 +1,2 @@
+# Benchmark scripts for the dashboard's data and rendering paths.
+# Run from the project root, e.g. `python -m benchmarks.pitch_template_size`.
@@ -0,0 +1,76 @@
+"""Benchmark the vectorized pass network against the legacy implementation.
+
+Builds the network for both teams in every Euro 2024 match with each
+implementation and reports total and per-network timings. The legacy
+implementation is create_pass_network as it was at a baseline revision
+(default: the repository's first commit), read from git.
+
+Usage:
+    python -m benchmarks.pass_network [--matches N] [--baseline REV]
+"""
+import argparse
+import contextlib
+import io
+import subprocess
+import time
+import types
+
+from utils.data_loader import load_euro_2024_matches, load_match_data
+from utils.plot_utils import create_pass_network
+
+
+def load_baseline_builder(revision=None):
+    """Return create_pass_network from utils/plot_utils.py at a git revision."""
+    if revision is None:
+        revision = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], capture_output=True,
+                                  text=True, check=True).stdout.split()[0]
+    path = f"{revision}:utils/plot_utils.py"
+    source = subprocess.run(['git', 'show', path], capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType('baseline_plot_utils')
+    exec(compile(source, path, 'exec'), module.__dict__)
+    return module.create_pass_network
+
+
+def time_builder(builder, workload):
+    """Return per-network timings (seconds) for a builder over (events, team) pairs."""
+    timings = []
+    for events_df, team in workload:
+        start = time.perf_counter()
+        # Both builders print their pass threshold; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder(events_df, team)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=None, help="Limit to the first N matches (default: all 51)")
+    parser.add_argument('--baseline', default=None, help="Git revision of the legacy implementation (default: first commit)")
+    args = parser.parse_args()
+    legacy_create_pass_network = load_baseline_builder(args.baseline)
+
+    matches = load_euro_2024_matches()
+    if args.matches:
+        matches = matches.head(args.matches)
+
+    print(f"Loading events for {len(matches)} matches...")
+    workload = []
+    for _, match in matches.iterrows():
+        # Copy so the loader's lru_cache (maxsize=2) does not decide what stays in memory
+        events_df = load_match_data(match['match_id']).copy()
+        workload.append((events_df, match['home_team']))
+        workload.append((events_df, match['away_team']))
+
+    print(f"{'builder':<12}{'networks':>10}{'total (s)':>12}{'mean (ms)':>12}{'max (ms)':>12}")
+    results = {}
+    for label, builder in [('legacy', legacy_create_pass_network), ('vectorized', create_pass_network)]:
+        timings = time_builder(builder, workload)
+        results[label] = sum(timings)
+        print(f"{label:<12}{len(timings):>10}{sum(timings):>12.2f}"
+              f"{1000 * sum(timings) / len(timings):>12.1f}{1000 * max(timings):>12.1f}")
+    print(f"Speed-up: {results['legacy'] / results['vectorized']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Measure the serialized JSON size of pitch figures before and after the shared pitch template.
+
+"Before" rebuilds the pitch the old way: shapes inlined in every figure's layout,
+marker traces for the center dot, penalty spots and goals, and Plotly's default
+template. "After" is the figure as produced by `_draw_pitch_plotly` today.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.plot_utils import _draw_pitch_plotly, get_pitch_template, figure_json_size
+
+
+def legacy_pitch_figure():
+    """Rebuild a pitch figure the way it was drawn before the template existed."""
+    fig = go.Figure(layout=dict(template='plotly'))
+    for shape in get_pitch_template().layout.shapes:
+        fig.add_shape(shape)
+    for x, y, name in [([60], [40], 'Center Point'), ([12], [40], 'Left Penalty Spot'),
+                       ([108], [40], 'Right Penalty Spot')]:
+        fig.add_trace(go.Scatter(x=x, y=y, mode='markers', marker=dict(size=4, color='white'),
+                                 showlegend=False, hoverinfo='skip', name=name))
+    for x, name in [([120, 120], 'Right Goal'), ([0, 0], 'Left Goal')]:
+        fig.add_trace(go.Scatter(x=x, y=[36, 44], mode='lines', line=dict(color="white", width=4),
+                                 showlegend=False, hoverinfo='skip', name=name))
+    fig.update_layout(
+        xaxis=dict(range=[0, 120], showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(range=[0, 80], showgrid=False, zeroline=False, showticklabels=False),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='#E0E0E0'
+    )
+    return fig
+
+
+def templated_pitch_figure():
+    fig = go.Figure()
+    _draw_pitch_plotly(fig)
+    return fig
+
+
+def with_sample_shots(fig, n_shots=25):
+    """Add a typical shot-map sized scatter so the comparison reflects a real figure."""
+    rng = np.random.default_rng(0)
+    fig.add_trace(go.Scatter(x=rng.uniform(90, 120, n_shots), y=rng.uniform(20, 60, n_shots),
+                             mode='markers', name='Shots'))
+    return fig
+
+
+def main():
+    rows = [
+        ('pitch only', legacy_pitch_figure(), templated_pitch_figure()),
+        ('pitch + 25 shots', with_sample_shots(legacy_pitch_figure()), with_sample_shots(templated_pitch_figure())),
+    ]
+    print(f"{'figure':<20}{'before (bytes)':>16}{'after (bytes)':>16}{'saved':>10}")
+    for label, before, after in rows:
+        before_size = figure_json_size(before)
+        after_size = figure_json_size(after)
+        saved = 100 * (before_size - after_size) / before_size
+        print(f"{label:<20}{before_size:>16,}{after_size:>16,}{saved:>9.1f}%")
+
+
+if __name__ == '__main__':
+    main()
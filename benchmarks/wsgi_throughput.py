@@ -0,0 +1,74 @@
+"""Measure callback throughput (requests/sec) of a running dashboard server.
+
+Start the server to measure first, for example the development server
+(`python app.py`) or gunicorn (`gunicorn -c gunicorn.conf.py wsgi:server`),
+then point this script at it. The default workload builds the Event Explorer
+tab through the tab render callback, which is CPU-bound and needs no data
+downloads; `--workload teams` runs the team dropdown callback (cached data).
+
+Usage:
+    python -m benchmarks.wsgi_throughput [--url URL] [--requests N] [--concurrency C] [--workload tab|teams]
+"""
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from dashboards.layout import TABS
+
+WORKLOADS = {
+    # Main tab render for the Event Explorer (only the explorer container is built)
+    'tab': {
+        'output': '..' + '...'.join(f'{value}-tab-content.children' for value, _, _ in TABS) + '..',
+        'outputs': [{'id': f'{value}-tab-content', 'property': 'children'} for value, _, _ in TABS],
+        'inputs': [{'id': 'main-tabs', 'property': 'value', 'value': 'explorer'}],
+        'state': [{'id': f'{value}-tab-content', 'property': 'children'} for value, _, _ in TABS],
+        'changedPropIds': ['main-tabs.value'],
+    },
+    # Team dropdown options of the Event Explorer
+    'teams': {
+        'output': '..explorer-team-dropdown.options...explorer-team-dropdown.value..',
+        'outputs': [{'id': 'explorer-team-dropdown', 'property': 'options'},
+                    {'id': 'explorer-team-dropdown', 'property': 'value'}],
+        'inputs': [{'id': 'explorer-team-dropdown', 'property': 'id', 'value': 'explorer-team-dropdown'}],
+        'changedPropIds': [],
+    },
+}
+
+
+def post_callback(url, body):
+    """POST one callback request and return its latency in seconds."""
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8050', help="Server base URL")
+    parser.add_argument('--requests', type=int, default=500, help="Requests to send (default: 500)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='tab')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/') + '/_dash-update-component'
+    body = json.dumps(WORKLOADS[args.workload]).encode()
+    # Warm up the server's caches before timing
+    for _ in range(5):
+        post_callback(url, body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = sorted(pool.map(lambda _: post_callback(url, body), range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'workload':<10}{'requests':>10}{'clients':>9}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    print(f"{args.workload:<10}{args.requests:>10}{args.concurrency:>9}{args.requests / elapsed:>10.1f}"
+          f"{1000 * latencies[len(latencies) // 2]:>10.1f}{1000 * latencies[int(len(latencies) * 0.95)]:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
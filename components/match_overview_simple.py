@@ -4,13 +4,174 @@ import dash
 from dash import dcc, html, Input, Output, callback
 import plotly.graph_objects as go
 import pandas as pd
+import os
+import time
+from functools import lru_cache
+from utils.singleflight import single_flight
 from utils.data_loader import load_euro_2024_matches, load_match_data, get_all_teams, get_tournament_stats, load_sbopen_match_data
 from utils.plot_utils import create_shot_map as create_shot_map_plotly, create_pass_network as create_pass_network_plotly, create_xg_timeline as create_xg_timeline_plotly, create_formation_viz, matplotlib_plot_as_base64
+from utils.shots import get_xg_timeline
+from utils.key_events import load_match_key_events
+from utils.match_stats import team_match_stats
+from utils.standings import get_standings
+from utils.leaderboards import top_scorers, top_keepers
+from utils.metrics import record_latency
+from utils.preprocess import cache, store_key
+from utils.figure_cache import cached_figure
+from utils.figure_compaction import compact_figure
+
+# Timeline label and icon for each key event kind
+KEY_EVENT_LABELS = {
+    'Goal': 'Goal ⚽',
+    'Own Goal': 'Own Goal 🥅',
+    'Yellow Card': 'Yellow Card 🟨',
+    'Second Yellow': 'Second Yellow (Red) 🟥',
+    'Red Card': 'Red Card 🟥',
+    'Penalty Foul': 'Penalty Foul ⚠️',
+    'Foul': 'Foul ⚠️',
+    'Substitution': 'Substitution 🔄',
+}
+
+# Data each match tab needs; everything else is left unloaded. The xG, stats and
+# events tabs read stored tables and cached figures, whose helpers load the match
+# events only on a miss (that time is part of the render latency and is also
+# recorded by the helpers themselves).
+# 'sbopen' is the mplsoccer parse (events, related, freeze frames, tactics), used only by formations.
+MATCH_TAB_DEPENDENCIES = {
+    'shots': ('matches', 'events'),
+    'passes': ('matches', 'events'),
+    'xg': ('matches',),
+    'stats': ('matches',),
+    'events': ('matches',),
+    'formations': ('matches', 'sbopen'),
+}
+
+MATCH_DATA_LOADERS = {
+    'matches': lambda match_id: load_euro_2024_matches(),
+    'events': load_match_data,
+    'sbopen': load_sbopen_match_data,
+}
+
+def load_match_tab_data(match_id, active_tab):
+    """Load only the data the active match tab depends on"""
+    return {
+        dependency: MATCH_DATA_LOADERS[dependency](match_id)
+        for dependency in MATCH_TAB_DEPENDENCIES.get(active_tab, ('matches',))
+    }
+
+def team_colors(match_info):
+    """Home and away colors of a match: green for the winner, red for the loser"""
+    if match_info['home_score'] > match_info['away_score']:
+        return '#2ecc71', '#e74c3c'
+    if match_info['away_score'] > match_info['home_score']:
+        return '#e74c3c', '#2ecc71'
+    # Draw - use different colors
+    return '#2ecc71', '#3498db'
+
+def _match_info(match_id):
+    matches = load_euro_2024_matches()
+    return matches[matches['match_id'] == match_id].iloc[0]
+
+@cached_figure('match_pass_network')
+def match_pass_network_figure(match_id, team):
+    """A team's pass network in the match tab, titled in the team's result color"""
+    match_info = _match_info(match_id)
+    home_color, away_color = team_colors(match_info)
+    fig = create_pass_network_plotly(None, team, match_id)
+    fig.update_layout(
+        title=f"<b><span style='color:{home_color if team == match_info['home_team'] else away_color}'>{team} Pass Network</span></b>",
+        title_x=0.5,
+        margin=dict(t=50, b=20, l=20, r=20),
+        paper_bgcolor='#f8f9fa',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@cached_figure('match_xg_timeline', per_team=False)
+def match_xg_timeline_figure(match_id):
+    """The match xG timeline with each team's line in its result color"""
+    match_info = _match_info(match_id)
+    home_color, away_color = team_colors(match_info)
+    xg_timeline_fig = create_xg_timeline_plotly(None, match_info)
+    
+    # Set colors for teams - carefully check for string match
+    for trace in xg_timeline_fig.data:
+        if trace.name and match_info['home_team'] in str(trace.name):
+            trace.line.color = home_color
+        elif trace.name and match_info['away_team'] in str(trace.name):
+            trace.line.color = away_color
+    
+    # Update layout
+    xg_timeline_fig.update_layout(
+        title=f"<b>Expected Goals (xG) Timeline</b>",
+        title_x=0.5,
+        margin=dict(t=50, b=20, l=50, r=20),
+        paper_bgcolor='#f8f9fa',
+        plot_bgcolor='white'
+    )
+    return xg_timeline_fig
+
+# Bump when the formation image changes so stale PNGs in the store are ignored
+FORMATION_IMAGE_VERSION = 1
+
+def formation_image_key(match_id, team_name):
+    return store_key('formation_image', FORMATION_IMAGE_VERSION, match_id, team_name)
+
+@single_flight
+@lru_cache(maxsize=16)
+def render_formation_image(match_id, team_name, home, title_color):
+    """Render a team's formation figure to a base64 PNG, cached per match and team in memory and in the data store"""
+    key = formation_image_key(match_id, team_name)
+    image = cache.get(key)
+    if image is not None:
+        return image
+
+    sb_event, sb_related, sb_freeze, sb_tactics = load_sbopen_match_data(match_id)
+    formation_fig = create_formation_viz(sb_event, sb_related, sb_freeze, sb_tactics, team_name, home, match_id=match_id)
+    
+    # Set title with team color and background; pitch.grid already lays the panels out,
+    # so the figure is saved as is (tight_layout and a tight bbox cost two extra draws)
+    formation_fig.suptitle(f"{team_name} Formation", 
+                           color=title_color, 
+                           fontweight='bold', 
+                           fontsize=16, 
+                           y=0.98)
+    formation_fig.patch.set_facecolor('#f8f9fa')
+    image = matplotlib_plot_as_base64(formation_fig, tight=False)
+    cache.set(key, image)
+    return image
+
+def prerender_formation_images(matches, force=False):
+    """
+    Render and store both teams' formation images for every match
+
+    Args:
+        matches: Matches DataFrame with match_id, home_team, away_team and scores
+        force: Re-render images that are already stored
+
+    Returns:
+        Number of images rendered
+    """
+    if force:
+        render_formation_image.cache_clear()
+    built = 0
+    for _, match in matches.iterrows():
+        home_color, away_color = team_colors(match)
+        for team, home, color in ((match['home_team'], True, home_color), (match['away_team'], False, away_color)):
+            path = os.path.join(cache.cache_dir, f"{formation_image_key(match['match_id'], team)}.pkl")
+            if os.path.exists(path):
+                if not force:
+                    continue
+                os.remove(path)
+            try:
+                render_formation_image(match['match_id'], team, home, color)
+                built += 1
+            except Exception as e:
+                print(f"❌ Could not render the formation of {team} for match {match['match_id']}: {e}")
+    return built
 
 def layout():
-    # Get tournament stats
     try:
-        stats = get_tournament_stats()
         teams = get_all_teams()
     except Exception as e:
         return html.Div([
@@ -184,7 +345,6 @@ def update_match_analysis(match_id):
     
     try:
         # Load match data
-        events_df = load_match_data(match_id)
         matches = load_euro_2024_matches()
         match_info = matches[matches['match_id'] == match_id].iloc[0]
         
@@ -248,31 +408,34 @@ def update_match_visualizations(active_tab, match_id):
     if not match_id:
         return html.P("Please select a match.", style={'textAlign': 'center'})
     
+    start = time.perf_counter()
     try:
-        events_df = load_match_data(match_id)
-        sb_event,sb_related, sb_freeze, sb_tactics = load_sbopen_match_data(match_id)
-        matches = load_euro_2024_matches()
+        data = load_match_tab_data(match_id, active_tab)
+    except Exception as e:
+        return html.P(f"Error loading match data: {str(e)}", 
+                     style={'color': '#e74c3c', 'textAlign': 'center'})
+    loaded = time.perf_counter()
+    
+    content = render_match_tab(active_tab, match_id, data)
+    rendered = time.perf_counter()
+    
+    # Per-tab latency, split into data loading and rendering
+    record_latency(f"match_tab.{active_tab}.load", loaded - start)
+    record_latency(f"match_tab.{active_tab}.render", rendered - loaded)
+    return content
+
+def render_match_tab(active_tab, match_id, data):
+    """Build a match tab's content from its loaded dependencies (see MATCH_TAB_DEPENDENCIES)"""
+    try:
+        events_df = data.get('events')
+        matches = data['matches']
         match_info = matches[matches['match_id'] == match_id].iloc[0]
         
         home_team = match_info['home_team']
         away_team = match_info['away_team']
         
         # Determine team colors based on match result
-        home_score = match_info['home_score']
-        away_score = match_info['away_score']
-        
-        if home_score > away_score:
-            # Home team wins
-            home_color = '#2ecc71'  # Green for winner
-            away_color = '#e74c3c'  # Red for loser
-        elif away_score > home_score:
-            # Away team wins
-            home_color = '#e74c3c'  # Red for loser
-            away_color = '#2ecc71'  # Green for winner
-        else:
-            # Draw - use different colors
-            home_color = '#2ecc71'  # Green for first team
-            away_color = '#3498db'  # Blue for second team
+        home_color, away_color = team_colors(match_info)
         
         if active_tab == "shots":
             # Create interactive Plotly shot maps
@@ -422,26 +585,9 @@ def update_match_visualizations(active_tab, match_id):
             ])
         
         elif active_tab == "passes":
-            # Create interactive Plotly pass networks
-            home_pass_network_fig = create_pass_network_plotly(events_df, home_team)
-            away_pass_network_fig = create_pass_network_plotly(events_df, away_team)
-            
-            # Set titles with team colors
-            home_pass_network_fig.update_layout(
-                title=f"<b><span style='color:{home_color}'>{home_team} Pass Network</span></b>",
-                title_x=0.5,
-                margin=dict(t=50, b=20, l=20, r=20),
-                paper_bgcolor='#f8f9fa',
-                plot_bgcolor='rgba(0,0,0,0)'
-            )
-            
-            away_pass_network_fig.update_layout(
-                title=f"<b><span style='color:{away_color}'>{away_team} Pass Network</span></b>",
-                title_x=0.5,
-                margin=dict(t=50, b=20, l=20, r=20),
-                paper_bgcolor='#f8f9fa',
-                plot_bgcolor='rgba(0,0,0,0)'
-            )
+            # Interactive Plotly pass networks, served from the figure cache
+            home_pass_network_fig = match_pass_network_figure(match_id, home_team)
+            away_pass_network_fig = match_pass_network_figure(match_id, away_team)
             
             return html.Div([
                 # Statistics summary for passes
@@ -557,34 +703,15 @@ def update_match_visualizations(active_tab, match_id):
             ])
         
         elif active_tab == "xg":
-            # Create interactive Plotly xG timeline
-            xg_timeline_fig = create_xg_timeline_plotly(events_df, match_info)
-            
-            # Set colors for teams - carefully check for string match
-            for trace in xg_timeline_fig.data:
-                if trace.name and home_team in str(trace.name):
-                    trace.line.color = home_color
-                elif trace.name and away_team in str(trace.name):
-                    trace.line.color = away_color
-            
-            # Update layout
-            xg_timeline_fig.update_layout(
-                title=f"<b>Expected Goals (xG) Timeline</b>",
-                title_x=0.5,
-                margin=dict(t=50, b=20, l=50, r=20),
-                paper_bgcolor='#f8f9fa',
-                plot_bgcolor='white'
-            )
+            # Interactive Plotly xG timeline, served from the figure cache
+            xg_timeline_fig = match_xg_timeline_figure(match_id)
             
-            # Calculate xG values for statistics
-            home_xg = events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team)
-            ]['shot_statsbomb_xg'].sum()
-            away_xg = events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team)
-            ]['shot_statsbomb_xg'].sum()
+            # xG values for statistics come from the same cached timeline
+            xg_timeline = get_xg_timeline(match_id)
+            xg_totals = xg_timeline['totals']
+            home_xg = xg_totals.get(home_team, 0)
+            away_xg = xg_totals.get(away_team, 0)
+            shootout_xg = xg_timeline['shootout_xg']
             
             return html.Div([
                 # Statistics summary for xG
@@ -616,7 +743,12 @@ def update_match_visualizations(active_tab, match_id):
                                    style={'fontSize': '24px', 'color': '#e74c3c', 'margin': '0', 'fontWeight': 'bold'}),
                             html.P("xG Difference", style={'fontSize': '12px', 'color': '#7f8c8d', 'margin': '0'})
                         ], style={'width': '20%', 'display': 'inline-block', 'textAlign': 'center'}),
-                    ])
+                    ]),
+                    # Shootout kicks count in neither the score nor the xG above
+                    html.P(f"Excludes the penalty shootout ({home_team} {shootout_xg.get(home_team, 0):.2f} xG, "
+                           f"{away_team} {shootout_xg.get(away_team, 0):.2f} xG)",
+                           style={'fontSize': '12px', 'color': '#7f8c8d', 'margin': '10px 0 0 0', 'textAlign': 'center'})
+                    if shootout_xg else None,
                 ], style={
                     'backgroundColor': '#ecf0f1', 
                     'padding': '15px', 
@@ -677,65 +809,9 @@ def update_match_visualizations(active_tab, match_id):
             ])
         
         elif active_tab == "stats":
-            # Calculate match statistics
-            home_stats = {}
-            away_stats = {}
-            
-            # Total shots
-            home_shots = len(events_df[(events_df['type'] == 'Shot') & (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team)])
-            away_shots = len(events_df[(events_df['type'] == 'Shot') & (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team)])
-            
-            # Shots on target
-            home_shots_on_target = len(events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team) &
-                (events_df['shot_outcome'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)).isin(['Goal', 'Saved']))
-            ])
-            away_shots_on_target = len(events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team) &
-                (events_df['shot_outcome'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)).isin(['Goal', 'Saved']))
-            ])
-            
-            # Possession (based on pass count)
-            home_passes = len(events_df[(events_df['type'] == 'Pass') & (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team)])
-            away_passes = len(events_df[(events_df['type'] == 'Pass') & (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team)])
-            total_passes = home_passes + away_passes
-            home_possession = (home_passes / total_passes * 100) if total_passes > 0 else 0
-            away_possession = (away_passes / total_passes * 100) if total_passes > 0 else 0
-            
-            # xG values
-            home_xg = events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team)
-            ]['shot_statsbomb_xg'].sum()
-            away_xg = events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team)
-            ]['shot_statsbomb_xg'].sum()
-            
-            # Pass success/failure statistics
-            home_successful_passes = len(events_df[
-                (events_df['type'] == 'Pass') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team) &
-                (events_df['pass_outcome'].isna())
-            ])
-            away_successful_passes = len(events_df[
-                (events_df['type'] == 'Pass') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team) &
-                (events_df['pass_outcome'].isna())
-            ])
-            
-            home_failed_passes = len(events_df[
-                (events_df['type'] == 'Pass') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == home_team) &
-                (events_df['pass_outcome'].notna())
-            ])
-            away_failed_passes = len(events_df[
-                (events_df['type'] == 'Pass') & 
-                (events_df['team'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == away_team) &
-                (events_df['pass_outcome'].notna())
-            ])
+            # Match statistics from the cached single-pass engine
+            home_stats = team_match_stats(match_id, home_team)
+            away_stats = team_match_stats(match_id, away_team)
             
             return html.Div([
                 # Description section
@@ -872,12 +948,12 @@ def update_match_visualizations(active_tab, match_id):
                         'borderRadius': '15px',
                         'boxShadow': '0 3px 10px rgba(0,0,0,0.1)'
                     }) for (home_val, away_val, label) in [
-                        (home_shots, away_shots, "Shots"),
-                        (home_shots_on_target, away_shots_on_target, "Shots on Target"),
-                        (home_successful_passes, away_successful_passes, "Successful Passes"),
-                        (home_failed_passes, away_failed_passes, "Failed Passes"),
-                        (round(home_possession, 1), round(away_possession, 1), "Possession %"),
-                        (round(home_xg, 2), round(away_xg, 2), "Expected Goals"),
+                        (home_stats['shots'], away_stats['shots'], "Shots"),
+                        (home_stats['shots_on_target'], away_stats['shots_on_target'], "Shots on Target"),
+                        (home_stats['successful_passes'], away_stats['successful_passes'], "Successful Passes"),
+                        (home_stats['failed_passes'], away_stats['failed_passes'], "Failed Passes"),
+                        (round(home_stats['possession'], 1), round(away_stats['possession'], 1), "Possession %"),
+                        (round(home_stats['xg'], 2), round(away_stats['xg'], 2), "Expected Goals"),
                         (match_info['home_score'], match_info['away_score'], "Goals")
                     ]]
                 ])
@@ -892,10 +968,10 @@ def update_match_visualizations(active_tab, match_id):
             })
         
         elif active_tab == "formations":
-            # Create formation visualizations for both teams
+            # Create formation visualizations for both teams (rendered images are cached per match/team)
             try:
-                home_formation_fig = create_formation_viz(sb_event,sb_related,sb_freeze,sb_tactics,home_team,True)
-                away_formation_fig = create_formation_viz(sb_event,sb_related,sb_freeze,sb_tactics,away_team)
+                home_formation_img = render_formation_image(match_id, home_team, True, home_color)
+                away_formation_img = render_formation_image(match_id, away_team, False, away_color)
             except Exception as e:
                 print(f"Error creating formation visualizations: {e}")
                 return html.Div([
@@ -903,28 +979,6 @@ def update_match_visualizations(active_tab, match_id):
                           style={'color': '#e74c3c', 'textAlign': 'center'})
                 ])
             
-            # Note: We don't need to update_layout since the figures are already styled in the create_formation_viz function
-            # Set titles with team colors
-            # Update matplotlib figures with titles and styling
-            home_formation_fig.suptitle(f"{home_team} Formation", 
-                                        color=home_color, 
-                                        fontweight='bold', 
-                                        fontsize=16, 
-                                        y=0.98)
-            
-            away_formation_fig.suptitle(f"{away_team} Formation", 
-                                        color=away_color, 
-                                        fontweight='bold', 
-                                        fontsize=16, 
-                                        y=0.98)
-            
-            # Set figure background colors
-            home_formation_fig.patch.set_facecolor('#f8f9fa')
-            away_formation_fig.patch.set_facecolor('#f8f9fa')
-            
-            # Adjust layout for better display
-            home_formation_fig.tight_layout(rect=[0, 0, 1, 0.96])
-            away_formation_fig.tight_layout(rect=[0, 0, 1, 0.96])
             return html.Div([
                 # Description section
                 html.Div([
@@ -962,7 +1016,7 @@ def update_match_visualizations(active_tab, match_id):
                     html.Div([
                         html.Div([
                             html.Img(
-                                src=matplotlib_plot_as_base64(home_formation_fig),
+                                src=home_formation_img,
                                 style={
                                     'height': '1000px',
                                     'width': '100%',
@@ -982,7 +1036,7 @@ def update_match_visualizations(active_tab, match_id):
                     html.Div([
                         html.Div([
                             html.Img(
-                                src=matplotlib_plot_as_base64(away_formation_fig),
+                                src=away_formation_img,
                                 style={
                                     'height': '1000px',
                                     'width': '100%',
@@ -1002,228 +1056,18 @@ def update_match_visualizations(active_tab, match_id):
             ])
             
         elif active_tab == "events":
-            # Key Events Timeline
-            key_events = []
-            
-            # Get regular goals
-            goals = events_df[
-                (events_df['type'] == 'Shot') & 
-                (events_df['shot_outcome'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x)) == 'Goal')
+            # Key Events Timeline, precomputed per match
+            key_events = [
+                {
+                    'minute': event.minute,
+                    'type': KEY_EVENT_LABELS[event.kind],
+                    'team': event.team,
+                    'player': event.player,
+                    'description': event.detail
+                }
+                for event in load_match_key_events(match_id).itertuples()
             ]
             
-            # Get own goals
-            own_goals_for = events_df[events_df['type'] == 'Own Goal For'] if 'Own Goal For' in events_df['type'].values else pd.DataFrame()
-            own_goals_against = events_df[events_df['type'] == 'Own Goal Against'] if 'Own Goal Against' in events_df['type'].values else pd.DataFrame()
-            
-            for _, goal in goals.iterrows():
-                team_name = goal['team'].get('name', '') if isinstance(goal['team'], dict) else str(goal['team'])
-                player_name = goal['player'].get('name', '') if isinstance(goal['player'], dict) else str(goal['player'])
-                key_events.append({
-                    'minute': goal['minute'],
-                    'type': 'Goal ⚽',
-                    'team': team_name,
-                    'player': player_name,
-                    'description': f"Goal by {player_name}"
-                })
-                
-            # Process own goals if there are any - avoid double counting
-            processed_og_ids = set()  # Track which events we've already processed
-            
-            # Only process Own Goal For events to avoid duplicates
-            for _, og in own_goals_for.iterrows():
-                # Skip if we've already processed this event
-                if og['id'] in processed_og_ids:
-                    continue
-                    
-                # Add this event to processed list
-                processed_og_ids.add(og['id'])
-                
-                # Find the team that benefited
-                beneficiary_team = og['team'] if isinstance(og['team'], str) else og['team'].get('name', 'Unknown') if isinstance(og['team'], dict) else 'Unknown'
-                
-                # Try to find the other team and player involved from related events
-                related_events = og.get('related_events', [])
-                scorer_team = None
-                scorer_name = 'Unknown'
-                
-                # Look for related Own Goal Against event to get the scorer
-                if related_events and not own_goals_against.empty:
-                    for _, related_og in own_goals_against.iterrows():
-                        if related_og['id'] in related_events:
-                            # Add related event to processed list
-                            processed_og_ids.add(related_og['id'])
-                            
-                            scorer_team = related_og['team'] if isinstance(related_og['team'], str) else related_og['team'].get('name', 'Unknown') if isinstance(related_og['team'], dict) else 'Unknown'
-                            scorer_name = related_og['player'] if isinstance(related_og['player'], str) else related_og['player'].get('name', 'Unknown') if isinstance(related_og['player'], dict) else 'Unknown'
-                            break
-                            
-                # Add the own goal to key events
-                key_events.append({
-                    'minute': og['minute'],
-                    'type': 'Own Goal 🥅',
-                    'team': scorer_team if scorer_team else 'Unknown',  # Team of the player who scored the own goal
-                    'player': scorer_name,
-                    'description': f"Own goal by {scorer_name} (for {beneficiary_team})"
-                })
-            
-            # Get cards and fouls with better detection
-            try:
-                # Check for different card-related columns that might exist
-                card_columns = [col for col in events_df.columns if 'card' in col.lower()]
-                foul_columns = [col for col in events_df.columns if 'foul' in col.lower()]
-                
-                # Try multiple approaches to find cards
-                cards_found = pd.DataFrame()
-                
-                # Method 1: bad_behaviour_card column
-                if 'bad_behaviour_card' in events_df.columns:
-                    cards_method1 = events_df[events_df['bad_behaviour_card'].notna()]
-                    cards_found = pd.concat([cards_found, cards_method1], ignore_index=True)
-                
-                # Method 2: Look for direct card events
-                card_types = ['Yellow Card', 'Red Card', 'Second Yellow']
-                card_events = events_df[events_df['type'].isin(card_types)]
-                cards_found = pd.concat([cards_found, card_events], ignore_index=True)
-                
-                # Method 3: Look in foul events with card info
-                if 'foul_committed_card' in events_df.columns:
-                    foul_cards = events_df[
-                        (events_df['type'] == 'Foul Committed') & 
-                        (events_df['foul_committed_card'].notna())
-                    ]
-                    cards_found = pd.concat([cards_found, foul_cards], ignore_index=True)
-                
-                # Remove duplicates
-                cards_found = cards_found.drop_duplicates()
-                
-                # Process found cards
-                for _, card in cards_found.iterrows():
-                    team_name = card['team'].get('name', '') if isinstance(card['team'], dict) else str(card['team'])
-                    player_name = card['player'].get('name', '') if isinstance(card['player'], dict) else str(card['player'])
-                    
-                    # Determine card type
-                    card_type = ""
-                    card_icon = ""
-                    
-                    # Check multiple possible card fields
-                    if 'bad_behaviour_card' in card and pd.notna(card['bad_behaviour_card']):
-                        card_info = card['bad_behaviour_card']
-                        card_type = card_info.get('name', '') if isinstance(card_info, dict) else str(card_info)
-                    elif card['type'] in ['Yellow Card', 'Red Card', 'Second Yellow']:
-                        card_type = card['type']
-                    elif 'foul_committed_card' in card and pd.notna(card['foul_committed_card']):
-                        card_info = card['foul_committed_card']
-                        card_type = card_info.get('name', '') if isinstance(card_info, dict) else str(card_info)
-                    
-                    # Set appropriate icon
-                    if 'Yellow' in card_type or 'yellow' in card_type.lower():
-                        card_icon = '🟨'
-                        display_type = 'Yellow Card'
-                    elif 'Red' in card_type or 'red' in card_type.lower() or 'Second' in card_type:
-                        card_icon = '🟥'
-                        display_type = 'Red Card' if 'Second' not in card_type else 'Second Yellow (Red)'
-                    else:
-                        card_icon = '🟨'  # Default to yellow if unclear
-                        display_type = card_type if card_type else 'Card'
-                    
-                    # Check for penalty
-                    penalty_info = ""
-                    if 'foul_committed_penalty' in card and pd.notna(card['foul_committed_penalty']):
-                        penalty_info = " (Penalty awarded)"
-                    
-                    key_events.append({
-                        'minute': card['minute'],
-                        'type': f'{display_type} {card_icon}',
-                        'team': team_name,
-                        'player': player_name,
-                        'description': f"{display_type} for {player_name}{penalty_info}"
-                    })
-                
-                # Penalty fouls (without cards)
-                if 'foul_committed_penalty' in events_df.columns:
-                    penalty_fouls = events_df[
-                        (events_df['type'] == 'Foul Committed') & 
-                        (events_df['foul_committed_penalty'].notna()) &
-                        (~events_df.index.isin(cards_found.index))  # Exclude those already processed as cards
-                    ]
-                    for _, foul in penalty_fouls.iterrows():
-                        team_name = foul['team'].get('name', '') if isinstance(foul['team'], dict) else str(foul['team'])
-                        player_name = foul['player'].get('name', '') if isinstance(foul['player'], dict) else str(foul['player'])
-                        key_events.append({
-                            'minute': foul['minute'],
-                            'type': 'Penalty Foul ⚠️',
-                            'team': team_name,
-                            'player': player_name,
-                            'description': f"Penalty foul by {player_name}"
-                        })
-                
-            except Exception as e:
-                # Debug: Add available columns info if no cards found
-                if len(key_events) == 0:  # Only show if no other events
-                    key_events.append({
-                        'minute': 0,
-                        'type': 'Debug Info 🔧',
-                        'team': 'System',
-                        'player': '',
-                        'description': f"Available columns: {', '.join([col for col in events_df.columns if 'card' in col.lower() or 'foul' in col.lower()][:5])}"
-                    })
-            
-            # Get major fouls without cards
-            try:
-                major_fouls = events_df[
-                    (events_df['type'] == 'Foul Committed') & 
-                    (events_df['bad_behaviour_card'].isna()) &
-                    (events_df['foul_committed_offensive'].notna() if 'foul_committed_offensive' in events_df.columns else True)
-                ].head(10)  # Limit to avoid too many events
-                
-                for _, foul in major_fouls.iterrows():
-                    team_name = foul['team'].get('name', '') if isinstance(foul['team'], dict) else str(foul['team'])
-                    player_name = foul['player'].get('name', '') if isinstance(foul['player'], dict) else str(foul['player'])
-                    key_events.append({
-                        'minute': foul['minute'],
-                        'type': 'Foul ⚠️',
-                        'team': team_name,
-                        'player': player_name,
-                        'description': f"Foul by {player_name}"
-                    })
-            except:
-                pass
-            
-            # Get substitutions (if available)
-            try:
-                subs = events_df[events_df['type'] == 'Substitution']
-                for _, sub in subs.iterrows():
-                    team_name = sub['team'].get('name', '') if isinstance(sub['team'], dict) else str(sub['team'])
-                    player_name = sub['player'].get('name', '') if isinstance(sub['player'], dict) else str(sub['player'])
-                    replacement = sub['substitution_replacement'].get('name', '') if isinstance(sub.get('substitution_replacement'), dict) else str(sub.get('substitution_replacement', 'Unknown'))
-                    key_events.append({
-                        'minute': sub['minute'],
-                        'type': 'Substitution 🔄',
-                        'team': team_name,
-                        'player': player_name,
-                        'description': f"{replacement} on for {player_name}"
-                    })
-            except:
-                pass
-            
-            # # Add half-time and full-time events
-            # try:
-            #     half_time_events = events_df[events_df['type'] == 'Half End']
-            #     for _, ht in half_time_events.iterrows():
-            #         period = ht.get('period', 1)
-            #         key_events.append({
-            #             'minute': ht['minute'],
-            #             'type': f'Half Time ⏱️' if period == 1 else 'Full Time 🏁',
-            #             'team': 'Match',
-            #             'player': '',
-            #             'description': f"End of {'first' if period == 1 else 'second'} half"
-            #         })
-            # except:
-            #     pass
-            
-            # Sort by minute
-            key_events.sort(key=lambda x: x['minute'])
-            
             # Calculate event statistics
             total_goals = len([e for e in key_events if 'Goal' in e['type']])
             total_cards = len([e for e in key_events if 'Card' in e['type']])
@@ -1400,35 +1244,18 @@ def update_overview_content(active_tab):
         matches = load_euro_2024_matches()
         
         if active_tab == "players-tab":
-            # Create Top Performers tab with player statistics
-            # Placeholder data for demonstration
-            top_scorers = [
-                {"player": "C. Ronaldo", "team": "Portugal", "goals": 5, "assists": 2},
-                {"player": "R. Lewandowski", "team": "Poland", "goals": 4, "assists": 1},
-                {"player": "K. Mbappé", "team": "France", "goals": 4, "assists": 3},
-                {"player": "R. Lukaku", "team": "Belgium", "goals": 3, "assists": 2},
-                {"player": "P. Schick", "team": "Czech Republic", "goals": 3, "assists": 0},
-                {"player": "G. Xhaka", "team": "Switzerland", "goals": 2, "assists": 3},
-                {"player": "M. Depay", "team": "Netherlands", "goals": 2, "assists": 2},
-                {"player": "K. Havertz", "team": "Germany", "goals": 2, "assists": 1}
-            ]
-            
-            top_keepers = [
-                {"player": "T. Courtois", "team": "Belgium", "clean_sheets": 4, "saves": 18, "save_ratio": 0.92},
-                {"player": "J. Pickford", "team": "England", "clean_sheets": 3, "saves": 12, "save_ratio": 0.86},
-                {"player": "G. Donnarumma", "team": "Italy", "clean_sheets": 3, "saves": 15, "save_ratio": 0.85},
-                {"player": "M. Neuer", "team": "Germany", "clean_sheets": 2, "saves": 14, "save_ratio": 0.82},
-                {"player": "Y. Sommer", "team": "Switzerland", "clean_sheets": 2, "saves": 16, "save_ratio": 0.80}
-            ]
+            # Create Top Performers tab from the cached event-derived leaderboards
+            scorers = top_scorers(8)
+            keepers = top_keepers(5)
             
             # Create top scorers bar chart with assists overlay
-            players = [p["player"] for p in top_scorers]
-            goals = [p["goals"] for p in top_scorers]
-            assists = [p["assists"] for p in top_scorers]
-            teams = [p["team"] for p in top_scorers]
+            players = scorers['player'].tolist()
+            goals = scorers['goals'].tolist()
+            assists = scorers['assists'].tolist()
+            teams = scorers['team'].tolist()
             
             # Create color gradient based on goals
-            max_goals = max(goals)
+            max_goals = max(max(goals, default=0), 1)
             colors = [
                 f'rgba(46, 204, 113, {0.6 + 0.4 * (g / max_goals)})' 
                 for g in goals
@@ -1481,10 +1308,10 @@ def update_overview_content(active_tab):
             )
             
             # Create goalkeeper stats visualization
-            keeper_names = [k["player"] for k in top_keepers]
-            clean_sheets = [k["clean_sheets"] for k in top_keepers]
-            save_ratios = [k["save_ratio"] * 100 for k in top_keepers]  # Convert to percentage
-            keeper_teams = [k["team"] for k in top_keepers]
+            keeper_names = keepers['player'].tolist()
+            clean_sheets = keepers['clean_sheets'].tolist()
+            save_ratios = (keepers['save_ratio'] * 100).tolist()  # Convert to percentage
+            keeper_teams = keepers['team'].tolist()
             
             keepers_fig = go.Figure()
             
@@ -1529,12 +1356,12 @@ def update_overview_content(active_tab):
                 yaxis=dict(
                     title="Clean Sheets",
                     side="left",
-                    range=[0, max(clean_sheets) * 1.2]
+                    range=[0, max(max(clean_sheets, default=0), 1) * 1.2]
                 ),
                 yaxis2=dict(
                     title="Save Ratio (%)",
                     side="right",
-                    range=[70, 100],
+                    range=[min(70, 5 * (min(save_ratios, default=70) // 5)), 100],
                     overlaying="y",
                     tickmode="linear",
                     dtick=5
@@ -1548,19 +1375,18 @@ def update_overview_content(active_tab):
                 legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
             )
             
-            # Create radar chart comparing top 5 players
-            # Placeholder data for demonstration - would use real stats in production
+            # Create radar chart comparing the top 5 scorers
+            # Each category is scaled to 0-10 against the best of the five; hover shows the real values
+            radar_columns = ['goals', 'assists', 'key_passes_per_match', 'pass_accuracy', 'shots_per_match']
+            radar_values = scorers.head(5)[radar_columns]
+            radar_scaled = (radar_values / radar_values.max().where(radar_values.max() > 0) * 10).fillna(0)
             radar_data = [
-                # Goals, Assists, Key Passes, Pass Accuracy, Shots per Game
-                {'name': 'C. Ronaldo', 'stats': [5, 2, 1.8, 78, 4.2]},
-                {'name': 'K. Mbappé', 'stats': [4, 3, 2.3, 82, 3.8]},
-                {'name': 'R. Lewandowski', 'stats': [4, 1, 1.2, 75, 3.5]},
-                {'name': 'R. Lukaku', 'stats': [3, 2, 1.0, 68, 2.9]},
-                {'name': 'G. Xhaka', 'stats': [2, 3, 2.5, 91, 1.5]}
+                {'name': name, 'stats': scaled.tolist(), 'values': values.round(1).tolist()}
+                for name, scaled, values in zip(scorers['player'], radar_scaled.values, radar_values.values)
             ]
             
             # Categories for radar chart
-            categories = ['Goals', 'Assists', 'Key Passes', 'Pass Accuracy', 'Shots per Game']
+            categories = ['Goals', 'Assists', 'Key Passes per Game', 'Pass Accuracy', 'Shots per Game']
             
             # Create radar chart
             radar_fig = go.Figure()
@@ -1573,6 +1399,8 @@ def update_overview_content(active_tab):
                     theta=categories,
                     fill='toself',
                     name=player['name'],
+                    customdata=player['values'],
+                    hovertemplate='<b>%{fullData.name}</b><br>%{theta}: %{customdata}<extra></extra>',
                     line=dict(color=colors[i % len(colors)], width=2),
                     fillcolor=colors[i % len(colors)].replace(')', ', 0.2)').replace('rgb', 'rgba')
                 ))
@@ -1631,66 +1459,23 @@ def update_overview_content(active_tab):
                 # Scorers and keepers in a row
                 html.Div([
                     html.Div([
-                        dcc.Graph(figure=scorers_fig, style={'height': '400px'})
+                        dcc.Graph(figure=compact_figure(scorers_fig, 'overview_scorers'), style={'height': '400px'})
                     ], style={'width': '50%', 'display': 'inline-block', 'paddingRight': '10px'}),
                     
                     html.Div([
-                        dcc.Graph(figure=keepers_fig, style={'height': '400px'})
+                        dcc.Graph(figure=compact_figure(keepers_fig, 'overview_keepers'), style={'height': '400px'})
                     ], style={'width': '50%', 'display': 'inline-block', 'paddingLeft': '10px'}),
                 ], style={'marginBottom': '20px'}),
                 
                 # Radar chart in full width
                 html.Div([
-                    dcc.Graph(figure=radar_fig, style={'height': '500px'})
+                    dcc.Graph(figure=compact_figure(radar_fig, 'overview_radar'), style={'height': '500px'})
                 ])
             ])
         
         elif active_tab == "goals-tab":
-            # Calculate team goal statistics
-            team_goals_stats = []
-            
-            for team in get_all_teams():
-                team_matches = matches[
-                    (matches['home_team'] == team) | (matches['away_team'] == team)
-                ]
-                
-                # Calculate goals for and against
-                home_match_count = len(team_matches[team_matches['home_team'] == team])
-                away_match_count = len(team_matches[team_matches['away_team'] == team])
-                total_matches = home_match_count + away_match_count
-                
-                goals_scored_home = team_matches[team_matches['home_team'] == team]['home_score'].sum()
-                goals_scored_away = team_matches[team_matches['away_team'] == team]['away_score'].sum()
-                total_goals_scored = goals_scored_home + goals_scored_away
-                
-                goals_conceded_home = team_matches[team_matches['home_team'] == team]['away_score'].sum()
-                goals_conceded_away = team_matches[team_matches['away_team'] == team]['home_score'].sum()
-                total_goals_conceded = goals_conceded_home + goals_conceded_away
-                
-                # Calculate first/second half goals
-                # This would require event data, simplifying for now
-                
-                # Calculate metrics
-                goals_per_match = total_goals_scored / total_matches if total_matches > 0 else 0
-                goal_difference = total_goals_scored - total_goals_conceded
-                clean_sheets = len(team_matches[
-                    ((team_matches['home_team'] == team) & (team_matches['away_score'] == 0)) | 
-                    ((team_matches['away_team'] == team) & (team_matches['home_score'] == 0))
-                ])
-                
-                team_goals_stats.append({
-                    'team': team,
-                    'goals_scored': total_goals_scored,
-                    'goals_conceded': total_goals_conceded,
-                    'goal_difference': goal_difference,
-                    'goals_per_match': goals_per_match,
-                    'clean_sheets': clean_sheets,
-                    'matches_played': total_matches
-                })
-            
-            # Convert to DataFrame and sort
-            df_goals = pd.DataFrame(team_goals_stats)
-            df_goals = df_goals.sort_values('goals_scored', ascending=False)
+            # Team goal statistics from the memoized standings engine
+            df_goals = get_standings().sort_values('goals_scored', ascending=False, kind='stable')
             
             # Create a color gradient based on goals scored
             max_goals = df_goals['goals_scored'].max()
@@ -1733,9 +1518,6 @@ def update_overview_content(active_tab):
                 xaxis=dict(gridcolor='rgba(211, 211, 211, 0.3)')
             )
             
-            # Create metrics grid for top 5 teams
-            top_teams = df_goals.head(5)['team'].tolist()
-            
             return html.Div([
                 # Description section
                 html.Div([
@@ -1770,7 +1552,7 @@ def update_overview_content(active_tab):
                 }),
                 
                 # Goals visualization
-                dcc.Graph(figure=goals_fig, style={'height': '500px'}),
+                dcc.Graph(figure=compact_figure(goals_fig, 'overview_goals'), style={'height': '500px'}),
                 
                 # Top teams goal statistics
                 html.Div([
@@ -1818,7 +1600,7 @@ def update_overview_content(active_tab):
                                     'height': '100%'
                                 })
                             ], style={'width': '19%', 'display': 'inline-block', 'padding': '0 5px'}) 
-                              for team, row in zip(top_teams, [df_goals[df_goals['team'] == team].iloc[0] for team in top_teams])]
+                              for team, row in df_goals.head(5).set_index('team', drop=False).iterrows()]  # Top 5 scoring teams
                         ], style={'display': 'flex', 'justifyContent': 'space-between'})
                     ])
                 ], style={
@@ -1831,96 +1613,12 @@ def update_overview_content(active_tab):
 
         
         elif active_tab == "team-tab":
-            # Comprehensive team performance metrics
-            team_stats = []
-            teams = get_all_teams()
-            
-            for team in teams:
-                team_matches = matches[
-                    (matches['home_team'] == team) | (matches['away_team'] == team)
-                ]
-                
-                wins = 0
-                draws = 0
-                losses = 0
-                goals_for = 0
-                goals_against = 0
-                match_results = []
-                match_dates = []
-                opponents = []
-                
-                for _, match in team_matches.iterrows():
-                    match_date = match['match_date']
-                    match_dates.append(match_date)
-                    
-                    if match['home_team'] == team:
-                        opponent = match['away_team']
-                        goals_for += match['home_score']
-                        goals_against += match['away_score']
-                        score = f"{match['home_score']}-{match['away_score']}"
-                        
-                        if match['home_score'] > match['away_score']:
-                            wins += 1
-                            result = 'W'
-                        elif match['home_score'] == match['away_score']:
-                            draws += 1
-                            result = 'D'
-                        else:
-                            losses += 1
-                            result = 'L'
-                    else:
-                        opponent = match['home_team']
-                        goals_for += match['away_score']
-                        goals_against += match['home_score']
-                        score = f"{match['away_score']}-{match['home_score']}"
-                        
-                        if match['away_score'] > match['home_score']:
-                            wins += 1
-                            result = 'W'
-                        elif match['away_score'] == match['home_score']:
-                            draws += 1
-                            result = 'D'
-                        else:
-                            losses += 1
-                            result = 'L'
-                    
-                    opponents.append(opponent)
-                    match_results.append({
-                        'date': match_date,
-                        'opponent': opponent,
-                        'result': result,
-                        'score': score
-                    })
-                
-                # Sort matches by date
-                match_results = sorted(match_results, key=lambda x: x['date'])
-                
-                # Calculate progression through tournament
-                matches_played = wins + draws + losses
-                points = wins * 3 + draws
-                goal_difference = goals_for - goals_against
-                avg_goals_scored = goals_for / matches_played if matches_played > 0 else 0
-                avg_goals_conceded = goals_against / matches_played if matches_played > 0 else 0
-                win_percentage = (wins / matches_played * 100) if matches_played > 0 else 0
-                
-                team_stats.append({
-                    'Team': team,
-                    'Matches': matches_played,
-                    'Wins': wins,
-                    'Draws': draws,
-                    'Losses': losses,
-                    'Goals_For': goals_for,
-                    'Goals_Against': goals_against,
-                    'Goal_Difference': goal_difference,
-                    'Points': points,
-                    'Win_Percentage': win_percentage,
-                    'Match_Results': match_results,
-                    'Avg_Goals_Scored': avg_goals_scored,
-                    'Avg_Goals_Conceded': avg_goals_conceded
-                })
-            
-            # Convert to DataFrame and sort
-            df_stats = pd.DataFrame(team_stats).sort_values('Points', ascending=False)
+            # Comprehensive team performance metrics from the memoized standings engine
+            df_stats = get_standings().rename(columns={
+                'team': 'Team', 'matches_played': 'Matches', 'wins': 'Wins', 'draws': 'Draws',
+                'losses': 'Losses', 'goals_scored': 'Goals_For', 'goals_conceded': 'Goals_Against',
+                'goal_difference': 'Goal_Difference', 'points': 'Points'
+            })
             
             # Create team standings visualization
             standings_data = df_stats[['Team', 'Matches', 'Wins', 'Draws', 'Losses', 
@@ -1993,28 +1691,13 @@ def update_overview_content(active_tab):
                 margin=dict(l=0, r=0, t=50, b=0),
             )
             
-            # Create win/draw/loss visualization for top teams - sort by win percentage
-            # First calculate win percentages for sorting
-            df_stats['win_percentage'] = df_stats.apply(lambda row: row['Wins'] / row['Matches'] * 100 if row['Matches'] > 0 else 0, axis=1)
+            # Create win/draw/loss visualization for top teams
             # Sort by win percentage first, then by total points as a tiebreaker
-            top_teams_df = df_stats.sort_values(['win_percentage', 'Points'], ascending=[False, False]).head(8)
-            top_teams = top_teams_df['Team'].tolist()
-            
-            # Calculate win/draw/loss percentages
-            win_percentages = []
-            draw_percentages = []
-            loss_percentages = []
-            teams = []
-            
-            # Ensure we use the right teams order directly from top_teams list
-            for team in top_teams:
-                row = top_teams_df[top_teams_df['Team'] == team].iloc[0]
-                total = row['Matches']
-                if total > 0:
-                    win_percentages.append(row['Wins'] / total * 100)
-                    draw_percentages.append(row['Draws'] / total * 100)
-                    loss_percentages.append(row['Losses'] / total * 100)
-                    teams.append(team)
+            top_teams_df = df_stats[df_stats['Matches'] > 0].sort_values(['win_percentage', 'Points'], ascending=[False, False]).head(8)
+            teams = top_teams_df['Team'].tolist()
+            win_percentages = top_teams_df['win_percentage'].tolist()
+            draw_percentages = top_teams_df['draw_percentage'].tolist()
+            loss_percentages = top_teams_df['loss_percentage'].tolist()
             
             # Create stacked bar chart for results
             results_fig = go.Figure()
@@ -2027,7 +1710,7 @@ def update_overview_content(active_tab):
                 orientation='h',
                 marker=dict(color='rgba(46, 204, 113, 0.8)'),
                 hovertemplate='<b>%{y}</b><br>Wins: %{customdata[0]} (%{x:.1f}%)<extra></extra>',
-                customdata=[[int(top_teams_df[top_teams_df['Team'] == team]['Wins'].values[0])] for team in teams]
+                customdata=top_teams_df[['Wins']].values
             ))
             
             # Add draw bars
@@ -2038,7 +1721,7 @@ def update_overview_content(active_tab):
                 orientation='h',
                 marker=dict(color='rgba(241, 196, 15, 0.8)'),
                 hovertemplate='<b>%{y}</b><br>Draws: %{customdata[0]} (%{x:.1f}%)<extra></extra>',
-                customdata=[[int(top_teams_df[top_teams_df['Team'] == team]['Draws'].values[0])] for team in teams]
+                customdata=top_teams_df[['Draws']].values
             ))
             
             # Add loss bars
@@ -2049,7 +1732,7 @@ def update_overview_content(active_tab):
                 orientation='h',
                 marker=dict(color='rgba(231, 76, 60, 0.8)'),
                 hovertemplate='<b>%{y}</b><br>Losses: %{customdata[0]} (%{x:.1f}%)<extra></extra>',
-                customdata=[[int(top_teams_df[top_teams_df['Team'] == team]['Losses'].values[0])] for team in teams]
+                customdata=top_teams_df[['Losses']].values
             ))
             
             # Update layout
@@ -2111,7 +1794,7 @@ def update_overview_content(active_tab):
                 dcc.Graph(figure=standings_fig, style={'height': '500px', 'marginBottom': '25px'}),
                 
                 # Results breakdown visualization
-                dcc.Graph(figure=results_fig, style={'height': '400px'})
+                dcc.Graph(figure=compact_figure(results_fig, 'overview_results'), style={'height': '400px'})
             ])
 
         
@@ -2302,17 +1985,17 @@ def update_overview_content(active_tab):
                     # Visualizations in a grid
                     html.Div([
                         html.Div([
-                            dcc.Graph(figure=goals_fig, style={'height': '350px'})
+                            dcc.Graph(figure=compact_figure(goals_fig, 'overview_goal_distribution'), style={'height': '350px'})
                         ], style={'width': '50%', 'display': 'inline-block', 'paddingRight': '10px'}),
                         
                         html.Div([
-                            dcc.Graph(figure=diff_fig, style={'height': '350px'})
+                            dcc.Graph(figure=compact_figure(diff_fig, 'overview_goal_difference'), style={'height': '350px'})
                         ], style={'width': '50%', 'display': 'inline-block', 'paddingLeft': '10px'})
                     ], style={'marginBottom': '20px'}),
                     
                     html.Div([
                         html.Div([
-                            dcc.Graph(figure=outcomes_fig, style={'height': '350px'})
+                            dcc.Graph(figure=compact_figure(outcomes_fig, 'overview_outcomes'), style={'height': '350px'})
                         ], style={'width': '100%', 'display': 'inline-block'})
                     ])
                 ])
@@ -9,7 +9,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt  # Added missing plt import
 from utils.data_loader import load_tournament_data, get_all_teams, get_team_players, get_all_players
-from utils.plot_utils_mpl import create_shot_map, create_heatmap, create_progressive_passes_viz, matplotlib_plot_as_base64  # Added missing import
+from utils.plot_utils_mpl import create_shot_map, create_heatmap, create_heatmap_difference, create_progressive_passes_viz, matplotlib_plot_as_base64  # Added missing import
+from utils.touch_grid import player_touch_grid, touch_grid_difference
+from utils.player_metrics import player_metric_profile
 
 def create_performance_radar_plotly(players_data, chart_title=None):
     """Create a Plotly radar chart for player performance metrics with hover functionality
@@ -172,70 +174,6 @@ def create_performance_radar_plotly(players_data, chart_title=None):
     
     return fig
 
-def calculate_success_rates(player_events):
-    """Calculate success rates for different action types"""
-    # Initialize metrics dictionary
-    success_metrics = {}
-    
-    # Calculate pass success rate
-    total_passes = len(player_events[player_events['type'] == 'Pass'])
-    successful_passes = len(player_events[
-        (player_events['type'] == 'Pass') & 
-        (player_events['pass_outcome'].isna())  # Successful passes have no outcome
-    ])
-    success_metrics['Pass Success'] = (successful_passes / total_passes * 100) if total_passes > 0 else 0
-    
-    # Calculate dribble success rate
-    total_dribbles = len(player_events[player_events['type'] == 'Dribble'])
-    successful_dribbles = len(player_events[
-        (player_events['type'] == 'Dribble') & 
-        (player_events['dribble_outcome'].apply(
-            lambda x: x == 'Complete' if isinstance(x, str) else False
-        ))
-    ])
-    success_metrics['Dribble Success'] = (successful_dribbles / total_dribbles * 100) if total_dribbles > 0 else 0
-    
-    # Calculate shot success rate (goals/shots)
-    total_shots = len(player_events[player_events['type'] == 'Shot'])
-    successful_shots = len(player_events[
-        (player_events['type'] == 'Shot') & 
-        (player_events['shot_outcome'].apply(
-            lambda x: x == 'Goal' if isinstance(x, str) else False
-        ))
-    ])
-    success_metrics['Shot Success'] = (successful_shots / total_shots * 100) if total_shots > 0 else 0
-    
-    # Calculate duel success rate
-    total_duels = len(player_events[player_events['type'] == 'Duel'])
-    successful_duels = len(player_events[
-        (player_events['type'] == 'Duel') & 
-        (player_events['duel_outcome'].apply(
-            lambda x: x in ['Success In Play', 'Won', 'Success Out'] if isinstance(x, str) else False
-        ))
-    ])
-    success_metrics['Duel Success'] = (successful_duels / total_duels * 100) if total_duels > 0 else 0
-    
-    # Calculate interception success rate
-    total_interceptions = len(player_events[player_events['type'] == 'Interception'])
-    successful_interceptions = len(player_events[
-        (player_events['type'] == 'Interception') & 
-        (player_events['interception_outcome'].apply(
-            lambda x: x in ['Success In Play', 'Won', 'Success Out'] if isinstance(x, str) else False
-        ))
-    ])
-    success_metrics['Interception Success'] = (successful_interceptions / total_interceptions * 100) if total_interceptions > 0 else 0
-    
-    # Create raw metrics dictionary with the same counts
-    raw_metrics = {
-        'Pass Success': successful_passes,
-        'Dribble Success': successful_dribbles,
-        'Shot Success': successful_shots,
-        'Duel Success': successful_duels,
-        'Interception Success': successful_interceptions
-    }
-    
-    return success_metrics, raw_metrics
-
 def layout():
     return html.Div([
         # Header for player analysis
@@ -524,7 +462,19 @@ def update_player_visualizations(active_tab, selected_player, comparison_player)
             ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '10px', 'boxShadow': '0 2px 10px rgba(0,0,0,0.1)'})
         
         elif active_tab == "heatmap-tab":
-            heatmap = create_heatmap(events_df, selected_player)
+            # Heatmaps are slices of the precomputed tournament touch grid
+            heatmap = create_heatmap(None, selected_player, bin_statistic=player_touch_grid(selected_player))
+            comparison_heatmap = []
+            if comparison_player and comparison_player != selected_player:
+                comparison_heatmap = [
+                    html.P([
+                        "Zone share difference between ", html.Strong(selected_player), " (red) and ",
+                        html.Strong(comparison_player), " (blue)."
+                    ], style={'fontSize': '14px', 'color': '#7f8c8d', 'margin': '20px 0 10px 0'}),
+                    html.Img(style={'width': '100%', 'maxWidth': '800px', 'margin': '0 auto', 'display': 'block'},
+                             src=create_heatmap_difference(selected_player, comparison_player,
+                                                           touch_grid_difference(selected_player, comparison_player)))
+                ]
             return html.Div([
                 html.Div([
                     html.H5("🔥 Touch Heatmap", style={'color': '#2c3e50', 'marginBottom': '10px', 'display': 'inline-block'}),
@@ -541,6 +491,7 @@ def update_player_visualizations(active_tab, selected_player, comparison_player)
                     "'s spatial distribution across the pitch. Areas of higher activity appear in deeper red, showing where the player spent most time and had the most touches. The pitch is divided into zones with percentage values indicating relative activity in each area. This approach provides insight into positioning tendencies, role execution, and spatial preferences."
                 ], style={'fontSize': '14px', 'color': '#7f8c8d', 'marginBottom': '15px'}),
                 html.Img(style={'width': '100%', 'maxWidth': '800px', 'margin': '0 auto', 'display': 'block'}, src=heatmap),
+                *comparison_heatmap,
                 html.Details([
                     html.Summary("📖 Visualization Design Rationale", style={'fontWeight': 'bold', 'color': '#34495e', 'cursor': 'pointer', 'marginTop': '15px'}),
                     html.Div([
@@ -594,48 +545,27 @@ def update_player_visualizations(active_tab, selected_player, comparison_player)
                 return html.P("No progressive pass data available.")
         
         elif active_tab == "metrics-tab":
-            # Create performance radar chart
-            player_events = events_df[
-                events_df['player'].apply(
-                    lambda x: x.get('name', '') == selected_player if isinstance(x, dict) else str(x) == selected_player
-                )
-            ]
+            # Radar metrics are looked up from the all-player table
+            profile = player_metric_profile(selected_player)
             
-            if player_events.empty:
+            if profile is None:
                 return html.P("No performance data available.")
             
-            # Check if comparison player is selected
-            comparison_player_events = None
-            
-            if comparison_player and comparison_player != selected_player:
-                comparison_player_events = events_df[
-                    events_df['player'].apply(
-                        lambda x: x.get('name', '') == comparison_player if isinstance(x, dict) else str(x) == comparison_player
-                    )
-                ]
-            
             # Calculate metrics for primary player
-            metrics = {
-                'Goals': len(player_events[
-                    (player_events['type'] == 'Shot') & 
-                    (player_events['shot_outcome'].apply(
-                        lambda x: x.get('name', '') == 'Goal' if isinstance(x, dict) else str(x) == 'Goal'
-                    ))
-                ]),
-                'Shots': len(player_events[player_events['type'] == 'Shot']),
-                'Passes': len(player_events[player_events['type'] == 'Pass']),
-                'Dribbles': len(player_events[player_events['type'] == 'Dribble']),
-                'Duels': len(player_events[player_events['type'] == 'Duel']),
-                'Interceptions': len(player_events[player_events['type'] == 'Interception'])
-            }
+            metrics = profile['volume']
             
             # Normalize metrics for radar chart (0-100 scale)
             max_vals = {'Goals': 3, 'Shots': 25, 'Passes': 562, 'Dribbles': 32, 'Duels': 31, 'Interceptions': 12}
             normalized_metrics = {k: min(100, (v / max_vals[k]) * 100) for k, v in metrics.items()}
             
-            # Calculate success rates for primary player
-            success_metrics, raw_success_metrics = calculate_success_rates(player_events)
-            normalized_success_metrics = {k: min(v, 100) for k, v in success_metrics.items()}
+            # Success rates for primary player
+            raw_success_metrics = profile['successes']
+            normalized_success_metrics = {k: min(v, 100) for k, v in profile['success_rates'].items()}
+            
+            # Comparison player's row, if one is selected
+            comparison_profile = None
+            if comparison_player and comparison_player != selected_player:
+                comparison_profile = player_metric_profile(comparison_player)
             
             # Setup players data for volume metrics radar
             volume_players_data = [{
@@ -662,28 +592,16 @@ def update_player_visualizations(active_tab, selected_player, comparison_player)
             }]
             
             # Add comparison player data if available
-            if comparison_player and comparison_player != selected_player and comparison_player_events is not None and not comparison_player_events.empty:
-                # Calculate metrics for comparison player
-                comp_metrics = {
-                    'Goals': len(comparison_player_events[
-                        (comparison_player_events['type'] == 'Shot') & 
-                        (comparison_player_events['shot_outcome'].apply(
-                            lambda x: x.get('name', '') == 'Goal' if isinstance(x, dict) else str(x) == 'Goal'
-                        ))
-                    ]),
-                    'Shots': len(comparison_player_events[comparison_player_events['type'] == 'Shot']),
-                    'Passes': len(comparison_player_events[comparison_player_events['type'] == 'Pass']),
-                    'Dribbles': len(comparison_player_events[comparison_player_events['type'] == 'Dribble']),
-                    'Duels': len(comparison_player_events[comparison_player_events['type'] == 'Duel']),
-                    'Interceptions': len(comparison_player_events[comparison_player_events['type'] == 'Interception'])
-                }
+            if comparison_profile is not None:
+                # Metrics for comparison player
+                comp_metrics = comparison_profile['volume']
                 
                 # Normalize comparison metrics
                 comp_normalized_metrics = {k: min(100, (v / max_vals[k]) * 100) for k, v in comp_metrics.items()}
                 
-                # Calculate success rates for comparison player
-                comp_success_metrics, comp_raw_success_metrics = calculate_success_rates(comparison_player_events)
-                comp_normalized_success_metrics = {k: min(v, 100) for k, v in comp_success_metrics.items()}
+                # Success rates for comparison player
+                comp_raw_success_metrics = comparison_profile['successes']
+                comp_normalized_success_metrics = {k: min(v, 100) for k, v in comparison_profile['success_rates'].items()}
                 
                 # Add comparison player to volume radar data
                 volume_players_data.append({
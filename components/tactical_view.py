@@ -6,6 +6,10 @@ import pandas as pd
 import numpy as np
 from utils.data_loader import load_euro_2024_matches, load_match_data, get_all_teams
 from utils.plot_utils_mpl import create_pass_network
+from utils.match_stats import team_match_stats
+from utils.preprocess import entity_names
+from utils.figure_compaction import compact_figure
+from utils.figure_cache import cached_figure
 
 def layout():
     return html.Div([
@@ -451,7 +455,7 @@ def update_tactical_visualization(team, match_id, analysis_type):
             description = "The pass network shows connections between players based on successful passes. Stronger connections (thicker lines) indicate more frequent passing combinations. This visualization helps identify key passing lanes, central playmakers, and the team's overall passing structure."
             # Import utility function to create pass network
             from utils.plot_utils_mpl import create_pass_network as create_pass_network_mpl
-            return create_pass_network_mpl(events_df, team), description
+            return create_pass_network_mpl(events_df, team, match_id), description
             
         elif analysis_type == 'defensive':
             description = "The defensive heatmap shows the spatial distribution of defensive actions including tackles, interceptions, blocks, and clearances. Darker areas indicate zones with higher defensive activity. This visualization reveals the team's defensive coverage and pressure zones."
@@ -828,6 +832,79 @@ def create_set_piece_analysis(events_df, team):
     
     return f'data:image/png;base64,{img_str}'
 
+@cached_figure('pass_length_distribution')
+def pass_length_figure(match_id, team):
+    """Histogram of the lengths of a team's completed passes in a match"""
+    events_df = load_match_data(match_id)
+    team_passes = events_df[
+        (entity_names(events_df['team']) == team) &
+        (events_df['type'] == 'Pass') &
+        (events_df['pass_outcome'].isna())
+    ]
+
+    if not team_passes.empty:
+        # Calculate pass lengths
+        pass_lengths = np.hypot(team_passes['pass_end_x'] - team_passes['x'],
+                                team_passes['pass_end_y'] - team_passes['y']).dropna()
+
+        fig = go.Figure(go.Histogram(
+            x=pass_lengths,
+            nbinsx=20,
+            marker=dict(color='lightblue', line=dict(color='darkblue', width=1))
+        ))
+        fig.update_layout(
+            title="Pass Length Distribution",
+            xaxis_title="Pass Length (meters)",
+            yaxis_title="Frequency"
+        )
+        compact_figure(fig, 'pass_length_distribution', decimals=1)
+    else:
+        fig = go.Figure().add_annotation(text="No pass data", 
+                                        xref="paper", yref="paper", x=0.5, y=0.5)
+    return fig
+
+@cached_figure('event_activity_timeline')
+def event_activity_figure(match_id, team):
+    """A team's events per match minute, with the event type breakdown on hover"""
+    events_df = load_match_data(match_id)
+    team_events = events_df[entity_names(events_df['team']) == team]
+
+    if not team_events.empty:
+        # Event type counts per minute, most frequent first; only the
+        # breakdown lines travel per point, the rest is in the hovertemplate
+        type_counts = team_events.groupby(['minute', 'type']).size().reset_index(name='count')
+        type_counts = type_counts.sort_values(['minute', 'count'], ascending=[True, False], kind='stable')
+        type_counts['line'] = '• ' + type_counts['type'] + ': ' + type_counts['count'].astype(str)
+        events_by_minute = type_counts.groupby('minute').agg(count=('count', 'sum'), breakdown=('line', '<br>'.join)).reset_index()
+
+        fig = go.Figure(go.Scatter(
+            x=events_by_minute['minute'],
+            y=events_by_minute['count'],
+            mode='lines+markers',
+            line=dict(color='green', width=2),
+            marker=dict(size=8, color='green', line=dict(width=1, color='darkgreen')),
+            customdata=events_by_minute['breakdown'],
+            hovertemplate='<b>Minute %{x}</b><br>Total Events: %{y}<br><br>Breakdown:<br>%{customdata}<br><extra></extra>',
+            name='Event Count'
+        ))
+
+        fig.update_layout(
+            title="Event Activity Timeline",
+            xaxis_title="Match Minute",
+            yaxis_title="Events per Minute",
+            hovermode='closest',
+            hoverlabel=dict(
+                bgcolor="white",
+                font_size=12,
+                font_family="Arial"
+            )
+        )
+        compact_figure(fig, 'event_activity_timeline')
+    else:
+        fig = go.Figure().add_annotation(text="No event data", 
+                                        xref="paper", yref="paper", x=0.5, y=0.5)
+    return fig
+
 @callback(
     Output('secondary-viz-1', 'figure'),
     Output('secondary-viz-2', 'figure'),
@@ -841,104 +918,199 @@ def update_secondary_visualizations(team, match_id):
         return empty_fig, empty_fig
     
     try:
-        events_df = load_match_data(match_id)
-        
-        # Viz 1: Pass length distribution
-        team_passes = events_df[
-            (events_df['team'].apply(
-                lambda x: x.get('name', '') == team if isinstance(x, dict) else str(x) == team
-            )) &
-            (events_df['type'] == 'Pass') &
-            (events_df['pass_outcome'].isna())
-        ]
-        
-        if not team_passes.empty:
-            # Calculate pass lengths
-            pass_lengths = []
-            for _, pass_event in team_passes.iterrows():
-                if pd.notna(pass_event['x']) and pd.notna(pass_event['pass_end_x']):
-                    length = np.sqrt(
-                        (pass_event['pass_end_x'] - pass_event['x'])**2 + 
-                        (pass_event['pass_end_y'] - pass_event['y'])**2
-                    )
-                    pass_lengths.append(length)
-            
-            fig1 = go.Figure(go.Histogram(
-                x=pass_lengths,
-                nbinsx=20,
-                marker=dict(color='lightblue', line=dict(color='darkblue', width=1))
-            ))
-            fig1.update_layout(
-                title="Pass Length Distribution",
-                xaxis_title="Pass Length (meters)",
-                yaxis_title="Frequency"
-            )
-        else:
-            fig1 = go.Figure().add_annotation(text="No pass data", 
-                                            xref="paper", yref="paper", x=0.5, y=0.5)
-        
-        # Viz 2: Event timeline
-        team_events = events_df[
-            events_df['team'].apply(
-                lambda x: x.get('name', '') == team if isinstance(x, dict) else str(x) == team
-            )
-        ]
-        
-        if not team_events.empty:
-            events_by_minute = team_events.groupby('minute').size().reset_index(name='count')
-            
-            # Add event types to enhance hover information
-            event_types_by_minute = {}
-            for minute in events_by_minute['minute']:
-                minute_events = team_events[team_events['minute'] == minute]
-                type_counts = minute_events['type'].value_counts().to_dict()
-                event_types_by_minute[minute] = type_counts
-            
-            # Create hover text with event type breakdown
-            hover_texts = []
-            for minute in events_by_minute['minute']:
-                types = event_types_by_minute[minute]
-                hover_text = f"<b>Minute {minute}</b><br>"
-                hover_text += f"Total Events: {events_by_minute[events_by_minute['minute'] == minute]['count'].values[0]}<br>"
-                hover_text += "<br>Breakdown:<br>"
-                for event_type, count in sorted(types.items(), key=lambda x: x[1], reverse=True):
-                    if count > 0:
-                        hover_text += f"• {event_type}: {count}<br>"
-                hover_texts.append(hover_text)
-            
-            fig2 = go.Figure(go.Scatter(
-                x=events_by_minute['minute'],
-                y=events_by_minute['count'],
-                mode='lines+markers',
-                line=dict(color='green', width=2),
-                marker=dict(size=8, color='green', line=dict(width=1, color='darkgreen')),
-                hoverinfo='text',
-                hovertext=hover_texts,
-                name='Event Count'
-            ))
-            
-            fig2.update_layout(
-                title="Event Activity Timeline",
-                xaxis_title="Match Minute",
-                yaxis_title="Events per Minute",
-                hovermode='closest',
-                hoverlabel=dict(
-                    bgcolor="white",
-                    font_size=12,
-                    font_family="Arial"
-                )
-            )
-        else:
-            fig2 = go.Figure().add_annotation(text="No event data", 
-                                            xref="paper", yref="paper", x=0.5, y=0.5)
-        
-        return fig1, fig2
+        return pass_length_figure(match_id, team), event_activity_figure(match_id, team)
         
     except Exception as e:
         error_fig = go.Figure().add_annotation(text=f"Error: {str(e)}", 
                                              xref="paper", yref="paper", x=0.5, y=0.5)
         return error_fig, error_fig
 
+@cached_figure('team_comparison', per_team=False)
+def team_comparison_figure(match_id):
+    """Side-by-side bars of both teams' key match metrics"""
+    matches = load_euro_2024_matches()
+    match_info = matches[matches['match_id'] == match_id].iloc[0]
+
+    home_team = match_info['home_team']
+    away_team = match_info['away_team']
+
+    # Calculate match result for context
+    home_score = match_info['home_score']
+    away_score = match_info['away_score']
+
+    if home_score > away_score:
+        # Home team wins
+        home_color = '#2ecc71'  # Green for winner
+        away_color = '#e74c3c'  # Red for loser
+        result_text = f"{home_team} won {home_score}-{away_score}"
+    elif away_score > home_score:
+        # Away team wins
+        home_color = '#e74c3c'  # Red for loser
+        away_color = '#2ecc71'  # Green for winner
+        result_text = f"{away_team} won {away_score}-{home_score}"
+    else:
+        # Draw - use different colors
+        home_color = '#3498db'  # Blue for first team
+        away_color = '#9b59b6'  # Purple for second team
+        result_text = f"Match ended in a {home_score}-{away_score} draw"
+
+    # Compare key metrics, from the same engine as the match Statistics tab
+    metrics = {}
+    for team in [home_team, away_team]:
+        team_stats = team_match_stats(match_id, team)
+        metrics[team] = {
+            'Total Passes': team_stats['passes'],
+            'Pass Completion (%)': team_stats['pass_completion'],
+            'Total Shots': team_stats['shots'],
+            'Shot Accuracy (%)': team_stats['shot_accuracy'],
+            'Duels': team_stats['duels'],
+            'Duel Success (%)': team_stats['duel_success'],
+            'Interceptions': team_stats['interceptions'],
+            'Dribbles': team_stats['dribbles'],
+            'Dribble Success (%)': team_stats['dribble_success'],
+            'Fouls': team_stats['fouls']
+        }
+
+    # Create enhanced comparison chart
+    # Separate count metrics and percentage metrics
+    count_metrics = ['Total Passes', 'Total Shots', 'Duels', 'Interceptions', 'Dribbles', 'Fouls']
+    pct_metrics = ['Pass Completion (%)', 'Shot Accuracy (%)', 'Dribble Success (%)', 'Duel Success (%)'] 
+
+    # Create figure with subplots
+    fig = go.Figure()
+
+    # One bar trace per team and metric kind, home bars to the right and
+    # away bars (negative widths) to the left
+    rows = []
+    for metric in count_metrics:
+        if metric in metrics[home_team] and metric in metrics[away_team]:
+            home_val = metrics[home_team][metric]
+            away_val = metrics[away_team][metric]
+
+            # Calculate bar width based on value, ensuring minimum width for display
+            max_val = max(home_val, away_val, 1)  # Ensure we don't divide by zero
+            # Apply minimum width for better visibility
+            rows.append(dict(kind='count', metric=metric, home=home_val, away=away_val,
+                             home_width=(home_val / max_val * 100) if home_val > 0 else 1,
+                             away_width=(away_val / max_val * 100) if away_val > 0 else 1))
+
+    # Percentage metrics below with a patterned fill (max is 100%)
+    for metric in pct_metrics:
+        if metric in metrics[home_team] and metric in metrics[away_team]:
+            home_val = metrics[home_team][metric]
+            away_val = metrics[away_team][metric]
+            # Apply minimum width for percentages too
+            rows.append(dict(kind='pct', metric=metric, home=home_val, away=away_val,
+                             home_width=max(home_val, 1) if home_val > 0 else 1,
+                             away_width=max(away_val, 1) if away_val > 0 else 1))
+    rows = pd.DataFrame(rows, columns=['kind', 'metric', 'home', 'away', 'home_width', 'away_width'])
+
+    for kind, suffix, pattern, value_format in [('count', '', None, '{}'), ('pct', ' %', dict(shape="/"), '{:.1f}%')]:
+        kind_rows = rows[rows['kind'] == kind]
+        if kind_rows.empty:
+            continue
+        for side, team_name, color, sign in [('home', home_team, home_color, 1), ('away', away_team, away_color, -1)]:
+            labels = kind_rows[side].map(value_format.format)
+            fig.add_trace(go.Bar(
+                y=kind_rows['metric'],
+                x=sign * kind_rows[f'{side}_width'],
+                orientation='h',
+                name=f"{team_name}{suffix}",  # Percentage bars get their own legend entry
+                marker=dict(
+                    color=color,
+                    pattern=pattern,
+                    line=dict(width=1, color='#2c3e50')
+                ),
+                text=labels,
+                textposition='inside',
+                insidetextanchor='middle',
+                textfont=dict(color='white', size=12),  # Ensure text is visible
+                hovertemplate=f'<b>{team_name}</b><br>%{{y}}: %{{text}}<extra></extra>',
+                legendgroup=f"team{1 if side == 'home' else 2}{'_pct' if kind == 'pct' else ''}"
+            ))
+
+    # Update layout with enhanced styling
+    fig.update_layout(
+        title={
+            'text': f"<b>Team Comparison: {home_team} vs {away_team}</b><br><span style='font-size:14px; padding-top:20px;'>{result_text}</span>",
+            'x': 0.5,
+            'y': 0.95,  # Reduced y position to prevent cropping
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 22, 'color': '#2c3e50'}
+        },
+        xaxis=dict(
+            title="Count / Percentage",
+            zeroline=True,
+            zerolinecolor='#2c3e50',
+            zerolinewidth=2,
+            range=[-105, 105],  # Symmetric range for better visualization
+            tickvals=[-100, -75, -50, -25, 0, 25, 50, 75, 100],
+            ticktext=['100', '75', '50', '25', '0', '25', '50', '75', '100'],
+            gridcolor='rgba(211, 211, 0.3)',
+            title_standoff=20  # Add space between title and axis
+        ),
+        yaxis=dict(
+            autorange="reversed",  # Reverse to match natural reading order
+            categoryorder='array',
+            categoryarray=count_metrics + pct_metrics,  # Ensure correct order
+            gridcolor='rgba(211, 211, 211, 0.3)',
+            tickfont=dict(size=13),  # Larger text for better readability
+            title_standoff=20  # Add space between title and axis
+        ),
+        barmode='overlay',
+        bargap=0.3,
+        height=700,  # Increased height for better spacing between elements
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.05,  # Move higher to avoid overlap with title
+            xanchor='center',
+            x=0.5,
+            bgcolor='rgba(255, 255, 255, 0.9)',
+            bordercolor='rgba(0, 0, 0, 0.2)',
+            borderwidth=1,
+            font=dict(size=12),  # Adjust font size
+            itemsizing='constant',  # Ensure consistent size of legend items
+            itemwidth=40  # Control width of legend items
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=120, r=60, t=150, b=50),  # Increased top margin to prevent title cropping
+        hovermode='closest'
+    )
+
+    # Add labels for team names on left and right with improved positioning
+    # Check if we have count metrics to position the labels properly
+    if count_metrics:
+        fig.add_annotation(
+            x=-80,  # Adjusted position to avoid overlap
+            y=count_metrics[0],
+            text=f"<b>{away_team}</b>",
+            showarrow=False,
+            font=dict(size=14, color=away_color),
+            xanchor='center',
+            bgcolor="rgba(255, 255, 255, 0.7)",  # Add background for better visibility
+            bordercolor=away_color,
+            borderwidth=1,
+            borderpad=4
+        )
+
+        fig.add_annotation(
+            x=80,  # Adjusted position to avoid overlap
+            y=count_metrics[0],
+            text=f"<b>{home_team}</b>",
+            showarrow=False,
+            font=dict(size=14, color=home_color),
+            xanchor='center',
+            bgcolor="rgba(255, 255, 255, 0.7)",  # Add background for better visibility
+            bordercolor=home_color,
+            borderwidth=1,
+            borderpad=4
+        )
+
+    return compact_figure(fig, 'team_comparison')
+
 @callback(
     Output('team-comparison-viz', 'figure'),
     Input('tactical-match-dropdown', 'value')
@@ -954,299 +1126,7 @@ def update_team_comparison(match_id):
         return empty_fig
     
     try:
-        events_df = load_match_data(match_id)
-        matches = load_euro_2024_matches()
-        match_info = matches[matches['match_id'] == match_id].iloc[0]
-        
-        home_team = match_info['home_team']
-        away_team = match_info['away_team']
-        
-        # Calculate match result for context
-        home_score = match_info['home_score']
-        away_score = match_info['away_score']
-        
-        if home_score > away_score:
-            # Home team wins
-            home_color = '#2ecc71'  # Green for winner
-            away_color = '#e74c3c'  # Red for loser
-            result_text = f"{home_team} won {home_score}-{away_score}"
-        elif away_score > home_score:
-            # Away team wins
-            home_color = '#e74c3c'  # Red for loser
-            away_color = '#2ecc71'  # Green for winner
-            result_text = f"{away_team} won {away_score}-{home_score}"
-        else:
-            # Draw - use different colors
-            home_color = '#3498db'  # Blue for first team
-            away_color = '#9b59b6'  # Purple for second team
-            result_text = f"Match ended in a {home_score}-{away_score} draw"
-        
-        # Compare key metrics with expanded metrics
-        metrics = {}
-        for team in [home_team, away_team]:
-            team_events = events_df[
-                events_df['team'].apply(
-                    lambda x: x.get('name', '') == team if isinstance(x, dict) else str(x) == team
-                )
-            ]
-            
-            # Calculate pass completion rate
-            total_passes = len(team_events[team_events['type'] == 'Pass'])
-            successful_passes = len(team_events[
-                (team_events['type'] == 'Pass') & 
-                (team_events['pass_outcome'].isna())
-            ])
-            pass_completion = (successful_passes / total_passes * 100) if total_passes > 0 else 0
-            
-            # Calculate shots on target percentage
-            total_shots = len(team_events[team_events['type'] == 'Shot'])
-            
-            # Based on the data sample, shot_outcome is a string for this dataset
-            shots_on_target = len(team_events[
-                (team_events['type'] == 'Shot') &
-                (team_events['shot_outcome'] == 'Saved')
-            ]) + len(team_events[
-                (team_events['type'] == 'Shot') &
-                (team_events['shot_outcome'] == 'Goal')
-            ])
-                
-            shot_accuracy = (shots_on_target / total_shots * 100) if total_shots > 0 else 0
-            
-            # Calculate successful dribbles
-            total_dribbles = len(team_events[team_events['type'] == 'Dribble'])
-            
-            # Based on the data sample, dribble_outcome is a string value 'Complete'
-            successful_dribbles = len(team_events[
-                (team_events['type'] == 'Dribble') &
-                (team_events['dribble_outcome'] == 'Complete')
-            ])
-            
-            dribble_success = (successful_dribbles / total_dribbles * 100) if total_dribbles > 0 else 0
-            
-            # Enhanced metrics with both counts and percentages
-            total_duels = len(team_events[team_events['type'] == 'Duel'])
-            
-            # Calculate successful duels (won or success outcomes)
-            successful_duels = len(team_events[
-                (team_events['type'] == 'Duel') &
-                (team_events['duel_outcome'].apply(
-                    lambda x: x in ['Success In Play', 'Won', 'Success Out'] if isinstance(x, str) else False
-                ))
-            ])
-            
-            # Calculate duel success percentage
-            duel_success = (successful_duels / total_duels * 100) if total_duels > 0 else 0
-            
-            # If there are no duels at all, use a reasonable estimate for demo purposes
-            if total_duels == 0 and len(team_events) > 0:
-                # Roughly estimate duels as 5-10% of total events
-                total_duels = max(1, len(team_events) // 20)
-            metrics[team] = {
-                'Total Passes': total_passes,
-                'Pass Completion (%)': pass_completion,
-                'Total Shots': total_shots,
-                'Shot Accuracy (%)': shot_accuracy,
-                # Duels are counted directly from the event type
-                'Duels': total_duels,
-                'Duel Success (%)': duel_success,
-                'Interceptions': len(team_events[team_events['type'] == 'Interception']),
-                'Dribbles': total_dribbles,
-                'Dribble Success (%)': dribble_success,
-                'Fouls': len(team_events[team_events['type'] == 'Foul Committed'])
-            }
-        
-        # Create enhanced comparison chart
-        # Separate count metrics and percentage metrics
-        count_metrics = ['Total Passes', 'Total Shots', 'Duels', 'Interceptions', 'Dribbles', 'Fouls']
-        pct_metrics = ['Pass Completion (%)', 'Shot Accuracy (%)', 'Dribble Success (%)', 'Duel Success (%)'] 
-        
-        # Create figure with subplots
-        fig = go.Figure()
-        
-        # Add horizontal bar traces for count metrics
-        for i, metric in enumerate(count_metrics):
-            if metric in metrics[home_team] and metric in metrics[away_team]:
-                home_val = metrics[home_team][metric]
-                away_val = metrics[away_team][metric]
-                
-                # Calculate bar width based on value, ensuring minimum width for display
-                max_val = max(home_val, away_val, 1)  # Ensure we don't divide by zero
-                # Apply minimum width for better visibility
-                home_width = (home_val / max_val * 100) if home_val > 0 else 1
-                away_width = (away_val / max_val * 100) if away_val > 0 else 1
-                
-                # Create the metric row
-                fig.add_trace(go.Bar(
-                    y=[metric],
-                    x=[home_width],
-                    orientation='h',
-                    name=home_team,
-                    marker=dict(
-                        color=home_color,
-                        line=dict(width=1, color='#2c3e50')
-                    ),
-                    text=[f"{home_val}"],
-                    textposition='inside',
-                    insidetextanchor='middle',
-                    textfont=dict(color='white', size=12),  # Ensure text is visible
-                    hovertemplate=f'<b>{home_team}</b><br>{metric}: {home_val}<extra></extra>',
-                    legendgroup='team1',
-                    showlegend=i==0  # Only show in legend once
-                ))
-                
-                fig.add_trace(go.Bar(
-                    y=[metric],
-                    x=[-away_width],  # Negative for left side
-                    orientation='h',
-                    name=away_team,
-                    marker=dict(
-                        color=away_color,
-                        line=dict(width=1, color='#2c3e50')
-                    ),
-                    text=[f"{away_val}"],
-                    textposition='inside',
-                    insidetextanchor='middle',
-                    textfont=dict(color='white', size=12),  # Ensure text is visible
-                    hovertemplate=f'<b>{away_team}</b><br>{metric}: {away_val}<extra></extra>',
-                    legendgroup='team2',
-                    showlegend=i==0  # Only show in legend once
-                ))
-        
-        # Add percentage metrics below with a different visual approach
-        for i, metric in enumerate(pct_metrics):
-            if metric in metrics[home_team] and metric in metrics[away_team]:
-                home_val = metrics[home_team][metric]
-                away_val = metrics[away_team][metric]
-                
-                # Position these metrics below the count metrics
-                y_pos = -1 - i  # Start below count metrics
-                
-                # Create percentage bars (max is 100%)
-                # Apply minimum width for percentages too
-                home_pct_width = max(home_val, 1) if home_val > 0 else 1
-                
-                fig.add_trace(go.Bar(
-                    y=[metric],
-                    x=[home_pct_width],
-                    orientation='h',
-                    name=f"{home_team} %",  # Different name to keep separate in legend
-                    marker=dict(
-                        color=home_color,
-                        pattern=dict(shape="/"),  # Add pattern to distinguish percentage metrics
-                        line=dict(width=1, color='#2c3e50')
-                    ),
-                    text=[f"{home_val:.1f}%"],
-                    textposition='inside',
-                    insidetextanchor='middle',
-                    textfont=dict(color='white', size=12),  # Ensure text is visible
-                    hovertemplate=f'<b>{home_team}</b><br>{metric}: {home_val:.1f}%<extra></extra>',
-                    legendgroup='team1_pct',
-                    showlegend=i==0  # Only show in legend once
-                ))
-                
-                # Apply minimum width for away percentages too
-                away_pct_width = max(away_val, 1) if away_val > 0 else 1
-                
-                fig.add_trace(go.Bar(
-                    y=[metric],
-                    x=[-away_pct_width],  # Negative for left side
-                    orientation='h',
-                    name=f"{away_team} %",  # Different name to keep separate in legend
-                    marker=dict(
-                        color=away_color,
-                        pattern=dict(shape="/"),  # Add pattern to distinguish percentage metrics
-                        line=dict(width=1, color='#2c3e50')
-                    ),
-                    text=[f"{away_val:.1f}%"],
-                    textposition='inside',
-                    insidetextanchor='middle',
-                    textfont=dict(color='white', size=12),  # Ensure text is visible
-                    hovertemplate=f'<b>{away_team}</b><br>{metric}: {away_val:.1f}%<extra></extra>',
-                    legendgroup='team2_pct',
-                    showlegend=i==0  # Only show in legend once
-                ))
-        
-        # Update layout with enhanced styling
-        fig.update_layout(
-            title={
-                'text': f"<b>Team Comparison: {home_team} vs {away_team}</b><br><span style='font-size:14px; padding-top:20px;'>{result_text}</span>",
-                'x': 0.5,
-                'y': 0.95,  # Reduced y position to prevent cropping
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': {'size': 22, 'color': '#2c3e50'}
-            },
-            xaxis=dict(
-                title="Count / Percentage",
-                zeroline=True,
-                zerolinecolor='#2c3e50',
-                zerolinewidth=2,
-                range=[-105, 105],  # Symmetric range for better visualization
-                tickvals=[-100, -75, -50, -25, 0, 25, 50, 75, 100],
-                ticktext=['100', '75', '50', '25', '0', '25', '50', '75', '100'],
-                gridcolor='rgba(211, 211, 0.3)',
-                title_standoff=20  # Add space between title and axis
-            ),
-            yaxis=dict(
-                autorange="reversed",  # Reverse to match natural reading order
-                categoryorder='array',
-                categoryarray=count_metrics + pct_metrics,  # Ensure correct order
-                gridcolor='rgba(211, 211, 211, 0.3)',
-                tickfont=dict(size=13),  # Larger text for better readability
-                title_standoff=20  # Add space between title and axis
-            ),
-            barmode='overlay',
-            bargap=0.3,
-            height=700,  # Increased height for better spacing between elements
-            legend=dict(
-                orientation='h',
-                yanchor='bottom',
-                y=1.05,  # Move higher to avoid overlap with title
-                xanchor='center',
-                x=0.5,
-                bgcolor='rgba(255, 255, 255, 0.9)',
-                bordercolor='rgba(0, 0, 0, 0.2)',
-                borderwidth=1,
-                font=dict(size=12),  # Adjust font size
-                itemsizing='constant',  # Ensure consistent size of legend items
-                itemwidth=40  # Control width of legend items
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=120, r=60, t=150, b=50),  # Increased top margin to prevent title cropping
-            hovermode='closest'
-        )
-        
-        # Add labels for team names on left and right with improved positioning
-        # Check if we have count metrics to position the labels properly
-        if count_metrics:
-            fig.add_annotation(
-                x=-80,  # Adjusted position to avoid overlap
-                y=count_metrics[0],
-                text=f"<b>{away_team}</b>",
-                showarrow=False,
-                font=dict(size=14, color=away_color),
-                xanchor='center',
-                bgcolor="rgba(255, 255, 255, 0.7)",  # Add background for better visibility
-                bordercolor=away_color,
-                borderwidth=1,
-                borderpad=4
-            )
-            
-            fig.add_annotation(
-                x=80,  # Adjusted position to avoid overlap
-                y=count_metrics[0],
-                text=f"<b>{home_team}</b>",
-                showarrow=False,
-                font=dict(size=14, color=home_color),
-                xanchor='center',
-                bgcolor="rgba(255, 255, 255, 0.7)",  # Add background for better visibility
-                bordercolor=home_color,
-                borderwidth=1,
-                borderpad=4
-            )
-        
-        return fig
+        return team_comparison_figure(match_id)
         
     except Exception as e:
         return go.Figure().add_annotation(text=f"Error: {str(e)}", 
@@ -1,8 +1,17 @@
 
 # dashboards/layout.py
-from dash import html, dcc
+from dash import html, dcc, callback, Input, Output, State, no_update
 from components import match_overview_simple as match_overview, player_dashboard, tactical_view, event_explorer
 
+# (tab value, label, layout builder); each tab's content is built the first time it is selected
+TABS = [
+    ('tournament', "📊 Tournament Overview", match_overview.tournament_layout),
+    ('match', "🏟️ Match Overview", match_overview.layout),
+    ('player', "🏃‍♂️ Player Dashboard", player_dashboard.layout),
+    ('tactical', "⚡ Tactical Analysis", tactical_view.layout),
+    ('explorer', "🔍 Event Explorer", event_explorer.layout),
+]
+
 def create_dashboard_layout():
     return html.Div([
         # Navigation header
@@ -20,37 +29,15 @@ def create_dashboard_layout():
         
         # Main content with tabs
         html.Div([
-            dcc.Tabs([
-                dcc.Tab(
-                    label="📊 Tournament Overview", 
-                    children=match_overview.tournament_layout(),
-                    style={'padding': '10px', 'fontWeight': 'bold'},
-                    selected_style={'padding': '10px', 'fontWeight': 'bold', 'backgroundColor': '#3498db', 'color': 'white'}
-                ),
+            dcc.Tabs(id='main-tabs', value=TABS[0][0], children=[
                 dcc.Tab(
-                    label="🏟️ Match Overview", 
-                    children=match_overview.layout(),
+                    label=label,
+                    value=value,
+                    children=html.Div(id=f'{value}-tab-content'),
                     style={'padding': '10px', 'fontWeight': 'bold'},
                     selected_style={'padding': '10px', 'fontWeight': 'bold', 'backgroundColor': '#3498db', 'color': 'white'}
-                ),
-                dcc.Tab(
-                    label="🏃‍♂️ Player Dashboard", 
-                    children=player_dashboard.layout(),
-                    style={'padding': '10px', 'fontWeight': 'bold'},
-                    selected_style={'padding': '10px', 'fontWeight': 'bold', 'backgroundColor': '#3498db', 'color': 'white'}
-                ),
-                dcc.Tab(
-                    label="⚡ Tactical Analysis", 
-                    children=tactical_view.layout(),
-                    style={'padding': '10px', 'fontWeight': 'bold'},
-                    selected_style={'padding': '10px', 'fontWeight': 'bold', 'backgroundColor': '#3498db', 'color': 'white'}
-                ),
-                dcc.Tab(
-                    label="🔍 Event Explorer", 
-                    children=event_explorer.layout(),
-                    style={'padding': '10px', 'fontWeight': 'bold'},
-                    selected_style={'padding': '10px', 'fontWeight': 'bold', 'backgroundColor': '#3498db', 'color': 'white'}
-                ),
+                )
+                for value, label, _ in TABS
             ], 
             style={'marginBottom': '20px'},
             colors={
@@ -80,4 +67,17 @@ def create_dashboard_layout():
         'backgroundColor': '#f8f9fa',
         'minHeight': '100vh',
         'fontFamily': 'Arial, sans-serif'
-    })
\ No newline at end of file
+    })
+
+
+@callback(
+    [Output(f'{value}-tab-content', 'children') for value, _, _ in TABS],
+    Input('main-tabs', 'value'),
+    [State(f'{value}-tab-content', 'children') for value, _, _ in TABS]
+)
+def render_selected_tab(selected, *contents):
+    """Build a tab's layout on its first activation and keep it afterwards"""
+    return [
+        build() if value == selected and content is None else no_update
+        for (value, _, build), content in zip(TABS, contents)
+    ]
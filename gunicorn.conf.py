@@ -0,0 +1,64 @@
+"""
+Gunicorn settings for the production server
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Every setting can be overridden with the environment variables below.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get('BIND', '0.0.0.0:8050')
+
+# One process per core; each runs a few threads for I/O-bound callbacks
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app (and preload the shared data in wsgi.py) once, before forking
+preload_app = True
+
+# Data loads from StatsBomb can be slow on a cold cache
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# On SIGTERM, workers finish in-flight requests for up to this long
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers now and then (matplotlib and the lru caches grow over time);
+# with preload a replacement is a cheap fork of the master
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', None)
+errorlog = '-'
+
+# Workers write metrics snapshots here and /metrics adds them up (read by
+# utils.metrics when the app is imported, so set before preloading)
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'football-dashboard-metrics'))
+
+
+def on_starting(server):
+    """Drop the metrics snapshots of a previous server run"""
+    from utils.metrics import clear_snapshots
+    clear_snapshots()
+
+
+def when_ready(server):
+    """Report what the master recorded while preloading, before workers fork"""
+    from utils.metrics import write_snapshot
+    write_snapshot('master.json')
+
+
+def post_fork(server, worker):
+    from utils.metrics import start_worker_snapshots
+    start_worker_snapshots()
+
+
+def worker_exit(server, worker):
+    """Keep the worker's metrics and reap child processes left by the Sbopen parser"""
+    from utils.metrics import retire_worker_snapshot
+    retire_worker_snapshot()
+    multiprocessing.active_children()
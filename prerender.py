@@ -0,0 +1,50 @@
+"""Prerender the deterministic match figures into the figure cache.
+
+Builds every registered figure (match xG timeline and pass networks, team
+comparison, pass-length histogram, event activity timeline) for each Euro 2024
+match and stores its JSON under cache/figures/, so the dashboard serves them
+without building anything. Both teams' formation images are rendered to PNG
+and stored next to the other cached tables (skip them with --no-formations).
+Stored figures are skipped unless --force is given; after refreshing the event
+data, set a new FIGURE_DATA_VERSION instead.
+
+Usage:
+    python prerender.py [--matches N] [--builders NAME [NAME ...]] [--no-formations] [--force]
+"""
+import argparse
+import time
+
+from utils.data_loader import load_euro_2024_matches
+from utils.figure_cache import FIGURE_BUILDERS, prerender_figures
+# Importing the dashboards registers their figure builders
+from components.match_overview_simple import prerender_formation_images
+import components.tactical_view  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=None, help="Limit to the first N matches (default: all 51)")
+    parser.add_argument('--builders', nargs='+', choices=sorted(FIGURE_BUILDERS), default=None,
+                        help="Figures to render (default: all)")
+    parser.add_argument('--no-formations', action='store_true', help="Skip the formation images")
+    parser.add_argument('--force', action='store_true', help="Rebuild figures that are already stored")
+    args = parser.parse_args()
+
+    matches = load_euro_2024_matches()
+    if args.matches:
+        matches = matches.head(args.matches)
+
+    print(f"🎨 Prerendering {', '.join(args.builders or FIGURE_BUILDERS)} for {len(matches)} matches...")
+    start = time.perf_counter()
+    built = prerender_figures(matches, args.builders, force=args.force)
+    print(f"✅ Built {built} figures in {time.perf_counter() - start:.1f}s")
+
+    if not args.no_formations:
+        print(f"🎨 Prerendering formation images for {len(matches)} matches...")
+        start = time.perf_counter()
+        built = prerender_formation_images(matches, force=args.force)
+        print(f"✅ Built {built} formation images in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
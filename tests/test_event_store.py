@@ -0,0 +1,42 @@
+"""Tests for the Event Explorer's DataTable filter parsing"""
+
+import pandas as pd
+import pytest
+from utils.event_store import _split_filter_part, apply_filter_query
+
+
+@pytest.fixture
+def events():
+    return pd.DataFrame({
+        'minute': [3, 45, 88],
+        'type': ['Pass', 'Shot', 'Pass'],
+        'player': ['Antoine Griezmann', 'Lamine Yamal', 'Daniel Olmo'],
+    })
+
+
+@pytest.mark.parametrize('filter_part, expected', [
+    ('{player} contains "Antoine Griezmann"', ('player', 'contains', 'Antoine Griezmann')),
+    ('{player} eq "Lamine Yamal"', ('player', 'eq', 'Lamine Yamal')),
+    ('{player} scontains Lamine', ('player', 'contains', 'Lamine')),
+    ('{player} ne "Daniel Olmo"', ('player', 'ne', 'Daniel Olmo')),
+    ('{minute} >= 45', ('minute', 'ge', 45.0)),
+    ('{minute} s< 45', ('minute', 'lt', 45.0)),
+    ('{type} = Pass', ('type', 'eq', 'Pass')),
+])
+def test_split_filter_part(filter_part, expected):
+    assert _split_filter_part(filter_part) == expected
+
+
+def test_unknown_operator_is_ignored():
+    assert _split_filter_part('{player} like "Yamal"') == (None, None, None)
+
+
+def test_value_words_are_not_operators(events):
+    assert apply_filter_query(events, '{player} contains "Antoine Griezmann"')['player'].tolist() == ['Antoine Griezmann']
+    assert apply_filter_query(events, '{player} eq "Lamine Yamal"')['player'].tolist() == ['Lamine Yamal']
+    assert apply_filter_query(events, '{player} ne "Lamine Yamal"')['player'].tolist() == ['Antoine Griezmann', 'Daniel Olmo']
+
+
+def test_combined_filters(events):
+    filtered = apply_filter_query(events, '{type} eq Pass && {minute} > 10')
+    assert filtered['player'].tolist() == ['Daniel Olmo']
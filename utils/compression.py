@@ -0,0 +1,82 @@
+"""
+Response compression module
+Gzip-compresses Flask responses (Dash callback JSON, layout, component bundles)
+for clients that accept it
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+
+# Smaller bodies are sent as they are; the gzip header would eat the saving
+MIN_SIZE = 500
+
+# Level 5 is close to level 9 on JSON at a fraction of the CPU
+COMPRESS_LEVEL = 5
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/javascript',
+                      'text/html', 'text/css', 'text/plain')
+
+# Compressed bodies of static responses (fingerprinted or with an ETag), most recent last
+STATIC_CACHE_SIZE = 64
+
+_static_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def gzip_body(data: bytes, cache_key: str = None) -> bytes:
+    """
+    Gzip a response body
+
+    Args:
+        data: Uncompressed body
+        cache_key: Key of a static response whose compressed body is cached
+
+    Returns:
+        Compressed body
+    """
+    if cache_key:
+        with _lock:
+            if cache_key in _static_cache:
+                _static_cache.move_to_end(cache_key)
+                return _static_cache[cache_key]
+    compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    if cache_key:
+        with _lock:
+            _static_cache[cache_key] = compressed
+            while len(_static_cache) > STATIC_CACHE_SIZE:
+                _static_cache.popitem(last=False)
+    return compressed
+
+
+def register_compression(server) -> None:
+    """
+    Gzip every compressible response for clients that send Accept-Encoding: gzip
+
+    Streamed responses (event exports) and partial or empty responses are left
+    alone.
+
+    Args:
+        server: Flask app behind the Dash app (app.server)
+    """
+    from flask import request
+
+    @server.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+        # Dash's component bundles are either fingerprinted (long max-age) or carry an ETag
+        etag, _ = response.get_etag()
+        cache_key = etag or (request.full_path if response.cache_control.max_age else None)
+        response.set_data(gzip_body(data, cache_key))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
@@ -5,12 +5,15 @@ from mplsoccer import  Sbopen
 import pandas as pd
 import numpy as np
 from functools import lru_cache
+from utils.singleflight import single_flight
 # Avoid creating parser as a global object to prevent semaphore leaks
+@single_flight
 @lru_cache(maxsize=1)
 def load_euro_2024_matches():
     """Load all Euro 2024 matches"""
     return sb.matches(competition_id=55, season_id=282)
 
+@single_flight
 @lru_cache(maxsize=2)
 def load_match_data(match_id):
     """Load event data for a specific match"""
@@ -40,6 +43,7 @@ def load_match_data(match_id):
         events = pd.concat([events, all_coords], axis=1)
     
     return events
+@single_flight
 @lru_cache(maxsize=2)
 def load_sbopen_match_data(match_id):
     """Load event data for a specific match using sbopen"""
@@ -49,6 +53,7 @@ def load_sbopen_match_data(match_id):
     parser = Sbopen()
     event, related, freeze, tactics = parser.event(match_id)
     return event, related, freeze, tactics
+@single_flight
 @lru_cache(maxsize=1)
 def load_tournament_data():
     """Load all event data for Euro 2024"""
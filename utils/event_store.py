@@ -0,0 +1,348 @@
+"""
+Event store module
+Flat, per-match event frames and cached filter results shared by the Event
+Explorer callbacks, so a filter change is computed once instead of per view
+"""
+
+import re
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict, Any, Optional
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_match_data
+from utils.preprocess import entity_names
+from utils.spatial import heatmap_pyramid
+
+
+EVENT_FRAME_COLUMNS = ['period', 'minute', 'second', 'type', 'team', 'player', 'position', 'x', 'y', 'has_card']
+
+# Event type filter value that selects events carrying a card rather than a StatsBomb type
+CARD_FILTER = 'Card'
+
+# Columns shown in the explorer's events table; location is formatted from x/y per page
+TABLE_COLUMNS = ['minute', 'second', 'type', 'team', 'player', 'position', 'location']
+
+# DataTable filter_query operators: the word form, then its symbol
+FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'],
+                    ['ne ', '!='], ['eq ', '='], ['contains '], ['datestartswith ']]
+
+# Operator word or symbol -> word operator used by apply_filter_query
+_OPERATOR_NAMES = {operator.strip(): operator_type[0].strip()
+                   for operator_type in FILTER_OPERATORS for operator in operator_type}
+
+# '{column} operator value'; the operator is the first token after the column
+_FILTER_PART = re.compile(r'^\s*\{(?P<column>[^}]+)\}\s*(?P<operator>[si]?[<>=!]+|[a-z]+)\s*(?P<value>.*?)\s*$')
+
+
+@single_flight
+@lru_cache(maxsize=8)
+def load_event_frame(match_id: int) -> pd.DataFrame:
+    """
+    Flat view of a match's events with names resolved once
+
+    Rows are in the same order as load_match_data(match_id), so positions
+    into this frame are also positions into the full events.
+
+    Args:
+        match_id: StatsBomb match id
+
+    Returns:
+        DataFrame with EVENT_FRAME_COLUMNS and a RangeIndex
+    """
+    events_df = load_match_data(match_id)
+
+    def column(name, default=np.nan):
+        return events_df[name] if name in events_df.columns else pd.Series(default, index=events_df.index)
+
+    has_card = pd.Series(False, index=events_df.index)
+    for card_column in ['bad_behaviour_card', 'foul_committed_card']:
+        has_card |= column(card_column).notna()
+
+    frame = pd.DataFrame({
+        'period': column('period'),
+        'minute': column('minute'),
+        'second': column('second'),
+        'type': events_df['type'],
+        'team': entity_names(column('team')),
+        'player': entity_names(column('player')),
+        'position': entity_names(column('position')),
+        'x': column('x'),
+        'y': column('y'),
+        'has_card': has_card,
+    })
+    return frame.reset_index(drop=True)[EVENT_FRAME_COLUMNS]
+
+
+def _codes(series: pd.Series) -> tuple:
+    codes, labels = pd.factorize(series, sort=True)
+    return codes.tolist(), [str(label) for label in labels]
+
+
+@single_flight
+@lru_cache(maxsize=8)
+def compact_event_arrays(match_id: int) -> Dict[str, Any]:
+    """
+    Column arrays of a match's events for filtering in the browser
+
+    Strings are dictionary-encoded (code -1 means missing) and coordinates
+    are rounded to 0.1, so the payload is sent once per match and every
+    slider or dropdown change can be handled client-side.
+
+    Args:
+        match_id: StatsBomb match id
+
+    Returns:
+        Dictionary with match_id, minute, type/team/player codes and their
+        label lists (types, teams, players), x, y (None when missing) and card (0/1)
+    """
+    frame = load_event_frame(match_id)
+    type_codes, types = _codes(frame['type'])
+    team_codes, teams = _codes(frame['team'])
+    player_codes, players = _codes(frame['player'])
+
+    def coordinates(column):
+        values = frame[column].round(1)
+        return values.astype(object).where(values.notna(), None).tolist()
+
+    return {
+        'match_id': match_id,
+        'minute': frame['minute'].fillna(0).astype(int).tolist(),
+        'type': type_codes,
+        'team': team_codes,
+        'player': player_codes,
+        'types': types,
+        'teams': teams,
+        'players': players,
+        'x': coordinates('x'),
+        'y': coordinates('y'),
+        'card': frame['has_card'].astype(int).tolist(),
+    }
+
+
+def make_filter(match_id: int, event_type: Optional[str] = 'all', player: Optional[str] = 'all',
+                time_range: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Normalize Event Explorer filter values into a filter spec
+
+    The spec is small and JSON-serializable, so it can sit in a dcc.Store;
+    its 'key' identifies the cached result on the server. The Event Explorer
+    builds the same spec in the browser (assets/event_explorer.js filterSpec).
+
+    Args:
+        match_id: StatsBomb match id
+        event_type: Event type, 'Card' or 'all'
+        player: Player name or 'all'
+        time_range: [start, end] minutes (inclusive), or None for the whole match
+
+    Returns:
+        Dictionary with match_id, event_type, player, time_range and key
+    """
+    event_type = event_type or 'all'
+    player = player or 'all'
+    start, end = (int(time_range[0]), int(time_range[1])) if time_range else (0, 200)
+    return {
+        'match_id': match_id,
+        'event_type': event_type,
+        'player': player,
+        'time_range': [start, end],
+        'key': f"{match_id}|{event_type}|{player}|{start}-{end}",
+    }
+
+
+@lru_cache(maxsize=256)
+def _filtered_positions(match_id: int, event_type: str, player: str, start: int, end: int) -> np.ndarray:
+    frame = load_event_frame(match_id)
+    mask = frame['minute'].between(start, end).to_numpy()
+    if event_type == CARD_FILTER:
+        mask &= frame['has_card'].to_numpy()
+    elif event_type != 'all':
+        mask &= (frame['type'] == event_type).to_numpy()
+    if player != 'all':
+        mask &= (frame['player'] == player).to_numpy()
+    positions = np.flatnonzero(mask)
+    positions.setflags(write=False)
+    return positions
+
+
+def filtered_positions(spec: Dict[str, Any]) -> np.ndarray:
+    """Row positions selected by a filter spec (cached per spec)"""
+    start, end = spec['time_range']
+    return _filtered_positions(spec['match_id'], spec['event_type'], spec['player'], start, end)
+
+
+def filtered_events(spec: Dict[str, Any]) -> pd.DataFrame:
+    """Flat events selected by a filter spec (see load_event_frame)"""
+    return load_event_frame(spec['match_id']).iloc[filtered_positions(spec)]
+
+
+def filtered_raw_events(spec: Dict[str, Any]) -> pd.DataFrame:
+    """Full StatsBomb events selected by a filter spec, with every column"""
+    return load_match_data(spec['match_id']).iloc[filtered_positions(spec)]
+
+
+@lru_cache(maxsize=256)
+def _explorer_views(match_id: int, event_type: str, player: str, start: int, end: int, bins: tuple) -> Dict[str, Any]:
+    frame = load_event_frame(match_id)
+    selected = frame.iloc[_filtered_positions(match_id, event_type, player, start, end)]
+    # The distribution only applies the time range
+    in_window = frame.iloc[_filtered_positions(match_id, 'all', 'all', start, end)].dropna(subset=['type', 'team'])
+
+    # Ties go to the first type alphabetically, as in the browser
+    type_counts = selected['type'].value_counts().sort_index()
+    summary = {
+        'total': int(len(selected)),
+        'players': int(selected['player'].nunique()),
+        'common_type': str(type_counts.idxmax()) if not type_counts.empty else None,
+        'common_count': int(type_counts.max()) if not type_counts.empty else 0,
+    }
+
+    per_minute = (selected.dropna(subset=['type']).assign(minute=selected['minute'].fillna(0).astype(int))
+                  .groupby(['type', 'minute']).size())
+    timeline = [
+        {'type': str(name), 'minutes': counts.index.get_level_values('minute').tolist(), 'counts': counts.tolist()}
+        for name, counts in per_minute.groupby(level='type')
+    ]
+
+    distribution = {}
+    for (team, name), count in in_window.groupby(['team', 'type']).size().items():
+        distribution.setdefault(str(team), {})[str(name)] = int(count)
+
+    # Coordinates rounded like compact_event_arrays, so both modes fill the same bins
+    x, y = selected['x'].round(1), selected['y'].round(1)
+    located = x.notna() & y.notna()
+    heatmap = (heatmap_pyramid(x, y, resolutions=[bins])[bins]['statistic'].astype(int).tolist()
+               if located.any() else None)
+
+    return {'summary': summary, 'timeline': timeline, 'distribution': distribution, 'heatmap': heatmap}
+
+
+def explorer_views(spec: Dict[str, Any], resolution: str = '24x16') -> Dict[str, Any]:
+    """
+    Server-binned data of the Event Explorer views for one filter spec
+
+    The shapes match what assets/event_explorer.js computes from
+    compact_event_arrays in the browser, so both explorer modes share the
+    figure code, and the payload is O(types x minutes + bins) whatever the
+    number of events.
+
+    Args:
+        spec: Filter spec from make_filter
+        resolution: Heatmap grid as 'NXxNY' (see spatial.HEATMAP_RESOLUTIONS)
+
+    Returns:
+        Dictionary with key and resolution (identifying the request), 'summary'
+        (total, players, common_type, common_count), 'timeline' (per type:
+        minutes and counts), 'distribution' (team -> type -> count, time range
+        only) and 'heatmap' (counts per bin, rows along y, or None without
+        located events)
+    """
+    start, end = spec['time_range']
+    bins = tuple(int(b) for b in resolution.split('x'))
+    views = _explorer_views(spec['match_id'], spec['event_type'], spec['player'], start, end, bins)
+    return {'key': spec['key'], 'resolution': resolution, **views}
+
+
+def format_locations(frame: pd.DataFrame) -> pd.Series:
+    """Format x/y as '(x, y)' strings, 'N/A' where the location is missing"""
+    valid = frame['x'].notna() & frame['y'].notna()
+    text = '(' + frame['x'].round(1).astype(str) + ', ' + frame['y'].round(1).astype(str) + ')'
+    return text.where(valid, 'N/A')
+
+
+def _split_filter_part(filter_part: str) -> tuple:
+    """
+    Split one DataTable filter expression into (column, operator, value)
+
+    The operator is the token right after '{column}', so words inside the
+    value ('Antoine Griezmann', 'Lamine Yamal') are never read as operators.
+    Symbols map to their word operator ('>=' -> 'ge'), and the case prefixes
+    of the DataTable ('scontains', 'i=') are dropped.
+    """
+    match = _FILTER_PART.match(filter_part)
+    if match is None:
+        return None, None, None
+    column, operator, value_part = match.group('column', 'operator', 'value')
+    if operator not in _OPERATOR_NAMES and operator[:1] in ('s', 'i'):
+        operator = operator[1:]
+    operator = _OPERATOR_NAMES.get(operator)
+    if operator is None:
+        return None, None, None
+    if len(value_part) > 1 and value_part[0] == value_part[-1] and value_part[0] in ("'", '"', '`'):
+        value = value_part[1:-1].replace('\\' + value_part[0], value_part[0])
+    else:
+        try:
+            value = float(value_part)
+        except ValueError:
+            value = value_part
+    return column, operator, value
+
+
+def apply_filter_query(frame: pd.DataFrame, filter_query: Optional[str]) -> pd.DataFrame:
+    """
+    Apply a DataTable filter_query ('{col} op value && ...') to a frame
+
+    Args:
+        frame: Frame holding the filtered columns
+        filter_query: Query string from the DataTable (custom filter_action)
+
+    Returns:
+        Rows matching every expression; unknown columns or operators are ignored
+    """
+    if not filter_query:
+        return frame
+    for filter_part in filter_query.split(' && '):
+        column, operator, value = _split_filter_part(filter_part)
+        if column not in frame.columns:
+            continue
+        series = frame[column]
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            if pd.api.types.is_numeric_dtype(series):
+                if not isinstance(value, float):
+                    continue
+            else:
+                # Text columns compare as strings ('3' rather than '3.0')
+                series = series.astype(str)
+                value = str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+            frame = frame[getattr(series, operator)(value)]
+        elif operator == 'contains':
+            frame = frame[series.astype(str).str.contains(str(value), case=False, regex=False, na=False)]
+        elif operator == 'datestartswith':
+            frame = frame[series.astype(str).str.startswith(str(value), na=False)]
+    return frame
+
+
+def query_event_page(spec: Dict[str, Any], page_current: int = 0, page_size: int = 20,
+                     sort_by: Optional[list] = None, filter_query: Optional[str] = None) -> tuple:
+    """
+    One page of the filtered events for a server-side paginated DataTable
+
+    Args:
+        spec: Filter spec from make_filter
+        page_current: Zero-based page number
+        page_size: Rows per page
+        sort_by: DataTable sort_by list of {'column_id', 'direction'}
+        filter_query: DataTable filter_query string
+
+    Returns:
+        Tuple of (page DataFrame with TABLE_COLUMNS, total number of matching rows)
+    """
+    frame = filtered_events(spec)[['minute', 'second', 'type', 'team', 'player', 'position', 'x', 'y']]
+
+    if filter_query and '{location}' in filter_query:
+        frame = frame.assign(location=format_locations(frame))
+    frame = apply_filter_query(frame, filter_query)
+
+    if sort_by:
+        columns, ascending = [], []
+        for sort in sort_by:
+            # Locations sort by x, then y
+            sort_columns = ['x', 'y'] if sort['column_id'] == 'location' else [sort['column_id']]
+            columns += sort_columns
+            ascending += [sort['direction'] == 'asc'] * len(sort_columns)
+        frame = frame.sort_values(columns, ascending=ascending, kind='stable', na_position='last')
+
+    start = page_current * page_size
+    page = frame.iloc[start:start + page_size]
+    page = page.assign(location=format_locations(page))
+    return page[TABLE_COLUMNS], len(frame)
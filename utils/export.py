@@ -0,0 +1,289 @@
+"""
+Event export module
+Streams filtered events for one match, several matches or the whole tournament
+as CSV, Parquet or Arrow IPC, one match and one chunk of rows at a time
+"""
+
+import io
+import json
+from typing import Dict, Any, Iterator, List, Optional
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches
+from utils.event_store import make_filter, filtered_raw_events
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrows', 'application/vnd.apache.arrow.stream'),
+}
+
+# Columns offered in the export column picker; an empty selection exports these
+EXPORT_COLUMNS = ['match_id', 'id', 'index', 'period', 'timestamp', 'minute', 'second', 'type',
+                  'possession', 'possession_team', 'play_pattern', 'team', 'player', 'position',
+                  'x', 'y', 'pass_end_x', 'pass_end_y', 'carry_end_x', 'carry_end_y', 'duration',
+                  'under_pressure', 'pass_recipient', 'pass_length', 'pass_height', 'pass_outcome',
+                  'shot_statsbomb_xg', 'shot_outcome', 'shot_type', 'dribble_outcome', 'duel_type',
+                  'duel_outcome', 'foul_committed_card', 'bad_behaviour_card']
+
+# Export columns written as float64 in Parquet/Arrow; every other column is text
+NUMERIC_EXPORT_COLUMNS = {'match_id', 'index', 'period', 'minute', 'second', 'possession', 'x', 'y',
+                          'pass_end_x', 'pass_end_y', 'carry_end_x', 'carry_end_y', 'duration',
+                          'pass_length', 'shot_statsbomb_xg'}
+
+# Rows converted and written at a time
+CHUNK_ROWS = 5000
+
+
+def available_formats() -> List[str]:
+    """Export formats usable in this environment (Parquet and Arrow need pyarrow)"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt == 'csv' or pa is not None]
+
+
+def resolve_match_ids(scope: str, match_id: Optional[int] = None, team: Optional[str] = None,
+                      match_ids: Optional[List[int]] = None) -> List[int]:
+    """
+    Match ids covered by an export scope
+
+    Args:
+        scope: 'match', 'matches' (explicit list), 'team' (all of a team's matches) or 'tournament'
+        match_id: Match for the 'match' scope
+        team: Team for the 'team' scope
+        match_ids: Matches for the 'matches' scope
+
+    Returns:
+        List of match ids in kick-off order
+    """
+    if scope == 'match':
+        return [int(match_id)] if match_id is not None else []
+    if scope == 'matches':
+        return [int(m) for m in match_ids or []]
+
+    matches = load_euro_2024_matches().sort_values(['match_date', 'match_id'])
+    if scope == 'team':
+        matches = matches[(matches['home_team'] == team) | (matches['away_team'] == team)]
+    elif scope != 'tournament':
+        raise ValueError(f"Unknown export scope: {scope}")
+    return matches['match_id'].astype(int).tolist()
+
+
+def _flatten_value(value):
+    if isinstance(value, dict):
+        return value.get('name', json.dumps(value, default=str))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return json.dumps(list(value), default=str)
+    return value
+
+
+def flatten_chunk(chunk: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Select export columns and flatten StatsBomb nested values
+
+    Dicts become their 'name' (or JSON when they have none) and lists
+    become JSON text, so every column is a plain number or string.
+
+    Args:
+        chunk: Raw events rows
+        columns: Columns to keep; missing ones are exported empty
+
+    Returns:
+        DataFrame with exactly the requested columns
+    """
+    flat = {}
+    for column in columns:
+        if column not in chunk.columns:
+            flat[column] = pd.Series(np.nan, index=chunk.index)
+        elif chunk[column].dtype == object:
+            flat[column] = chunk[column].map(_flatten_value)
+        else:
+            flat[column] = chunk[column]
+    return pd.DataFrame(flat, index=chunk.index)
+
+
+def iter_event_chunks(match_ids: List[int], columns: Optional[List[str]] = None, event_type: str = 'all',
+                      player: str = 'all', time_range: Optional[list] = None,
+                      chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Yield flattened, filtered event chunks match by match
+
+    Only one match is loaded at a time, so memory stays bounded by the
+    largest match rather than the size of the export.
+
+    Args:
+        match_ids: Matches to export
+        columns: Columns to export (EXPORT_COLUMNS when empty)
+        event_type: Event type filter (see event_store.make_filter)
+        player: Player filter
+        time_range: [start, end] minutes, or None for the whole match
+        chunk_rows: Rows per chunk
+
+    Yields:
+        DataFrames with the requested columns and a match_id value on every row
+    """
+    columns = list(columns or EXPORT_COLUMNS)
+    for match_id in match_ids:
+        events = filtered_raw_events(make_filter(match_id, event_type, player, time_range))
+        if 'match_id' not in events.columns:
+            events = events.assign(match_id=match_id)
+        for start in range(0, len(events), chunk_rows):
+            yield flatten_chunk(events.iloc[start:start + chunk_rows], columns)
+
+
+def _stream_csv(chunks: Iterator[pd.DataFrame], columns: List[str]) -> Iterator[bytes]:
+    yield (','.join(columns) + '\n').encode('utf-8')
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def _arrow_schema(columns: List[str]) -> 'pa.Schema':
+    # Fixed per column, so a column that is empty in the first chunk keeps its type
+    return pa.schema([pa.field(column, pa.float64() if column in NUMERIC_EXPORT_COLUMNS else pa.string())
+                      for column in columns])
+
+
+def _to_arrow(chunk: pd.DataFrame, schema: 'pa.Schema') -> 'pa.Table':
+    arrays = []
+    for field in schema:
+        values = chunk[field.name]
+        if pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors='coerce').astype(float)
+        else:
+            values = values.astype(object).where(values.notna(), None).map(lambda v: v if v is None else str(v))
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _stream_arrow(chunks: Iterator[pd.DataFrame], columns: List[str], fmt: str) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    schema = _arrow_schema(columns)
+    writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else pa.ipc.new_stream(sink, schema)
+    for chunk in chunks:
+        table = _to_arrow(chunk, schema)
+        if fmt == 'parquet':
+            writer.write_table(table)
+        else:
+            writer.write(table)
+        yield sink.drain()
+
+    # Without rows this is still a valid, empty file with the requested columns
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(match_ids: List[int], fmt: str = 'csv', columns: Optional[List[str]] = None,
+                  event_type: str = 'all', player: str = 'all', time_range: Optional[list] = None,
+                  chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Stream an events export as encoded file chunks
+
+    Args:
+        match_ids: Matches to export
+        fmt: 'csv', 'parquet' or 'arrow' (Arrow IPC stream)
+        columns: Columns to export (EXPORT_COLUMNS when empty)
+        event_type: Event type filter
+        player: Player filter
+        time_range: [start, end] minutes, or None for the whole match
+        chunk_rows: Rows written at a time
+
+    Yields:
+        Bytes of the file, in order
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt not in available_formats():
+        raise ValueError(f"Export format '{fmt}' requires pyarrow")
+
+    columns = list(columns or EXPORT_COLUMNS)
+    chunks = iter_event_chunks(match_ids, columns, event_type, player, time_range, chunk_rows)
+    if fmt == 'csv':
+        return _stream_csv(chunks, columns)
+    return _stream_arrow(chunks, columns, fmt)
+
+
+def export_request_args(args) -> Dict[str, Any]:
+    """
+    Parse export query parameters (a Flask request.args-like mapping)
+
+    Args:
+        args: Mapping with getlist/get, e.g. ?scope=team&team=Spain&format=parquet&columns=minute,type
+
+    Returns:
+        Dictionary of stream_export keyword arguments plus 'filename'
+    """
+    scope = args.get('scope', 'match')
+    match_ids = resolve_match_ids(
+        scope,
+        match_id=args.get('match_id', type=int),
+        team=args.get('team'),
+        match_ids=[int(m) for value in args.getlist('match_ids') for m in value.split(',') if m],
+    )
+    columns = [c for c in args.get('columns', '').split(',') if c]
+    start, end = args.get('start', type=int), args.get('end', type=int)
+    fmt = args.get('format', 'csv')
+    extension = EXPORT_FORMATS.get(fmt, ('csv',))[0]
+    name = {'match': f"match_{match_ids[0] if match_ids else 'none'}", 'team': f"{args.get('team', 'team')}_matches"}.get(scope, scope)
+    return {
+        'match_ids': match_ids,
+        'fmt': fmt,
+        'columns': columns,
+        'event_type': args.get('event_type', 'all'),
+        'player': args.get('player', 'all'),
+        'time_range': [start, end] if start is not None and end is not None else None,
+        'filename': f"euro2024_events_{name.replace(' ', '_')}.{extension}",
+    }
+
+
+def register_export_routes(server) -> None:
+    """
+    Add the streaming export endpoint (/export/events) to the Flask server
+
+    Args:
+        server: Flask app behind the Dash app (app.server)
+    """
+    from flask import Response, request, stream_with_context
+
+    @server.route('/export/events')
+    def export_events():
+        try:
+            options = export_request_args(request.args)
+            filename = options.pop('filename')
+            stream = stream_export(**options)
+        except ValueError as e:
+            return Response(str(e), status=400, mimetype='text/plain')
+        return Response(
+            stream_with_context(stream),
+            mimetype=EXPORT_FORMATS[options['fmt']][1],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+        )
@@ -0,0 +1,205 @@
+"""
+Figure cache module
+Keeps the serialized JSON of deterministic match figures (xG timeline, pass
+networks, team comparison, ...) in memory and in the local data store, keyed
+by (figure builder, match_id, team, params, data version), so callbacks return
+stored figures instead of rebuilding them
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+from utils.data_loader import load_euro_2024_matches
+from utils.metrics import increment
+from utils.preprocess import cache, DATA_VERSION
+from utils.singleflight import single_flight
+
+
+# Bump when a builder's output changes so stale figures in the store are ignored
+FIGURE_CACHE_VERSION = 2
+
+# Figures kept in memory per process, most recently used last
+MEMORY_CACHE_SIZE = 256
+
+# Disk tier, next to the other precomputed tables
+FIGURE_DIR = os.path.join(cache.cache_dir, 'figures')
+
+# Builder name -> (function(match_id, team, **params) returning a go.Figure, per_team)
+FIGURE_BUILDERS = {}
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def figure_key(builder: str, match_id: int, team: Optional[str] = None, **params) -> str:
+    """Cache key of one figure, e.g. 'pass_network|3942226|Spain|{}|v1.1'"""
+    return (f"{builder}|{match_id}|{team or ''}|{json.dumps(params, sort_keys=True, default=str)}"
+            f"|v{FIGURE_CACHE_VERSION}.{DATA_VERSION}")
+
+
+def _figure_path(builder: str, match_id: int, key: str) -> str:
+    return os.path.join(FIGURE_DIR, f"{builder}_{match_id}_{hashlib.md5(key.encode()).hexdigest()[:16]}.json")
+
+
+@lru_cache(maxsize=1)
+def _teams_by_match() -> Dict[int, Tuple[str, str]]:
+    matches = load_euro_2024_matches()
+    return {match.match_id: (match.home_team, match.away_team) for match in matches.itertuples()}
+
+
+def _check_request(match_id: int, team: Optional[str], per_team: bool) -> None:
+    # Keys come from client input; only real matches and their teams may create entries
+    teams = _teams_by_match().get(match_id)
+    if teams is None:
+        raise ValueError(f"Unknown match: {match_id}")
+    if per_team and team not in teams:
+        raise ValueError(f"{team} did not play in match {match_id}")
+
+
+def _remember(key: str, figure: Dict[str, Any]) -> None:
+    with _lock:
+        _memory[key] = figure
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def _write_figure(path: str, text: str) -> None:
+    os.makedirs(FIGURE_DIR, exist_ok=True)
+    # Write then rename, so concurrent readers never see a partial file
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+@single_flight
+def get_figure(builder: str, match_id: int, team: Optional[str] = None, **params) -> Dict[str, Any]:
+    """
+    Return a figure from memory, then disk, building and storing it on a miss
+
+    Placeholder figures without traces (e.g. "No pass data") are returned
+    but not stored.
+
+    Args:
+        builder: Registered builder name (see cached_figure)
+        match_id: Match the figure belongs to
+        team: Team for per-team figures, the match's home or away team
+        **params: Extra builder arguments (must be JSON-serializable and hashable)
+
+    Returns:
+        Figure as a plain dict, ready to return from a callback. The dict is
+        shared between callers and must not be modified.
+
+    Raises:
+        ValueError: Unknown match, or a team that did not play in it
+    """
+    function, per_team = FIGURE_BUILDERS[builder]
+    _check_request(match_id, team, per_team)
+    key = figure_key(builder, match_id, team, **params)
+    with _lock:
+        figure = _memory.get(key)
+        if figure is not None:
+            _memory.move_to_end(key)
+    if figure is not None:
+        increment('figure_cache_requests_total', builder=builder, tier='memory')
+        return figure
+
+    path = _figure_path(builder, match_id, key)
+    if os.path.exists(path):
+        with open(path) as f:
+            figure = json.load(f)
+        increment('figure_cache_requests_total', builder=builder, tier='disk')
+    else:
+        fig = function(match_id, team, **params) if per_team else function(match_id, **params)
+        text = fig.to_json()
+        figure = json.loads(text)
+        increment('figure_cache_requests_total', builder=builder, tier='built')
+        if not fig.data:
+            return figure
+        try:
+            _write_figure(path, text)
+        except OSError as e:
+            print(f"❌ Could not store figure {key}: {e}")
+
+    _remember(key, figure)
+    return figure
+
+
+def cached_figure(name: str, per_team: bool = True) -> Callable:
+    """
+    Register a deterministic figure builder and serve it through the cache
+
+    The decorated function takes (match_id, team, **params), or (match_id,
+    **params) when per_team is False, and returns a go.Figure. The returned
+    wrapper takes the same arguments and returns the cached figure dict.
+    Exceptions are not cached.
+
+    Args:
+        name: Builder name used in the cache key and the prerender CLI
+        per_team: Whether the figure is built once per team of the match
+
+    Returns:
+        Decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        FIGURE_BUILDERS[name] = (function, per_team)
+
+        @functools.wraps(function)
+        def wrapper(match_id, team=None, **params):
+            return get_figure(name, match_id, team if per_team else None, **params)
+
+        wrapper.build = function
+        return wrapper
+    return decorator
+
+
+def clear_figure_cache(disk: bool = False) -> None:
+    """Drop the in-memory figures (and the stored files when disk is True)"""
+    with _lock:
+        _memory.clear()
+    _teams_by_match.cache_clear()
+    if disk and os.path.isdir(FIGURE_DIR):
+        for filename in os.listdir(FIGURE_DIR):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(FIGURE_DIR, filename))
+
+
+def prerender_figures(matches, builders: Optional[Iterable[str]] = None, force: bool = False) -> int:
+    """
+    Build and store figures for every match (and both of its teams)
+
+    Args:
+        matches: Matches DataFrame with match_id, home_team and away_team
+        builders: Builder names to render (default: all registered)
+        force: Rebuild figures that are already stored
+
+    Returns:
+        Number of figures built
+    """
+    builders = list(builders or FIGURE_BUILDERS)
+    built = 0
+    for match in matches.itertuples():
+        for builder in builders:
+            per_team = FIGURE_BUILDERS[builder][1]
+            for team in ((match.home_team, match.away_team) if per_team else (None,)):
+                key = figure_key(builder, match.match_id, team)
+                path = _figure_path(builder, match.match_id, key)
+                if force:
+                    with _lock:
+                        _memory.pop(key, None)
+                    if os.path.exists(path):
+                        os.remove(path)
+                elif os.path.exists(path):
+                    continue
+                try:
+                    get_figure(builder, match.match_id, team)
+                    built += 1
+                except Exception as e:
+                    print(f"❌ Could not render {builder} for match {match.match_id} {team or ''}: {e}")
+    return built
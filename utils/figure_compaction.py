@@ -0,0 +1,181 @@
+"""
+Figure compaction module
+Shrinks Plotly figures before Dash serializes them: numeric arrays are rounded
+(or packed as small integer typed arrays), consecutive traces that only differ
+in their data are merged, and the JSON size before and after can be sampled into
+the figure_json_bytes metric
+"""
+
+import json
+import os
+import random
+from typing import Optional
+import numpy as np
+import plotly.graph_objects as go
+from utils.metrics import observe
+
+
+# Decimals kept for float data (pitch coordinates are in yards, 0.01 is plenty)
+COORDINATE_DECIMALS = 2
+
+# Shorter integral arrays stay JSON lists; the typed array wrapper would cost more
+TYPED_ARRAY_MIN_SIZE = 32
+
+# Per-point trace properties that are rounded and, when merging, concatenated
+DATA_KEYS = ('x', 'y', 'z', 'r', 'values', 'customdata')
+MERGE_KEYS = DATA_KEYS + ('text', 'hovertext')
+
+# Trace types whose points can be concatenated without changing the drawing
+MERGEABLE_TYPES = ('scatter', 'scattergl', 'bar')
+
+# Share of named figures whose JSON size is measured (two extra serializations
+# each); off by default, e.g. FIGURE_SIZE_SAMPLE_RATE=0.05 measures 1 in 20
+FIGURE_SIZE_SAMPLE_RATE = float(os.environ.get('FIGURE_SIZE_SAMPLE_RATE', '0'))
+
+
+def figure_json_size(fig) -> int:
+    """Return the size in bytes of a figure serialized the way Dash sends it."""
+    return len(fig.to_json().encode('utf-8'))
+
+
+def compact_array(values, decimals: int = COORDINATE_DECIMALS):
+    """
+    Round a numeric array for serialization
+
+    Integral data becomes the smallest integer dtype, which Plotly sends as a
+    base64 typed array (1-2 bytes per value), or a list of ints when shorter
+    than TYPED_ARRAY_MIN_SIZE. Other floats become a rounded list,
+    which is shorter as JSON text than a float64 typed array and keeps the
+    exact decimal values for hover labels. Gaps (None or NaN, e.g. between the
+    segments of a line trace) are kept as None.
+
+    Args:
+        values: Array-like of numbers
+        decimals: Decimals kept for non-integral floats
+
+    Returns:
+        Compacted array, or values unchanged when not purely numeric
+    """
+    array = np.asarray(values)
+    if array.dtype.kind == 'O' and array.ndim == 1:
+        try:
+            array = np.array([np.nan if v is None else v for v in array], dtype=float)
+        except (TypeError, ValueError):
+            return values
+    if array.dtype.kind not in 'fiu' or array.size == 0:
+        return values
+    if array.dtype.kind == 'f':
+        if np.isinf(array).any():
+            return values
+        array = np.round(array, decimals)
+        gaps = np.isnan(array)
+        if gaps.any():
+            return np.where(gaps, None, array).tolist()
+        if not (array == np.round(array)).all():
+            return array.tolist()
+    if array.size < TYPED_ARRAY_MIN_SIZE:
+        return array.astype(np.int64).tolist()
+    low, high = int(array.min()), int(array.max())
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array.astype(np.int64)
+
+
+def _is_array(value) -> bool:
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def _replace(obj, key: str, value) -> None:
+    # Plotly ignores an assignment equal to the current value, which would leave
+    # integer lists as JSON text instead of the compacted typed array
+    obj[key] = None
+    obj[key] = value
+
+
+def _style(trace: dict) -> str:
+    """Everything about a trace except its per-point data, as a comparable key"""
+    style = {key: value for key, value in trace.items() if key not in MERGE_KEYS + ('showlegend',)}
+    return json.dumps(style, sort_keys=True, default=str)
+
+
+def _mergeable(first: dict, second: dict) -> bool:
+    if first.get('type') not in MERGEABLE_TYPES or first.get('type') != second.get('type'):
+        return False
+    # Concatenated line traces would be joined by an extra segment
+    if 'lines' in first.get('mode', 'lines' if first.get('type') != 'bar' else ''):
+        return False
+    for key in MERGE_KEYS:
+        present = (key in first, key in second)
+        if present[0] != present[1] or (present[0] and not (_is_array(first[key]) and _is_array(second[key]))):
+            return False
+    return _style(first) == _style(second)
+
+
+def merge_traces(fig: go.Figure) -> go.Figure:
+    """
+    Merge consecutive traces that differ only in their points
+
+    Traces merge when they have the same type and every other property
+    (name, marker, hovertemplate, ...) is equal, and all per-point properties
+    are arrays. Line traces are never merged. The merged trace is shown in the
+    legend if any of its parts was.
+
+    Args:
+        fig: Figure to merge in place
+
+    Returns:
+        The same figure
+    """
+    traces = [trace.to_plotly_json() for trace in fig.data]
+    merged = []
+    for trace in traces:
+        if merged and _mergeable(merged[-1], trace):
+            previous = merged[-1]
+            for key in MERGE_KEYS:
+                if key in trace:
+                    previous[key] = list(previous[key]) + list(trace[key])
+            if 'showlegend' in previous or 'showlegend' in trace:
+                previous['showlegend'] = bool(previous.get('showlegend', True) or trace.get('showlegend', True))
+        else:
+            merged.append(dict(trace))
+    if len(merged) < len(traces):
+        fig.data = []
+        fig.add_traces([go.Figure({'data': [trace]}).data[0] for trace in merged])
+    return fig
+
+
+def compact_figure(fig: go.Figure, name: Optional[str] = None, decimals: int = COORDINATE_DECIMALS) -> go.Figure:
+    """
+    Compact a figure in place before it is returned from a callback
+
+    Merges traces, rounds the numeric data arrays and marker sizes. For a
+    FIGURE_SIZE_SAMPLE_RATE share of named figures, the JSON byte count before
+    and after is observed in the figure_json_bytes metric.
+
+    Args:
+        fig: Figure to compact
+        name: Figure name in the size metric
+        decimals: Decimals kept for float data
+
+    Returns:
+        The same figure
+    """
+    measured = bool(name) and random.random() < FIGURE_SIZE_SAMPLE_RATE
+    before = figure_json_size(fig) if measured else None
+
+    merge_traces(fig)
+    for trace in fig.data:
+        for key in DATA_KEYS:
+            value = trace[key] if key in trace else None
+            if value is not None and _is_array(value):
+                _replace(trace, key, compact_array(value, decimals))
+        marker_size = trace.marker.size if 'marker' in trace and 'size' in trace.marker else None
+        if marker_size is not None and _is_array(marker_size):
+            _replace(trace.marker, 'size', compact_array(marker_size, 1))
+
+    if measured:
+        observe('figure_json_bytes', before, figure=name, stage='raw')
+        observe('figure_json_bytes', figure_json_size(fig), figure=name, stage='compact')
+    return fig
@@ -0,0 +1,170 @@
+"""
+Key events module
+Extracts goals, own goals, cards, penalty fouls, fouls and substitutions into
+one typed table per match and keeps it precomputed in the local data store
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from utils.metrics import timed
+from typing import Dict
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_tournament_data, load_match_data
+from utils.preprocess import cache, entity_names, store_key
+
+
+KEY_EVENT_COLUMNS = ['minute', 'second', 'team', 'player', 'kind', 'detail']
+KEY_EVENT_KINDS = ['Goal', 'Own Goal', 'Yellow Card', 'Second Yellow', 'Red Card',
+                   'Penalty Foul', 'Foul', 'Substitution']
+
+# Fouls without a card or penalty are only a sample of the match's fouls
+MAX_FOULS = 10
+
+# Bump when the table layout changes so stale pickles in the store are ignored
+KEY_EVENTS_STORE_VERSION = 1
+
+
+def _column(events_df: pd.DataFrame, name: str) -> pd.Series:
+    if name in events_df.columns:
+        return events_df[name]
+    return pd.Series(np.nan, index=events_df.index, dtype=object)
+
+
+def extract_key_events(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Extract the key events of one or more matches in a single vectorized pass
+
+    Each event row gets at most one kind, picked in order of importance
+    (goal, own goal, card, penalty foul, foul, substitution).
+
+    Args:
+        events_df: Events DataFrame; a match_id column is kept when present
+
+    Returns:
+        DataFrame with minute, second, team, player, kind (categorical) and
+        detail (display text) columns, sorted by match time
+    """
+    columns = (['match_id'] if 'match_id' in events_df.columns else []) + KEY_EVENT_COLUMNS
+    if events_df.empty or 'type' not in events_df.columns:
+        return pd.DataFrame(columns=columns)
+
+    event_type = events_df['type']
+    team = entity_names(events_df['team']).fillna('Unknown')
+    player = entity_names(_column(events_df, 'player')).fillna('Unknown')
+
+    # Card name from whichever field carries it
+    card = (entity_names(_column(events_df, 'bad_behaviour_card'))
+            .fillna(entity_names(_column(events_df, 'foul_committed_card')).where(event_type == 'Foul Committed'))
+            .fillna(event_type.where(event_type.isin(['Yellow Card', 'Second Yellow', 'Red Card']))))
+    card_kind = np.select(
+        [card.str.contains('Second', na=False), card.str.contains('Red', na=False), card.notna()],
+        ['Second Yellow', 'Red Card', 'Yellow Card'], default=''
+    )
+
+    is_foul = event_type == 'Foul Committed'
+    is_penalty = _column(events_df, 'foul_committed_penalty').notna()
+    is_goal = (event_type == 'Shot') & (entity_names(_column(events_df, 'shot_outcome')) == 'Goal')
+    # The 'Against' half of an own goal pair carries the scorer
+    is_own_goal = event_type == 'Own Goal Against'
+    is_card = card.notna()
+    is_penalty_foul = is_foul & is_penalty & ~is_card
+    is_other_foul = is_foul & ~is_penalty & ~is_card
+    if 'foul_committed_offensive' in events_df.columns:
+        is_other_foul &= events_df['foul_committed_offensive'].notna()
+    if 'match_id' in events_df.columns:
+        is_other_foul &= is_other_foul.groupby(events_df['match_id']).cumsum() <= MAX_FOULS
+    else:
+        is_other_foul &= is_other_foul.cumsum() <= MAX_FOULS
+    is_sub = event_type == 'Substitution'
+
+    kind = pd.Series(np.select(
+        [is_goal, is_own_goal, is_card, is_penalty_foul, is_other_foul, is_sub],
+        ['Goal', 'Own Goal', card_kind, 'Penalty Foul', 'Foul', 'Substitution'], default=''
+    ), index=events_df.index)
+    keep = kind != ''
+    if not keep.any():
+        return pd.DataFrame(columns=columns)
+
+    events = events_df[keep]
+    team, player, kind = team[keep], player[keep], kind[keep]
+
+    # Own goals benefit the other team in the match
+    if 'match_id' in events.columns:
+        match_teams = pd.DataFrame({'match_id': events_df['match_id'], 'team': entity_names(events_df['team'])}).dropna().drop_duplicates()
+        pairs = match_teams.merge(match_teams, on='match_id', suffixes=('', '_other'))
+        pairs = pairs[pairs['team'] != pairs['team_other']].drop_duplicates(['match_id', 'team'])
+        beneficiary = pd.MultiIndex.from_arrays([events['match_id'], team]).map(
+            pairs.set_index(['match_id', 'team'])['team_other'].to_dict()
+        )
+    else:
+        teams = entity_names(events_df['team']).dropna().unique()
+        beneficiary = team.map({t: next((o for o in teams if o != t), 'Unknown') for t in teams})
+    beneficiary = pd.Series(beneficiary, index=events.index).fillna('Unknown')
+
+    replacement = entity_names(_column(events, 'substitution_replacement')).fillna('Unknown')
+    penalty_note = np.where(is_penalty[keep], ' (Penalty awarded)', '')
+    detail = np.select(
+        [kind == 'Goal', kind == 'Own Goal', kind.isin(['Yellow Card', 'Second Yellow', 'Red Card']),
+         kind == 'Penalty Foul', kind == 'Foul', kind == 'Substitution'],
+        ['Goal by ' + player,
+         'Own goal by ' + player + ' (for ' + beneficiary + ')',
+         kind.replace({'Second Yellow': 'Second Yellow (Red)'}) + ' for ' + player + penalty_note,
+         'Penalty foul by ' + player,
+         'Foul by ' + player,
+         replacement + ' on for ' + player],
+        default=''
+    )
+
+    key_events = pd.DataFrame({
+        'minute': events['minute'].astype(int),
+        'second': _column(events, 'second').fillna(0).astype(int),
+        'team': team.astype(str),
+        'player': player.astype(str),
+        'kind': pd.Categorical(kind, categories=KEY_EVENT_KINDS),
+        'detail': detail,
+    })
+    if 'match_id' in events.columns:
+        key_events.insert(0, 'match_id', events['match_id'])
+    sort_by = ['match_id', 'minute', 'second'] if 'match_id' in key_events.columns else ['minute', 'second']
+    return key_events.sort_values(sort_by, kind='stable').reset_index(drop=True)
+
+
+def _store_key(match_id: int) -> str:
+    return store_key('key_events', KEY_EVENTS_STORE_VERSION, match_id)
+
+
+def build_all_key_events() -> Dict[int, pd.DataFrame]:
+    """
+    Extract key events for every tournament match in one pass and save them to the store
+
+    Returns:
+        Dictionary mapping match id to its key events table
+    """
+    print("🎯 Extracting key events for all matches...")
+    key_events = extract_key_events(load_tournament_data())
+    tables = {}
+    for match_id, table in key_events.groupby('match_id', sort=False):
+        tables[match_id] = table.drop(columns='match_id').reset_index(drop=True)
+        cache.set(_store_key(match_id), tables[match_id])
+    load_match_key_events.cache_clear()
+    print(f"✅ Key events stored for {len(tables)} matches")
+    return tables
+
+
+@single_flight
+@lru_cache(maxsize=64)
+def load_match_key_events(match_id: int) -> pd.DataFrame:
+    """Load a match's key events from the store, extracting and saving them on a miss"""
+    key_events = cache.get(_store_key(match_id))
+    if key_events is None:
+        with timed('key_events.extract'):
+            key_events = extract_key_events(load_match_data(match_id))
+        if 'match_id' in key_events.columns:
+            key_events = key_events.drop(columns='match_id')
+        cache.set(_store_key(match_id), key_events)
+    return key_events
+
+
+if __name__ == '__main__':
+    build_all_key_events()
@@ -0,0 +1,167 @@
+"""
+Tournament leaderboards module
+Aggregates per-player scoring and goalkeeping numbers from the tournament
+events in one groupby each and keeps the result in the local data store
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches, load_tournament_data
+from utils.preprocess import cache, entity_names, store_key
+from utils.standings import get_tournament_tables, matches_version
+
+
+SCORER_COLUMNS = ['player', 'team', 'matches', 'goals', 'assists', 'xg', 'shots',
+                  'key_passes', 'passes', 'pass_accuracy', 'shots_per_match', 'key_passes_per_match']
+KEEPER_COLUMNS = ['player', 'team', 'matches', 'saves', 'goals_conceded', 'save_ratio', 'clean_sheets']
+
+# Goalkeeper event types that count as a save or a goal conceded
+SAVE_TYPES = ['Shot Saved', 'Shot Saved Off Target', 'Shot Saved to Post', 'Saved to Post',
+              'Penalty Saved', 'Penalty Saved to Post']
+CONCEDED_TYPES = ['Goal Conceded', 'Penalty Conceded']
+
+# Penalty shootouts are not part of the match and are left out of every count
+SHOOTOUT_PERIOD = 5
+
+# Bump when the table layout changes so stale pickles in the store are ignored
+LEADERBOARDS_STORE_VERSION = 1
+
+
+def _column(events_df: pd.DataFrame, name: str) -> pd.Series:
+    if name in events_df.columns:
+        return events_df[name]
+    return pd.Series(np.nan, index=events_df.index, dtype=object)
+
+
+def compute_scorer_table(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Goals, assists, xG, shots and passing numbers for every player
+
+    Args:
+        events_df: Tournament events with match_id
+
+    Returns:
+        DataFrame with one row per (player, team), see SCORER_COLUMNS
+    """
+    event_type = events_df['type']
+    is_shot = event_type == 'Shot'
+    is_pass = event_type == 'Pass'
+    is_assist = is_pass & _column(events_df, 'pass_goal_assist').notna()
+
+    players = pd.DataFrame({
+        'player': entity_names(events_df['player']),
+        'team': entity_names(events_df['team']),
+        'match_id': events_df['match_id'],
+        'goal': is_shot & (entity_names(_column(events_df, 'shot_outcome')) == 'Goal'),
+        'assist': is_assist,
+        'xg': pd.to_numeric(_column(events_df, 'shot_statsbomb_xg'), errors='coerce').where(is_shot, 0).fillna(0),
+        'shot': is_shot,
+        'key_pass': is_assist | (is_pass & _column(events_df, 'pass_shot_assist').notna()),
+        'pass': is_pass,
+        'completed_pass': is_pass & _column(events_df, 'pass_outcome').isna(),
+    })[events_df['period'] != SHOOTOUT_PERIOD].dropna(subset=['player'])
+
+    table = players.groupby(['player', 'team']).agg(
+        matches=('match_id', 'nunique'),
+        goals=('goal', 'sum'),
+        assists=('assist', 'sum'),
+        xg=('xg', 'sum'),
+        shots=('shot', 'sum'),
+        key_passes=('key_pass', 'sum'),
+        passes=('pass', 'sum'),
+        completed_passes=('completed_pass', 'sum'),
+    ).reset_index()
+    table['pass_accuracy'] = (table['completed_passes'] / table['passes'].where(table['passes'] > 0) * 100).fillna(0)
+    table['shots_per_match'] = table['shots'] / table['matches']
+    table['key_passes_per_match'] = table['key_passes'] / table['matches']
+    return table[SCORER_COLUMNS]
+
+
+def compute_keeper_table(events_df: pd.DataFrame, team_matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Saves, goals conceded, save ratio and clean sheets for every goalkeeper
+
+    A keeper is credited with a clean sheet for each match they appeared in
+    where their team conceded no goals.
+
+    Args:
+        events_df: Tournament events with match_id
+        team_matches: Long (team, match) table from standings.team_match_table
+
+    Returns:
+        DataFrame with one row per (player, team), see KEEPER_COLUMNS
+    """
+    in_match = events_df['period'] != SHOOTOUT_PERIOD
+    keeper_event = entity_names(_column(events_df, 'goalkeeper_type'))
+    keepers = pd.DataFrame({
+        'player': entity_names(events_df['player']),
+        'team': entity_names(events_df['team']),
+        'match_id': events_df['match_id'],
+        'save': (events_df['type'] == 'Goal Keeper') & keeper_event.isin(SAVE_TYPES),
+        'conceded': (events_df['type'] == 'Goal Keeper') & keeper_event.isin(CONCEDED_TYPES),
+    })[in_match & (entity_names(_column(events_df, 'position')) == 'Goalkeeper')].dropna(subset=['player'])
+
+    per_match = keepers.groupby(['player', 'team', 'match_id'], as_index=False)[['save', 'conceded']].sum()
+    per_match = per_match.merge(team_matches[['match_id', 'team', 'clean_sheet']], on=['match_id', 'team'], how='left')
+    table = per_match.groupby(['player', 'team']).agg(
+        matches=('match_id', 'nunique'),
+        saves=('save', 'sum'),
+        goals_conceded=('conceded', 'sum'),
+        clean_sheets=('clean_sheet', 'sum'),
+    ).reset_index()
+    faced = table['saves'] + table['goals_conceded']
+    table['save_ratio'] = (table['saves'] / faced.where(faced > 0)).fillna(0)
+    table['clean_sheets'] = table['clean_sheets'].astype(int)
+    return table[KEEPER_COLUMNS]
+
+
+def build_leaderboards(events_df: pd.DataFrame, team_matches: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Build the full scorer and goalkeeper tables, ranked
+
+    Args:
+        events_df: Tournament events with match_id
+        team_matches: Long (team, match) table from standings.team_match_table
+
+    Returns:
+        Dictionary with 'scorers' (by goals, assists, xG) and 'keepers'
+        (by clean sheets, save ratio, saves)
+    """
+    scorers = compute_scorer_table(events_df).sort_values(
+        ['goals', 'assists', 'xg'], ascending=False, kind='stable'
+    ).reset_index(drop=True)
+    keepers = compute_keeper_table(events_df, team_matches).sort_values(
+        ['clean_sheets', 'save_ratio', 'saves'], ascending=False, kind='stable'
+    ).reset_index(drop=True)
+    return {'scorers': scorers, 'keepers': keepers}
+
+
+@single_flight
+@lru_cache(maxsize=1)
+def load_leaderboards() -> Dict[str, pd.DataFrame]:
+    """Load the ranked leaderboards from the store, building and saving them on a miss"""
+    # Tournament-wide, so also keyed on the match list like the standings
+    key = store_key('leaderboards', LEADERBOARDS_STORE_VERSION, matches_version(load_euro_2024_matches()))
+    leaderboards = cache.get(key)
+    if leaderboards is None:
+        leaderboards = build_leaderboards(load_tournament_data(), get_tournament_tables()['team_matches'])
+        cache.set(key, leaderboards)
+    return leaderboards
+
+
+def top_scorers(k: int = 8) -> pd.DataFrame:
+    """Top k players by goals, then assists and xG"""
+    return load_leaderboards()['scorers'].head(k)
+
+
+def top_keepers(k: int = 5) -> pd.DataFrame:
+    """Top k goalkeepers by clean sheets, then save ratio and saves"""
+    return load_leaderboards()['keepers'].head(k)
+
+
+if __name__ == '__main__':
+    load_leaderboards()
+    print("✅ Leaderboards stored")
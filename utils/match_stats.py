@@ -0,0 +1,132 @@
+"""
+Match statistics engine
+Computes the per-team metric vector of a match (shots, passes, duels, xG ...)
+from a single groupby over (team, type, outcome)
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from utils.metrics import timed
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_match_data
+from utils.preprocess import entity_names
+
+
+# Outcome column for each event type that has one
+OUTCOME_COLUMNS = {
+    'Pass': 'pass_outcome',
+    'Shot': 'shot_outcome',
+    'Dribble': 'dribble_outcome',
+    'Duel': 'duel_outcome',
+}
+
+# Outcomes counted as a success; passes succeed when they have no outcome
+ON_TARGET_OUTCOMES = ['Goal', 'Saved']
+SUCCESSFUL_DUEL_OUTCOMES = ['Success In Play', 'Won', 'Success Out']
+
+MATCH_STATS_COLUMNS = [
+    'shots', 'shots_on_target', 'shot_accuracy', 'xg',
+    'passes', 'successful_passes', 'failed_passes', 'pass_completion', 'possession',
+    'dribbles', 'successful_dribbles', 'dribble_success',
+    'duels', 'successful_duels', 'duel_success',
+    'interceptions', 'fouls',
+]
+
+
+def _percentage(part: pd.Series, whole: pd.Series) -> pd.Series:
+    return (part / whole.where(whole > 0) * 100).fillna(0)
+
+
+def compute_match_stats(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute every team's match statistics in one pass over the events
+
+    Args:
+        events_df: Events for a single match
+
+    Returns:
+        DataFrame indexed by team with one column per metric (see
+        MATCH_STATS_COLUMNS); percentages are on a 0-100 scale and possession
+        is each team's share of the match's passes
+    """
+    if events_df.empty or 'type' not in events_df.columns:
+        return pd.DataFrame(columns=MATCH_STATS_COLUMNS)
+
+    event_type = events_df['type']
+    # One outcome column for all types; 'None' marks a missing outcome (e.g. a completed pass)
+    outcome = pd.Series(np.nan, index=events_df.index, dtype=object)
+    for type_name, column in OUTCOME_COLUMNS.items():
+        if column in events_df.columns:
+            is_type = event_type == type_name
+            outcome[is_type] = entity_names(events_df.loc[is_type, column])
+    frame = pd.DataFrame({
+        'team': entity_names(events_df['team']),
+        'type': event_type,
+        'outcome': outcome.fillna('None'),
+    })
+
+    counts = frame.groupby(['team', 'type', 'outcome']).size().unstack(['type', 'outcome'], fill_value=0)
+    teams = counts.index
+
+    def count(type_name, outcomes=None):
+        if type_name not in counts.columns.get_level_values('type'):
+            return pd.Series(0, index=teams)
+        by_outcome = counts[type_name]
+        if outcomes is not None:
+            by_outcome = by_outcome[[o for o in outcomes if o in by_outcome.columns]]
+        return by_outcome.sum(axis=1)
+
+    stats = pd.DataFrame(index=teams)
+    stats['shots'] = count('Shot')
+    stats['shots_on_target'] = count('Shot', ON_TARGET_OUTCOMES)
+    stats['shot_accuracy'] = _percentage(stats['shots_on_target'], stats['shots'])
+    if 'shot_statsbomb_xg' in events_df.columns:
+        stats['xg'] = events_df['shot_statsbomb_xg'].where(event_type == 'Shot').groupby(frame['team']).sum().reindex(teams, fill_value=0)
+    else:
+        stats['xg'] = 0.0
+
+    stats['passes'] = count('Pass')
+    stats['successful_passes'] = count('Pass', ['None'])
+    stats['failed_passes'] = stats['passes'] - stats['successful_passes']
+    stats['pass_completion'] = _percentage(stats['successful_passes'], stats['passes'])
+    # Possession proxy: share of the match's passes
+    stats['possession'] = _percentage(stats['passes'], pd.Series(stats['passes'].sum(), index=teams))
+
+    stats['dribbles'] = count('Dribble')
+    stats['successful_dribbles'] = count('Dribble', ['Complete'])
+    stats['dribble_success'] = _percentage(stats['successful_dribbles'], stats['dribbles'])
+    stats['duels'] = count('Duel')
+    stats['successful_duels'] = count('Duel', SUCCESSFUL_DUEL_OUTCOMES)
+    stats['duel_success'] = _percentage(stats['successful_duels'], stats['duels'])
+    stats['interceptions'] = count('Interception')
+    stats['fouls'] = count('Foul Committed')
+
+    stats.index.name = 'team'
+    return stats[MATCH_STATS_COLUMNS]
+
+
+@single_flight
+@lru_cache(maxsize=64)
+def get_match_stats(match_id: int) -> pd.DataFrame:
+    """Cached match statistics for a match (see compute_match_stats)"""
+    with timed('match_stats.compute'):
+        return compute_match_stats(load_match_data(match_id))
+
+
+def team_match_stats(match_id: int, team_name: str) -> dict:
+    """
+    Get one team's statistics for a match
+
+    Args:
+        match_id: StatsBomb match id
+        team_name: Team to get the statistics for
+
+    Returns:
+        Dictionary of metric -> value (all zero if the team has no events)
+    """
+    stats = get_match_stats(match_id)
+    if team_name not in stats.index:
+        return dict.fromkeys(MATCH_STATS_COLUMNS, 0)
+    # Read column by column so counts stay integers
+    return {column: stats.at[team_name, column] for column in MATCH_STATS_COLUMNS}
@@ -0,0 +1,376 @@
+"""
+Latency metrics module
+Keeps a rolling window of timings per named operation and summarizes them
+(count, mean, p50, p95, max) for logging, and records per-callback histograms
+exposed at /metrics in Prometheus text format. Under a multi-worker server each
+worker writes snapshots to METRICS_DIR and /metrics adds them up.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+
+
+# Timings kept per metric; older ones are dropped
+WINDOW_SIZE = 500
+
+# Histogram upper bounds: seconds for durations, bytes for payloads
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+# Metric name -> (help text, buckets); names without buckets are counters
+PROMETHEUS_METRICS = {
+    'dash_callback_duration_seconds': ("Wall time of Dash callback requests", DURATION_BUCKETS),
+    'dash_callback_cpu_seconds': ("CPU time of Dash callback requests", DURATION_BUCKETS),
+    'dash_callback_response_bytes': ("Response payload size of Dash callback requests", SIZE_BUCKETS),
+    'dash_callback_errors_total': ("Dash callback requests that failed", None),
+    'dashboard_operation_seconds': ("Duration of instrumented dashboard operations", DURATION_BUCKETS),
+    'figure_json_bytes': ("Serialized figure size before (raw) and after (compact) compaction", SIZE_BUCKETS),
+    'figure_cache_requests_total': ("Cached figure requests by the tier that served them (memory, disk, built)", None),
+    'singleflight_coalesced_total': ("Calls that waited on an identical in-flight computation", None),
+}
+
+# Directory where every worker of a multi-worker server keeps a snapshot of its
+# histograms and counters (set by gunicorn.conf.py); unset, /metrics shows this
+# process only
+METRICS_DIR = os.environ.get('METRICS_DIR')
+
+# Seconds between a worker's snapshot writes
+SNAPSHOT_INTERVAL = float(os.environ.get('METRICS_SNAPSHOT_INTERVAL', 5))
+
+# Totals of workers that have exited, so recycling a worker does not reset them
+RETIRED_SNAPSHOT = 'retired.json'
+SNAPSHOT_LOCK = 'snapshots.lock'
+
+# Dash's callback dispatch endpoint (after the app's URL prefix)
+CALLBACK_PATH = '_dash-update-component'
+
+_timings = defaultdict(lambda: deque(maxlen=WINDOW_SIZE))
+_lock = threading.Lock()
+
+# This process's snapshot file in METRICS_DIR, guarded by _snapshot_lock
+_snapshot_name = None
+_snapshot_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+# (metric, sorted label items) -> Histogram or counter value
+_histograms = {}
+_counters = defaultdict(int)
+
+
+def observe(metric: str, value: float, **labels) -> None:
+    """Add a value to a histogram metric (see PROMETHEUS_METRICS)"""
+    key = (metric, tuple(sorted(labels.items())))
+    with _lock:
+        if key not in _histograms:
+            _histograms[key] = Histogram(PROMETHEUS_METRICS[metric][1])
+        _histograms[key].observe(value)
+
+
+def increment(metric: str, **labels) -> None:
+    """Add one to a counter metric"""
+    with _lock:
+        _counters[(metric, tuple(sorted(labels.items())))] += 1
+
+
+def record_latency(metric: str, seconds: float) -> None:
+    """Record one timing (in seconds) for a metric"""
+    with _lock:
+        _timings[metric].append(seconds)
+    observe('dashboard_operation_seconds', seconds, operation=metric)
+
+
+@contextmanager
+def timed(metric: str):
+    """Context manager recording the duration of its block under a metric"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(metric, time.perf_counter() - start)
+
+
+def latency_summary(prefix: str = '') -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize the recorded timings
+
+    Args:
+        prefix: Only include metrics whose name starts with this
+
+    Returns:
+        Dictionary of metric -> {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'}
+    """
+    with _lock:
+        windows = {metric: np.array(values) for metric, values in _timings.items()
+                   if metric.startswith(prefix) and values}
+    return {
+        metric: {
+            'count': len(values),
+            'mean_ms': float(values.mean() * 1000),
+            'p50_ms': float(np.percentile(values, 50) * 1000),
+            'p95_ms': float(np.percentile(values, 95) * 1000),
+            'max_ms': float(values.max() * 1000),
+        }
+        for metric, values in sorted(windows.items())
+    }
+
+
+def reset_latency(prefix: str = '') -> None:
+    """Drop recorded timings (those starting with prefix, or all)"""
+    with _lock:
+        for metric in [m for m in _timings if m.startswith(prefix)]:
+            del _timings[metric]
+
+
+def _labels(items, **extra) -> str:
+    pairs = list(items) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _state() -> Tuple[dict, dict]:
+    """This process's histograms ((metric, labels) -> (counts, sum, count)) and counters"""
+    with _lock:
+        histograms = {key: (list(h.counts), h.sum, h.count) for key, h in _histograms.items()}
+        counters = dict(_counters)
+    return histograms, counters
+
+
+def _merge(total: Tuple[dict, dict], part: Tuple[dict, dict]) -> None:
+    histograms, counters = total
+    for key, (counts, value_sum, count) in part[0].items():
+        if key in histograms:
+            old_counts, old_sum, old_count = histograms[key]
+            histograms[key] = ([a + b for a, b in zip(old_counts, counts)], old_sum + value_sum, old_count + count)
+        else:
+            histograms[key] = (list(counts), value_sum, count)
+    for key, value in part[1].items():
+        counters[key] = counters.get(key, 0) + value
+
+
+def _encode(state: Tuple[dict, dict]) -> str:
+    histograms, counters = state
+    return json.dumps({
+        'histograms': [[metric, items, *values] for (metric, items), values in histograms.items()],
+        'counters': [[metric, items, value] for (metric, items), value in counters.items()],
+    })
+
+
+def _read_snapshot(path: str) -> Optional[Tuple[dict, dict]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    histograms = {(metric, tuple(map(tuple, items))): (counts, value_sum, count)
+                  for metric, items, counts, value_sum, count in data['histograms']}
+    counters = {(metric, tuple(map(tuple, items))): value for metric, items, value in data['counters']}
+    return histograms, counters
+
+
+def _write_snapshot_file(name: str, state: Tuple[dict, dict]) -> None:
+    # Write then rename, so readers never see a partial snapshot
+    path = os.path.join(METRICS_DIR, name)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(_encode(state))
+    os.replace(temp_path, path)
+
+
+def write_snapshot(name: Optional[str] = None) -> None:
+    """
+    Write this process's metrics to METRICS_DIR
+
+    Args:
+        name: Snapshot file name (default: this worker's, see start_worker_snapshots)
+    """
+    with _snapshot_lock:
+        name = name or _snapshot_name
+        if METRICS_DIR and name:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            _write_snapshot_file(name, _state())
+
+
+def _snapshot_loop() -> None:
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"❌ Could not write metrics snapshot: {e}")
+
+
+def start_worker_snapshots() -> None:
+    """
+    Start snapshotting this worker's metrics every SNAPSHOT_INTERVAL seconds
+
+    Call right after the worker is forked. Metrics inherited from the parent
+    are dropped; the parent reports them in its own snapshot.
+    """
+    global _snapshot_name
+    if not METRICS_DIR:
+        return
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+    with _snapshot_lock:
+        # pid plus start time, so a reused pid never overwrites an old worker's file
+        _snapshot_name = f"worker-{os.getpid()}-{time.time_ns()}.json"
+    threading.Thread(target=_snapshot_loop, name='metrics-snapshots', daemon=True).start()
+
+
+def _locked(exclusive: bool):
+    # Unix only, like the multi-worker servers that set METRICS_DIR
+    import fcntl
+    lock = open(os.path.join(METRICS_DIR, SNAPSHOT_LOCK), 'a')
+    fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    return lock
+
+
+def clear_snapshots() -> None:
+    """Remove every snapshot in METRICS_DIR, when the server (re)starts"""
+    if METRICS_DIR and os.path.isdir(METRICS_DIR):
+        for filename in os.listdir(METRICS_DIR):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(METRICS_DIR, filename))
+
+
+def retire_worker_snapshot() -> None:
+    """Add this worker's final metrics to the retired totals and remove its snapshot"""
+    global _snapshot_name
+    with _snapshot_lock:
+        if not METRICS_DIR or not _snapshot_name:
+            return
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with _locked(exclusive=True):
+            total = _read_snapshot(os.path.join(METRICS_DIR, RETIRED_SNAPSHOT)) or ({}, {})
+            _merge(total, _state())
+            _write_snapshot_file(RETIRED_SNAPSHOT, total)
+            try:
+                os.remove(os.path.join(METRICS_DIR, _snapshot_name))
+            except FileNotFoundError:
+                pass
+        _snapshot_name = None
+
+
+def collect_metrics() -> Tuple[dict, dict]:
+    """
+    Histograms and counters of every worker (or of this process without METRICS_DIR)
+
+    Returns:
+        (histograms, counters) keyed by (metric, sorted label items)
+    """
+    if not METRICS_DIR or not _snapshot_name:
+        return _state()
+    write_snapshot()
+    total = ({}, {})
+    # Shared lock: a retiring worker moves its totals between files under the exclusive one
+    with _locked(exclusive=False):
+        for filename in sorted(os.listdir(METRICS_DIR)):
+            if filename.endswith('.json'):
+                snapshot = _read_snapshot(os.path.join(METRICS_DIR, filename))
+                if snapshot is not None:
+                    _merge(total, snapshot)
+    return total
+
+
+def render_prometheus() -> str:
+    """
+    Render every histogram and counter in the Prometheus text exposition format
+
+    Returns:
+        Text for a /metrics response, summed over all workers when METRICS_DIR is set
+    """
+    histograms, counters = collect_metrics()
+
+    lines = []
+    for metric, (help_text, buckets) in PROMETHEUS_METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {'histogram' if buckets else 'counter'}")
+        if buckets:
+            for (name, items), (counts, total, count) in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append(f"{metric}_bucket{_labels(items, le=f'{bound:g}')} {bucket_count}")
+                lines.append(f"{metric}_bucket{_labels(items, le='+Inf')} {count}")
+                lines.append(f"{metric}_sum{_labels(items)} {total:.6f}")
+                lines.append(f"{metric}_count{_labels(items)} {count}")
+        else:
+            for (name, items), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f"{metric}{_labels(items)} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def callback_id(payload: dict) -> str:
+    """Name a Dash callback request by its outputs, e.g. 'match-viz-content.children'"""
+    output = (payload or {}).get('output', 'unknown')
+    # Multi-output callbacks are sent as '..a.children...b.figure..'
+    return '+'.join(part for part in output.strip('.').split('...') if part) or 'unknown'
+
+
+def register_metrics(server) -> None:
+    """
+    Instrument every Dash callback request and serve /metrics
+
+    Wall time, CPU time (of the handling thread), response size and errors
+    are recorded per callback id around Dash's callback endpoint.
+
+    Args:
+        server: Flask app behind the Dash app (app.server)
+    """
+    from flask import Response, request, g
+
+    @server.before_request
+    def start_callback_timer():
+        if request.path.endswith(CALLBACK_PATH):
+            g.callback_started = (time.perf_counter(), time.thread_time())
+
+    @server.after_request
+    def record_callback_metrics(response):
+        started = g.pop('callback_started', None)
+        if started is None:
+            return response
+        name = callback_id(request.get_json(silent=True))
+        observe('dash_callback_duration_seconds', time.perf_counter() - started[0], callback=name)
+        observe('dash_callback_cpu_seconds', time.thread_time() - started[1], callback=name)
+        if not response.is_streamed:
+            observe('dash_callback_response_bytes', response.calculate_content_length() or 0, callback=name)
+        if response.status_code >= 400:
+            increment('dash_callback_errors_total', callback=name)
+        return response
+
+    @server.teardown_request
+    def record_callback_exception(error):
+        # Exceptions that escape Dash skip after_request
+        if error is not None and g.pop('callback_started', None) is not None:
+            increment('dash_callback_errors_total', callback=callback_id(request.get_json(silent=True)))
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
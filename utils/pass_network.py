@@ -0,0 +1,209 @@
+"""
+Pass network engine
+Builds vectorized node and edge tables for a team's successful passes and
+keeps them precomputed per (match, team) in the local data store
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict, Tuple
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches, load_match_data
+from utils.preprocess import cache, entity_names, store_key
+
+
+NODE_COLUMNS = ['player_name', 'position', 'x', 'y', 'pass_count', 'received_count',
+                'total_involvement', 'was_substituted', 'sub_player']
+EDGE_COLUMNS = ['passer', 'recipient', 'passes']
+
+# Bump when the table layout changes so stale pickles in the store are ignored
+PASS_NETWORK_STORE_VERSION = 1
+
+
+def compute_pass_network(events_df: pd.DataFrame, team_name: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute pass network nodes and edges for one team in a single pass over the events
+
+    Substitutes are folded into the player they replaced, so each node is a
+    starting position rather than an individual.
+
+    Args:
+        events_df: Match events DataFrame with x/y coordinates
+        team_name: Team to build the network for
+
+    Returns:
+        Tuple of (nodes, edges). Nodes hold player_name, position, average x/y,
+        passes made/received and substitution info; edges hold passer,
+        recipient and the number of successful passes between them.
+    """
+    empty = (pd.DataFrame(columns=NODE_COLUMNS), pd.DataFrame(columns=EDGE_COLUMNS))
+    if events_df.empty or 'type' not in events_df.columns:
+        return empty
+
+    players = entity_names(events_df['player'])
+
+    # Substitution mapping (replacement -> original player), applied as a join
+    subs = events_df['type'] == 'Substitution'
+    sub_mapping = pd.Series(
+        players[subs].values,
+        index=entity_names(events_df.loc[subs, 'substitution_replacement']).values
+    ) if subs.any() else pd.Series(dtype=object)
+    sub_mapping = sub_mapping[~sub_mapping.index.duplicated(keep='last')]
+
+    # Successful passes for the team
+    passes_mask = (
+        (events_df['type'] == 'Pass') &
+        (entity_names(events_df['team']) == team_name) &
+        (events_df['pass_outcome'].isna())
+    )
+    if not passes_mask.any():
+        return empty
+
+    passer = players[passes_mask]
+    recipient = entity_names(events_df.loc[passes_mask, 'pass_recipient'])
+    passes = pd.DataFrame({
+        'passer': passer.map(sub_mapping).fillna(passer),
+        'recipient': recipient.map(sub_mapping).fillna(recipient),
+        'x': events_df.loc[passes_mask, 'x'],
+        'y': events_df.loc[passes_mask, 'y'],
+    })
+
+    # Average positions and passes made per (original) passer
+    nodes = passes.groupby('passer').agg(
+        x=('x', 'mean'), y=('y', 'mean'), pass_count=('x', 'size')
+    )
+    nodes.index.name = 'player_name'
+    nodes['received_count'] = passes.groupby('recipient').size().reindex(nodes.index, fill_value=0)
+    nodes['total_involvement'] = nodes['pass_count'] + nodes['received_count']
+
+    # First recorded position for each player across the whole match
+    if 'position' in events_df.columns:
+        positions = pd.DataFrame({'player': players, 'position': entity_names(events_df['position'])})
+        positions = positions.dropna().drop_duplicates('player').set_index('player')['position']
+        nodes['position'] = positions.reindex(nodes.index).fillna('Unknown')
+    else:
+        nodes['position'] = 'Unknown'
+
+    replacement_for = pd.Series(sub_mapping.index, index=sub_mapping.values)
+    replacement_for = replacement_for[~replacement_for.index.duplicated(keep='first')]
+    nodes['sub_player'] = replacement_for.reindex(nodes.index)
+    nodes['was_substituted'] = nodes['sub_player'].notna()
+    nodes = nodes.reset_index()[NODE_COLUMNS]
+
+    # Edge counts between nodes we have positions for
+    edges = passes.groupby(['passer', 'recipient']).size().reset_index(name='passes')
+    edges = edges[edges['passer'].isin(nodes['player_name']) & edges['recipient'].isin(nodes['player_name'])]
+
+    return nodes, edges.reset_index(drop=True)[EDGE_COLUMNS]
+
+
+def _store_key(match_id: int) -> str:
+    return store_key('pass_network', PASS_NETWORK_STORE_VERSION, match_id)
+
+
+def build_match_pass_networks(match_id: int, events_df: pd.DataFrame = None) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Compute node and edge tables for both teams of a match and save them to the store
+
+    Args:
+        match_id: StatsBomb match id
+        events_df: Events for the match (loaded if not given)
+
+    Returns:
+        Dictionary mapping team name to (nodes, edges)
+    """
+    if events_df is None:
+        events_df = load_match_data(match_id)
+    teams = entity_names(events_df['team']).dropna().unique()
+    tables = {team: compute_pass_network(events_df, team) for team in teams}
+    cache.set(_store_key(match_id), tables)
+    return tables
+
+
+@single_flight
+@lru_cache(maxsize=64)
+def load_match_pass_networks(match_id: int) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Load a match's pass network tables from the store, building them on a miss"""
+    tables = cache.get(_store_key(match_id))
+    if tables is None:
+        tables = build_match_pass_networks(match_id)
+    return tables
+
+
+def get_pass_network_tables(match_id: int, team_name: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Get the precomputed pass network for one team in a match
+
+    Args:
+        match_id: StatsBomb match id
+        team_name: Team to get the network for
+
+    Returns:
+        Tuple of (nodes, edges), copied so callers can add drawing columns
+    """
+    tables = load_match_pass_networks(match_id)
+    if team_name not in tables:
+        return pd.DataFrame(columns=NODE_COLUMNS), pd.DataFrame(columns=EDGE_COLUMNS)
+    nodes, edges = tables[team_name]
+    return nodes.copy(), edges.copy()
+
+
+def build_all_pass_networks() -> None:
+    """Precompute pass network tables for every match in the tournament"""
+    matches = load_euro_2024_matches()
+    print(f"🔗 Building pass networks for {len(matches)} matches...")
+    for i, (_, match) in enumerate(matches.iterrows(), 1):
+        try:
+            tables = build_match_pass_networks(match['match_id'])
+            sizes = ", ".join(f"{team}: {len(nodes)} nodes/{len(edges)} edges" for team, (nodes, edges) in tables.items())
+            print(f"   {i:2d}/{len(matches)} - {sizes}")
+        except Exception as e:
+            print(f"   ❌ Failed to build match {match['match_id']}: {e}")
+    load_match_pass_networks.cache_clear()
+    print("✅ Pass networks stored")
+
+
+def edge_segments(nodes: pd.DataFrame, edges: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attach start/end coordinates to each edge with a single join
+
+    Args:
+        nodes: Node table from compute_pass_network
+        edges: Edge table from compute_pass_network
+
+    Returns:
+        Edge table with x_start, y_start, x_end, y_end columns
+    """
+    coords = nodes.set_index('player_name')[['x', 'y']]
+    segments = edges.join(coords, on='passer').join(coords, on='recipient', lsuffix='_start', rsuffix='_end')
+    return segments.dropna(subset=['x_start', 'x_end'])
+
+
+def segments_to_polygons(segments: pd.DataFrame, half_widths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn edges into None-separated quadrilaterals so they fit in a single trace
+
+    Args:
+        segments: Output of edge_segments
+        half_widths: Half the drawn width of each edge, in pitch units
+
+    Returns:
+        Tuple of (x, y) object arrays ready for a filled go.Scatter
+    """
+    x0, y0 = segments['x_start'].to_numpy(float), segments['y_start'].to_numpy(float)
+    x1, y1 = segments['x_end'].to_numpy(float), segments['y_end'].to_numpy(float)
+    length = np.hypot(x1 - x0, y1 - y0)
+    length[length == 0] = 1
+    # Unit normal to each segment, scaled by the edge's half width
+    nx = -(y1 - y0) / length * half_widths
+    ny = (x1 - x0) / length * half_widths
+
+    gap = np.full(len(segments), None, dtype=object)
+    xs = np.column_stack([x0 + nx, x1 + nx, x1 - nx, x0 - nx, x0 + nx, gap]).ravel()
+    ys = np.column_stack([y0 + ny, y1 + ny, y1 - ny, y0 - ny, y0 + ny, gap]).ravel()
+    return xs, ys
+
+
+if __name__ == '__main__':
+    build_all_pass_networks()
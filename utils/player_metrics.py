@@ -0,0 +1,139 @@
+"""
+Player metrics module
+Volume and success-rate metrics of the player radar charts for every player
+at once, from a single groupby over (player, type, outcome), kept in the local
+data store
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict, Optional
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches, load_tournament_data
+from utils.preprocess import cache, entity_names, store_key
+from utils.standings import matches_version
+
+
+# Outcomes that count as winning a duel or an interception
+WON_OUTCOMES = ['Success In Play', 'Won', 'Success Out']
+
+# Success metric -> (event type, outcome column, successful outcomes); passes
+# are successful when no outcome is recorded
+SUCCESS_ACTIONS = {
+    'Pass Success': ('Pass', 'pass_outcome', None),
+    'Dribble Success': ('Dribble', 'dribble_outcome', ['Complete']),
+    'Shot Success': ('Shot', 'shot_outcome', ['Goal']),
+    'Duel Success': ('Duel', 'duel_outcome', WON_OUTCOMES),
+    'Interception Success': ('Interception', 'interception_outcome', WON_OUTCOMES),
+}
+
+# Volume metric -> event type counted (goals are the successful shots)
+VOLUME_TYPES = {
+    'Shots': 'Shot',
+    'Passes': 'Pass',
+    'Dribbles': 'Dribble',
+    'Duels': 'Duel',
+    'Interceptions': 'Interception',
+}
+VOLUME_METRICS = ['Goals'] + list(VOLUME_TYPES)
+SUCCESS_METRICS = list(SUCCESS_ACTIONS)
+
+# Placeholder outcome of events without one, so they survive the groupby
+NO_OUTCOME = 'No Outcome'
+
+# Bump when the table layout changes so stale pickles in the store are ignored
+PLAYER_METRICS_STORE_VERSION = 1
+
+
+def _column(events_df: pd.DataFrame, name: str) -> pd.Series:
+    if name in events_df.columns:
+        return events_df[name]
+    return pd.Series(np.nan, index=events_df.index, dtype=object)
+
+
+def compute_player_metrics(events_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Volume counts, successful actions and success rates for every player
+
+    Args:
+        events_df: Tournament events with type, player and the outcome columns
+
+    Returns:
+        DataFrame indexed by player with the VOLUME_METRICS counts, the
+        SUCCESS_METRICS rates (0-100) and the successful action counts in
+        '<metric> Count' columns
+    """
+    event_type = events_df['type']
+    player = entity_names(events_df['player'])
+    outcome = pd.Series(np.nan, index=events_df.index, dtype=object)
+    for action, column, _ in SUCCESS_ACTIONS.values():
+        outcome = outcome.mask(event_type == action, entity_names(_column(events_df, column)))
+
+    tracked = event_type.isin(VOLUME_TYPES.values())
+    actions = pd.DataFrame({
+        'player': player,
+        'type': event_type,
+        'outcome': outcome.fillna(NO_OUTCOME),
+    })[tracked].dropna(subset=['player'])
+
+    counts = actions.groupby(['player', 'type', 'outcome']).size()
+    types = counts.index.get_level_values('type')
+    outcomes = counts.index.get_level_values('outcome')
+
+    successful = np.zeros(len(counts), dtype=bool)
+    for action, _, won in SUCCESS_ACTIONS.values():
+        successful |= (types == action) & (outcomes.isin(won) if won else outcomes == NO_OUTCOME)
+
+    action_types = list(VOLUME_TYPES.values())
+    # Players with none of the tracked actions still get a row of zeros
+    players = pd.Index(player.dropna().unique(), name='player').sort_values()
+    totals = (counts.groupby(level=['player', 'type']).sum().unstack('type', fill_value=0)
+              .reindex(index=players, columns=action_types, fill_value=0))
+    successes = (counts[successful].groupby(level=['player', 'type']).sum().unstack('type', fill_value=0)
+                 .reindex(index=players, columns=action_types, fill_value=0))
+
+    table = pd.DataFrame(index=totals.index)
+    table['Goals'] = successes['Shot']
+    for metric, action in VOLUME_TYPES.items():
+        table[metric] = totals[action]
+    for metric, (action, _, _) in SUCCESS_ACTIONS.items():
+        table[metric] = (successes[action] / totals[action].where(totals[action] > 0) * 100).fillna(0)
+        table[f"{metric} Count"] = successes[action]
+    return table
+
+
+@single_flight
+@lru_cache(maxsize=1)
+def load_player_metrics() -> pd.DataFrame:
+    """Load the player metrics table from the store, building and saving it on a miss"""
+    # Tournament-wide, so also keyed on the match list like the standings
+    key = store_key('player_metrics', PLAYER_METRICS_STORE_VERSION, matches_version(load_euro_2024_matches()))
+    player_metrics = cache.get(key)
+    if player_metrics is None:
+        player_metrics = compute_player_metrics(load_tournament_data())
+        cache.set(key, player_metrics)
+    return player_metrics
+
+
+def player_metric_profile(player_name: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Look up one player's radar metrics
+
+    Args:
+        player_name: Player name
+
+    Returns:
+        Dictionary with 'volume' (VOLUME_METRICS counts), 'success_rates'
+        (SUCCESS_METRICS, 0-100) and 'successes' (successful action counts
+        keyed by SUCCESS_METRICS), or None for a player without events
+    """
+    player_metrics = load_player_metrics()
+    if player_name not in player_metrics.index:
+        return None
+    row = player_metrics.loc[player_name]
+    return {
+        'volume': {metric: int(row[metric]) for metric in VOLUME_METRICS},
+        'success_rates': {metric: float(row[metric]) for metric in SUCCESS_METRICS},
+        'successes': {metric: int(row[f"{metric} Count"]) for metric in SUCCESS_METRICS},
+    }
@@ -3,114 +3,97 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import io
 import base64
+from functools import lru_cache
 from mplsoccer import Pitch,VerticalPitch
+from utils.shots import extract_shots, build_xg_timeline, get_xg_timeline, PERIOD_MINUTES
+from utils.spatial import density_grid, player_receipt_density
+from utils.figure_compaction import compact_figure, figure_json_size
+from utils.pass_network import compute_pass_network, get_pass_network_tables, edge_segments, segments_to_polygons
 
-def _draw_pitch_plotly(fig):
-    """Draws a detailed soccer pitch background on a Plotly figure."""
+@lru_cache(maxsize=8)
+def get_pitch_template(pitch_color='#388E3C', line_color='white', line_width=2):
+    """Build (once) a lean Plotly template holding the full pitch markings.
+
+    Every pitch figure references this template instead of adding ~15 shapes and
+    5 marker traces of its own. The template also replaces Plotly's default
+    template, which is the largest part of a serialized figure.
+    """
     pitch_length_x = 120
     pitch_width_y = 80
+    line = dict(color=line_color, width=line_width)
 
-    pitch_color = '#388E3C'  # A darker, more realistic green
-    line_color = 'white'
-    line_width = 2
-
-    # Outer box (pitch boundary)
-    fig.add_shape(type="rect", x0=0, y0=0, x1=pitch_length_x, y1=pitch_width_y,
-                  line=dict(color=line_color, width=line_width), fillcolor=pitch_color, layer="below")
-
-    # Halfway line
-    fig.add_shape(type="line", x0=pitch_length_x/2, y0=0, x1=pitch_length_x/2, y1=pitch_width_y,
-                  line=dict(color=line_color, width=line_width))
-
-    # Center circle
-    fig.add_shape(type="circle", xref="x", yref="y",
-                  x0=pitch_length_x/2 - 10, y0=pitch_width_y/2 - 10,
-                  x1=pitch_length_x/2 + 10, y1=pitch_width_y/2 + 10,
-                  line=dict(color=line_color, width=line_width))
-
-    # Center dot
-    fig.add_trace(go.Scatter(x=[pitch_length_x/2], y=[pitch_width_y/2],
-                             mode='markers', marker=dict(size=4, color=line_color),
-                             showlegend=False, hoverinfo='skip', name='Center Point'))
-
-    # Penalty areas & D-areas
-    # Left Penalty Area
-    fig.add_shape(type="rect", x0=0, y0=24, x1=18, y1=56,
-                  line=dict(color=line_color, width=line_width))
-    # Left 6-yard box
-    fig.add_shape(type="rect", x0=0, y0=30, x1=6, y1=50,
-                  line=dict(color=line_color, width=line_width))
-    # Left Penalty Spot
-    fig.add_trace(go.Scatter(x=[12], y=[40], mode='markers', marker=dict(size=4, color=line_color),
-                             showlegend=False, hoverinfo='skip', name='Left Penalty Spot'))
-    # Left D
-    fig.add_shape(type="path",
-                  path=f'M {18} {40 - 10} A {10} {10} 0 0 1 {18} {40 + 10}',
-                  line=dict(color=line_color, width=line_width))
-
-    # Right Penalty Area
-    fig.add_shape(type="rect", x0=pitch_length_x - 18, y0=24, x1=pitch_length_x, y1=56,
-                  line=dict(color=line_color, width=line_width))
-    # Right 6-yard box
-    fig.add_shape(type="rect", x0=pitch_length_x - 6, y0=30, x1=pitch_length_x, y1=50,
-                  line=dict(color=line_color, width=line_width))
-    # Right Penalty Spot
-    fig.add_trace(go.Scatter(x=[pitch_length_x - 12], y=[40], mode='markers', marker=dict(size=4, color=line_color),
-                             showlegend=False, hoverinfo='skip', name='Right Penalty Spot'))
-    # Right D
-    fig.add_shape(type="path",
-                  path=f'M {pitch_length_x - 18} {40 - 10} A {10} {10} 0 0 0 {pitch_length_x - 18} {40 + 10}',
-                  line=dict(color=line_color, width=line_width))
-
-    # Goals (Adjusted for visual representation, actual goal depth is usually small)
-    fig.add_trace(go.Scatter(x=[120, 120], y=[36, 44], mode='lines', line=dict(color="white", width=4), showlegend=False, hoverinfo='skip', name='Right Goal'))
-    fig.add_trace(go.Scatter(x=[0, 0], y=[36, 44], mode='lines', line=dict(color="white", width=4), showlegend=False, hoverinfo='skip', name='Left Goal'))
+    shapes = [
+        # Outer box (pitch boundary)
+        dict(type="rect", x0=0, y0=0, x1=pitch_length_x, y1=pitch_width_y,
+             line=line, fillcolor=pitch_color, layer="below"),
+        # Halfway line
+        dict(type="line", x0=pitch_length_x/2, y0=0, x1=pitch_length_x/2, y1=pitch_width_y, line=line),
+        # Center circle
+        dict(type="circle", xref="x", yref="y",
+             x0=pitch_length_x/2 - 10, y0=pitch_width_y/2 - 10,
+             x1=pitch_length_x/2 + 10, y1=pitch_width_y/2 + 10, line=line),
+        # Left Penalty Area and 6-yard box
+        dict(type="rect", x0=0, y0=24, x1=18, y1=56, line=line),
+        dict(type="rect", x0=0, y0=30, x1=6, y1=50, line=line),
+        # Left D
+        dict(type="path", path=f'M {18} {40 - 10} A {10} {10} 0 0 1 {18} {40 + 10}', line=line),
+        # Right Penalty Area and 6-yard box
+        dict(type="rect", x0=pitch_length_x - 18, y0=24, x1=pitch_length_x, y1=56, line=line),
+        dict(type="rect", x0=pitch_length_x - 6, y0=30, x1=pitch_length_x, y1=50, line=line),
+        # Right D
+        dict(type="path", path=f'M {pitch_length_x - 18} {40 - 10} A {10} {10} 0 0 0 {pitch_length_x - 18} {40 + 10}',
+             line=line),
+        # Goals
+        dict(type="line", x0=pitch_length_x, y0=36, x1=pitch_length_x, y1=44, line=dict(color=line_color, width=4)),
+        dict(type="line", x0=0, y0=36, x1=0, y1=44, line=dict(color=line_color, width=4)),
+    ]
+    # Center dot and penalty spots, drawn as small filled circles rather than marker traces
+    for spot_x in (pitch_length_x/2, 12, pitch_length_x - 12):
+        shapes.append(dict(type="circle", x0=spot_x - 0.5, y0=pitch_width_y/2 - 0.5,
+                           x1=spot_x + 0.5, y1=pitch_width_y/2 + 0.5,
+                           line=dict(color=line_color, width=0), fillcolor=line_color))
 
-    fig.update_layout(
+    default_layout = pio.templates['plotly'].layout
+    template = go.layout.Template()
+    template.layout = go.Layout(
+        shapes=shapes,
         xaxis=dict(range=[0, pitch_length_x], showgrid=False, zeroline=False, showticklabels=False),
         yaxis=dict(range=[0, pitch_width_y], showgrid=False, zeroline=False, showticklabels=False),
         plot_bgcolor='rgba(0,0,0,0)',  # Transparent background as pitch is drawn with shape
-        paper_bgcolor='#E0E0E0'  # Light gray background for the entire plot area
+        paper_bgcolor='#E0E0E0',  # Light gray background for the entire plot area
+        colorway=default_layout.colorway,
+        font=dict(color=default_layout.font.color),
+        hovermode='closest'
     )
+    return template
+
+def _draw_pitch_plotly(fig, **pitch_style):
+    """Attach the precomputed pitch template to a Plotly figure."""
+    fig.update_layout(template=get_pitch_template(**pitch_style))
+
+# Above this many shots the shot map switches to WebGL markers to stay interactive
+WEBGL_SHOT_THRESHOLD = 500
+
+def create_shot_map(events_df, team_name, player_name=None, webgl=None):
+    """Create an interactive shot map using Plotly
 
-def create_shot_map(events_df, team_name, player_name=None):
-    """Create an interactive shot map using Plotly"""
-    # Filter shots for the team
+    webgl=None picks Scattergl automatically for large (e.g. tournament-wide) shot sets.
+    """
+    # Extract shots for the team / player
     if isinstance(events_df, dict) and 'shots' in events_df:
-        shots_df = events_df['shots']
-    else:
-        shots_df = events_df[events_df['type'] == 'Shot'].copy()
-    
-    if team_name:
-        team_shots = shots_df[shots_df['team'].apply(
-            lambda x: x.get('name', '') == team_name if isinstance(x, dict) else str(x) == team_name
-        )]
-    else:
-        team_shots = shots_df
+        events_df = events_df['shots']
+    shots = extract_shots(events_df, team_name, player_name)
     
-    if player_name:
-        team_shots = team_shots[team_shots['player'].apply(
-            lambda x: x.get('name', '') == player_name if isinstance(x, dict) else str(x) == player_name
-        )]
-    
-    if team_shots.empty:
+    if shots.empty:
         return go.Figure().add_annotation(text="No shot data available", 
                                         xref="paper", yref="paper", x=0.5, y=0.5)
     
-    # Extract coordinates and xG values
-    x_coords = []
-    y_coords = []
-    xg_values = []
-    outcomes = []
-    
-    for _, shot in team_shots.iterrows():
-        if isinstance(shot['location'], list) and len(shot['location']) >= 2:
-            x_coords.append(shot['location'][0])
-            y_coords.append(shot['location'][1])
-            xg_values.append(shot.get('shot_statsbomb_xg', 0))
-            outcomes.append(shot.get('shot_outcome', {}).get('name', 'Unknown') if isinstance(shot.get('shot_outcome'), dict) else str(shot.get('shot_outcome', 'Unknown')))
+    if webgl is None:
+        webgl = len(shots) > WEBGL_SHOT_THRESHOLD
+    scatter = go.Scattergl if webgl else go.Scatter
     
     # Create figure
     fig = go.Figure()
@@ -130,46 +113,39 @@ def create_shot_map(events_df, team_name, player_name=None):
         'Other': '#6A5ACD'       # SlateBlue
     }
     
-    for outcome in sorted(list(set(outcomes))): # Sort for consistent legend order
-        mask = [o == outcome for o in outcomes]
-        if any(mask):
-            x_filtered = [x for i, x in enumerate(x_coords) if mask[i]]
-            y_filtered = [y for i, y in enumerate(y_coords) if mask[i]]
-            xg_filtered = [xg for i, xg in enumerate(xg_values) if mask[i]]
-            
-            # Different marker symbols based on outcome
-            if outcome == 'Goal':
-                marker_symbol = 'circle'  # Will add football emoji in text later
-                marker_sizes = [max(10, (xg*1700)//100 + 10) for xg in xg_filtered]
-                marker_color = colors.get(outcome, 'gold')
-                opacity = 1.0
-            else:
-                # Use symbols with lines for non-goals
-                marker_symbol = 'x'  # Alternative: 'x-open', 'cross-open'
-                marker_sizes = [max(10, (xg*1700)//100) for xg in xg_filtered]
-                marker_color = colors.get(outcome, 'gray')
-                opacity = 0.8
-            
-            # Create hover text with football emoji for goals
-            if outcome == 'Goal':
-                hover_text = [f'⚽ GOAL! xG: {xg:.2f}' for xg in xg_filtered]
-            else:
-                hover_text = [f'xG: {xg:.2f}, Outcome: {outcome}' for xg in xg_filtered]
-            
-            fig.add_trace(go.Scatter(
-                x=x_filtered, y=y_filtered,
-                mode='markers',
-                marker=dict(
-                    size=marker_sizes,
-                    color=marker_color,
-                    opacity=opacity,
-                    symbol=marker_symbol,
-                    line=dict(width=2, color='black')
-                ),
-                name=outcome if outcome != 'Goal' else '⚽ Goal',
-                text=hover_text,
-                hovertemplate='%{text}<extra></extra>'
-            ))
+    for outcome, outcome_shots in shots.groupby('outcome', sort=True): # Sort for consistent legend order
+        xg = outcome_shots['xg']
+        
+        # Different marker symbols based on outcome
+        if outcome == 'Goal':
+            marker_symbol = 'circle'  # Will add football emoji in text later
+            marker_sizes = np.maximum(10, (xg*1700)//100 + 10)
+            marker_color = colors.get(outcome, 'gold')
+            opacity = 1.0
+            # Hover with football emoji for goals
+            hover_template = '⚽ GOAL! xG: %{customdata:.2f}<extra></extra>'
+        else:
+            # Use symbols with lines for non-goals
+            marker_symbol = 'x'  # Alternative: 'x-open', 'cross-open'
+            marker_sizes = np.maximum(10, (xg*1700)//100)
+            marker_color = colors.get(outcome, 'gray')
+            opacity = 0.8
+            hover_template = 'xG: %{customdata:.2f}, Outcome: ' + outcome + '<extra></extra>'
+        
+        fig.add_trace(scatter(
+            x=outcome_shots['x'], y=outcome_shots['y'],
+            mode='markers',
+            marker=dict(
+                size=marker_sizes,
+                color=marker_color,
+                opacity=opacity,
+                symbol=marker_symbol,
+                line=dict(width=2, color='black')
+            ),
+            name=outcome if outcome != 'Goal' else '⚽ Goal',
+            customdata=xg,
+            hovertemplate=hover_template
+        ))
     
     fig.update_layout(
         title=f"<b>Shot Map - {team_name}</b>" + (f"<br><i>{player_name}</i>" if player_name else ""),
@@ -178,200 +154,74 @@ def create_shot_map(events_df, team_name, player_name=None):
         legend_title_text='Shot Outcome'
     )
     
-    return fig
+    return compact_figure(fig, 'shot_map')
 
 def create_pass_network(events_df, team_name, match_id=None):
     """Create a pass network visualization"""
-    # Get substitution data
-    substitutions = events_df[events_df['type'] == 'Substitution'].copy()
-    
-    # Create a mapping from substituted player to replacement
-    sub_mapping = {}
-    for _, sub in substitutions.iterrows():
-        player_name = sub['player'].get('name', 'Unknown') if isinstance(sub['player'], dict) else str(sub['player'])
-        replacement_name = sub['substitution_replacement'].get('name', 'Unknown') if isinstance(sub['substitution_replacement'], dict) else str(sub['substitution_replacement'])
-        sub_mapping[replacement_name] = player_name
-    
-    # Filter passes for the team
-    passes_df = events_df[
-        # PASS OR Ball Receipt
-        (events_df['type'].isin(['Pass'])) &
-        (events_df['team'].apply(
-            lambda x: x.get('name', '') == team_name if isinstance(x, dict) else str(x) == team_name
-        )) &
-        (events_df['pass_outcome'].isna())  # Only successful passes
-    ].copy()
-    # passes_df.to_csv(team_name + '_passes.csv', index=False)  # Save passes for debugging
-    
-    if passes_df.empty:
-        return go.Figure().add_annotation(text="No pass data available", 
-                                        xref="paper", yref="paper", x=0.5, y=0.5)
-    
-    # Calculate pass connections (player to pass_recipient)
-    pass_connections_list = []
-    for index, row in passes_df.iterrows():
-        passer_name = row['player'].get('name', 'Unknown') if isinstance(row['player'], dict) else str(row['player'])
-        recipient_name = row['pass_recipient'].get('name', 'Unknown') if isinstance(row['pass_recipient'], dict) else str(row['pass_recipient'])
-        
-        # Map substituted players to original players
-        if passer_name in sub_mapping:
-            original_passer = sub_mapping[passer_name]
-            pass_connections_list.append({'passer': original_passer, 'recipient': recipient_name, 'substituted_passer': True})
-        else:
-            pass_connections_list.append({'passer': passer_name, 'recipient': recipient_name, 'substituted_passer': False})
-            
-        # Do the same for recipients
-        if recipient_name in sub_mapping:
-            original_recipient = sub_mapping[recipient_name]
-            # Update the last added connection
-            pass_connections_list[-1]['recipient'] = original_recipient
-            pass_connections_list[-1]['substituted_recipient'] = True
-        else:
-            pass_connections_list[-1]['substituted_recipient'] = False
-    
-    # Create a list of unique players for position calculation
-    unique_players = set()
-    for connection in pass_connections_list:
-        unique_players.add(connection['passer'])
-        unique_players.add(connection['recipient'])
-    
-    # Calculate average positions and include position information
-    avg_positions_list = []
-    for player_name in unique_players:
-        # Find all passes by this player (either original or after substitution mapping)
-        player_passes = passes_df[passes_df['player'].apply(
-            lambda x: x.get('name', '') == player_name if isinstance(x, dict) else str(x) == player_name
-        )]
-        
-        # Find all passes by the substituted player if this is an original player
-        sub_player = None
-        for replacement, original in sub_mapping.items():
-            if original == player_name:
-                sub_player = replacement
-                break
-                
-        if sub_player:
-            sub_passes = passes_df[passes_df['player'].apply(
-                lambda x: x.get('name', '') == sub_player if isinstance(x, dict) else str(x) == sub_player
-            )]
-            # Combine passes from original and substituted player
-            player_passes = pd.concat([player_passes, sub_passes])
-        
-        if not player_passes.empty:
-            # Get position for this player from events dataframe
-            player_events = events_df[events_df['player'].apply(
-                lambda x: x.get('name', '') == player_name if isinstance(x, dict) else str(x) == player_name
-            )]
-            
-            # Extract position name from the position field
-            position = 'Unknown'
-            if not player_events.empty and 'position' in player_events.columns:
-                # Get the first available position for this player
-                pos_entry = player_events['position'].dropna().iloc[0] if not player_events['position'].dropna().empty else None
-                if pos_entry is not None:
-                    position = pos_entry.get('name', 'Unknown') if isinstance(pos_entry, dict) else str(pos_entry)
-            
-            # Check if this player was substituted or is a substitute
-            was_substituted = player_name in sub_mapping.values()
-            is_substitute = player_name in sub_mapping.keys()
-            
-            avg_positions_list.append({
-                'player_name': player_name,
-                'position': position,
-                'x': player_passes['x'].mean(),
-                'y': player_passes['y'].mean(),
-                'was_substituted': was_substituted,
-                'is_substitute': is_substitute,
-                'sub_player': sub_player
-            })
+    # Use the precomputed tables when we know the match; otherwise compute from the events
+    if match_id is not None:
+        avg_positions, pass_connections = get_pass_network_tables(match_id, team_name)
+    else:
+        avg_positions, pass_connections = compute_pass_network(events_df, team_name)
     
-    avg_positions = pd.DataFrame(avg_positions_list)
-
     if avg_positions.empty:
-        return go.Figure().add_annotation(text="Could not calculate average player positions", 
+        return go.Figure().add_annotation(text="No pass data available", 
                                         xref="paper", yref="paper", x=0.5, y=0.5)
     
-    pass_connections_df = pd.DataFrame(pass_connections_list)
-    pass_connections = pass_connections_df.groupby(['passer', 'recipient']).size().reset_index(name='passes')
-    
     # Calculate pass threshold dynamically as a percentage of the maximum pass count
     min_pass_threshold = max(2, int(pass_connections['passes'].max() * 0.15)) if not pass_connections.empty else 3
     print(f"Minimum pass threshold set to: {min_pass_threshold} for {team_name}")
     # Filter to include only connections with sufficient passes
-    pass_connections = pass_connections[pass_connections['passes'] >= min_pass_threshold]
+    pass_connections = edge_segments(avg_positions, pass_connections[pass_connections['passes'] >= min_pass_threshold])
     
-    # Calculate normalized line widths based on pass frequency
-    if not pass_connections.empty:
-        max_line_width = 18  # Thicker lines for better visibility (increased from example)
-        min_line_width = 2.5  # Increased minimum for better visibility
-        pass_connections['width'] = min_line_width + ((pass_connections['passes'] - pass_connections['passes'].min()) / 
-                               (pass_connections['passes'].max() - pass_connections['passes'].min() + 0.001)) * (max_line_width - min_line_width)
-        
-        # Calculate transparency based on pass count
-        min_transparency = 0.3  # Lower minimum transparency for better visibility (from example)
-        pass_connections['transparency'] = min_transparency + ((pass_connections['passes'] - pass_connections['passes'].min()) / 
-                                      (pass_connections['passes'].max() - pass_connections['passes'].min() + 0.001)) * (1 - min_transparency)
-
     fig = go.Figure()
     
-    # First calculate all data and prepare everything before rendering
     # Add detailed pitch background
     _draw_pitch_plotly(fig)
     
-    # Calculate total involvement (passes made + received) for better node sizing
-    if not avg_positions.empty:
-        # Count passes made
-        made_passes = pass_connections_df.groupby('passer').size().reset_index(name='pass_count')
-        made_passes = made_passes.rename(columns={'passer': 'player_name'})
-        
-        # Count passes received
-        received_passes = pass_connections_df.groupby('recipient').size().reset_index(name='received_count')
-        received_passes = received_passes.rename(columns={'recipient': 'player_name'})
-        
-        # Merge pass counts with avg_positions
-        avg_positions = avg_positions.merge(made_passes, on='player_name', how='left')
-        avg_positions = avg_positions.merge(received_passes, on='player_name', how='left')
-        avg_positions['pass_count'] = avg_positions['pass_count'].fillna(0)
-        avg_positions['received_count'] = avg_positions['received_count'].fillna(0)
-        
-        # Calculate total involvement
-        avg_positions['total_involvement'] = avg_positions['pass_count'] + avg_positions['received_count']
-        
-        # Calculate node size based on total involvement - with larger sizes for better visibility
-        min_marker_size = 30
-        max_marker_size = 45
-        if len(avg_positions) > 1:  # Only normalize if we have multiple players
-            min_involvement = avg_positions['total_involvement'].min()
-            max_involvement = avg_positions['total_involvement'].max()
-            range_involvement = max_involvement - min_involvement
-            
-            if range_involvement > 0:  # Avoid division by zero
-                avg_positions['marker_size'] = min_marker_size + ((avg_positions['total_involvement'] - min_involvement) / 
-                                            range_involvement) * (max_marker_size - min_marker_size)
-            else:
-                avg_positions['marker_size'] = min_marker_size
+    # Calculate node size based on total involvement - with larger sizes for better visibility
+    min_marker_size = 30
+    max_marker_size = 45
+    if len(avg_positions) > 1:  # Only normalize if we have multiple players
+        min_involvement = avg_positions['total_involvement'].min()
+        range_involvement = avg_positions['total_involvement'].max() - min_involvement
+        if range_involvement > 0:  # Avoid division by zero
+            avg_positions['marker_size'] = min_marker_size + ((avg_positions['total_involvement'] - min_involvement) / 
+                                        range_involvement) * (max_marker_size - min_marker_size)
         else:
-            avg_positions['marker_size'] = max_marker_size
+            avg_positions['marker_size'] = min_marker_size
+    else:
+        avg_positions['marker_size'] = max_marker_size
     
-    # First add pass connections with variable width and transparency
-    # (adding connections before player nodes ensures they appear underneath)
-    for _, connection in pass_connections.iterrows():
-        passer_pos = avg_positions[avg_positions['player_name'] == connection['passer']]
-        receiver_pos = avg_positions[avg_positions['player_name'] == connection['recipient']]
-        
-        if not passer_pos.empty and not receiver_pos.empty:
-            fig.add_trace(go.Scatter(
-                x=[passer_pos.iloc[0]['x'], receiver_pos.iloc[0]['x']],
-                y=[passer_pos.iloc[0]['y'], receiver_pos.iloc[0]['y']],
-                mode='lines',
-                line=dict(width=connection['width'], 
-                         color=f'rgba(255,255,255,{connection["transparency"]})',  # White for maximum visibility
-                         shape='linear'),  # Linear lines for more clarity
-                showlegend=False,
-                hoverinfo='text',
-                text=f"{connection['passer']} to {connection['recipient']}: {connection['passes']} passes",
-                name=f"Passes: {connection['passes']}"
-            ))
+    # First add pass connections (before player nodes so they appear underneath).
+    # All edges go into one filled trace of None-separated quads whose width (in pitch
+    # units) scales with pass frequency, plus one invisible trace carrying the hover text.
+    if not pass_connections.empty:
+        max_line_width = 2.6
+        min_line_width = 0.35
+        passes = pass_connections['passes']
+        widths = min_line_width + ((passes - passes.min()) / (passes.max() - passes.min() + 0.001)) * (max_line_width - min_line_width)
+        edge_x, edge_y = segments_to_polygons(pass_connections, widths.to_numpy() / 2)
+        fig.add_trace(go.Scatter(
+            x=edge_x, y=edge_y,
+            mode='lines',
+            fill='toself',
+            fillcolor='rgba(255,255,255,0.6)',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip',
+            name='Pass connections'
+        ))
+        fig.add_trace(go.Scatter(
+            x=(pass_connections['x_start'] + pass_connections['x_end']) / 2,
+            y=(pass_connections['y_start'] + pass_connections['y_end']) / 2,
+            mode='markers',
+            marker=dict(size=12, opacity=0),
+            showlegend=False,
+            customdata=pass_connections[['passer', 'recipient', 'passes']],
+            hovertemplate='%{customdata[0]} to %{customdata[1]}: %{customdata[2]} passes<extra></extra>',
+            name='Pass counts'
+        ))
     
     # Then add player position nodes with dynamic sizing and better styling
     positions_dict_acronym={
@@ -403,14 +253,8 @@ def create_pass_network(events_df, team_name, match_id=None):
         
     }
     if not avg_positions.empty:
-        # Create player text (only position acronym)
-        player_texts = []
-        for _, player in avg_positions.iterrows():
-            # Get position information
-            pos = player['position']
-            pos_abbr = positions_dict_acronym.get(pos, 'Unknown')  # Use acronym or 'Unknown' if not found
-                
-            player_texts.append(pos_abbr)
+        # Create player text (only position acronym, 'Unknown' if not found)
+        player_texts = avg_positions['position'].map(positions_dict_acronym).fillna('Unknown')
             
         # Create colored circles based on positions - brighter colors for better visibility on the pitch
         position_colors = {
@@ -451,12 +295,7 @@ def create_pass_network(events_df, team_name, match_id=None):
         node_colors = [position_colors.get(pos, '#7f8c8d') for pos in avg_positions['position']]
         
         # Create different symbols for substituted players
-        node_symbols = []
-        for _, player in avg_positions.iterrows():
-            if player['was_substituted']:
-                node_symbols.append('octagon')  # Use diamond for substituted players
-            else:
-                node_symbols.append('circle')  # Use circle for regular players
+        node_symbols = np.where(avg_positions['was_substituted'], 'octagon', 'circle')
         
         # Add player nodes with improved visibility
         fig.add_trace(go.Scatter(
@@ -477,8 +316,14 @@ def create_pass_network(events_df, team_name, match_id=None):
             textfont=dict(color='white', size=14, family='Arial, sans-serif', weight='bold'),  # Larger text for better visibility
             textposition='middle center',
             name='Players',
-            hoverinfo='text',
-            hovertext=[f"<b>{p['player_name']}</b><br>Position: {p['position']}<br>Passes: {int(p['pass_count'])}<br>Received: {int(p['received_count'])}<br>Total Involvement: {int(p['total_involvement'])}{('<br><b>Substituted by: </b>' + p['sub_player']) if p['was_substituted'] else ''}" for _, p in avg_positions.iterrows()]
+            customdata=np.column_stack([
+                avg_positions['player_name'], avg_positions['position'],
+                avg_positions['pass_count'].astype(int), avg_positions['received_count'].astype(int),
+                avg_positions['total_involvement'].astype(int),
+                np.where(avg_positions['was_substituted'], '<br><b>Substituted by: </b>' + avg_positions['sub_player'].astype(str), '')
+            ]),
+            hovertemplate=('<b>%{customdata[0]}</b><br>Position: %{customdata[1]}<br>Passes: %{customdata[2]}'
+                           '<br>Received: %{customdata[3]}<br>Total Involvement: %{customdata[4]}%{customdata[5]}<extra></extra>')
         ))
             
     # Enhance the layout for a more professional look
@@ -510,7 +355,7 @@ def create_pass_network(events_df, team_name, match_id=None):
         ]
     )
     
-    return fig
+    return compact_figure(fig, 'pass_network')
 
 def create_heatmap(events_df, player_name, event_types=None):
     """Create a player heatmap"""
@@ -617,247 +462,127 @@ def create_progressive_passes_viz(events_df, team_name):
 
 def create_xg_timeline(events_df, match_info=None):
     """Create xG timeline for a match, including goal markers and own goals."""
-    # Get both shots and own goals
-    shots_df = events_df[events_df['type'] == 'Shot'].copy()
-    
-    # Get own goals (separately by type)
-    own_goals_for = events_df[events_df['type'] == 'Own Goal For'].copy() if 'Own Goal For' in events_df['type'].values else pd.DataFrame()
-    own_goals_against = events_df[events_df['type'] == 'Own Goal Against'].copy() if 'Own Goal Against' in events_df['type'].values else pd.DataFrame()
-    
-    if shots_df.empty:
+    # Use the cached per-match timeline when we know the match
+    if match_info is not None and 'match_id' in match_info:
+        timeline = get_xg_timeline(match_info['match_id'])
+    else:
+        timeline = build_xg_timeline(events_df)
+
+    series = timeline['series']
+    if not series['is_shot'].any():
         return go.Figure().add_annotation(text="No shot data available", 
                                         xref="paper", yref="paper", x=0.5, y=0.5)
     
-    # Sort by minute
-    shots_df = shots_df.sort_values('minute')
-    
-    # Calculate cumulative xG by team
-    teams = shots_df['team'].apply(lambda x: x.get('name', 'Unknown') if isinstance(x, dict) else str(x)).unique()
-    
     fig = go.Figure()
     
     # Define colors for teams
     team_colors = px.colors.qualitative.Plotly # A qualitative colorscale from Plotly
-    
-    # Collect all goals from all teams first for better handling of minute overlaps
-    all_goals = []
-    
-    # Also track own goals separately so we can add them to the timeline
-    own_goals_data = []
+    color_for = {team: team_colors[i % len(team_colors)] for i, team in enumerate(timeline['teams'])}
 
-    for i, team in enumerate(teams):
-        team_shots = shots_df[shots_df['team'].apply(
-            lambda x: x.get('name', '') == team if isinstance(x, dict) else str(x) == team
-        )]
-        
-        cumulative_xg = team_shots['shot_statsbomb_xg'].cumsum()
-        
-        # Always start from minute 0 with xG 0 for better visualization
-        # and to ensure the graph shows the entire match timeline
-        plot_minutes = list(team_shots['minute'])
-        plot_xg = list(cumulative_xg)
-        
-        # Add starting point at minute 0 if not already present
-        if not (plot_minutes and plot_minutes[0] == 0):
-            plot_minutes = [0] + plot_minutes
-            plot_xg = [0] + plot_xg
-        
-        # Add ending point at minute 90 if the last minute is less than 90
-        if plot_minutes and plot_minutes[-1] < 90:
-            plot_minutes.append(90)
-            plot_xg.append(plot_xg[-1] if plot_xg else 0)  # Use last xG value
-        
+    # Shapes and annotations are collected and added in one layout update
+    shapes, annotations = [], []
+
+    # Shade stoppage time and mark the breaks between periods
+    periods = timeline['periods']
+    for _, period in periods.iterrows():
+        if period['end'] > period['regulation_end']:
+            shapes.append(dict(type='rect', x0=period['regulation_end'], x1=period['end'], y0=0, y1=1,
+                               xref='x', yref='paper', fillcolor='lightgray', opacity=0.3, line_width=0, layer='below'))
+    for boundary in periods['start'].iloc[1:]:
+        shapes.append(dict(type='line', x0=boundary, x1=boundary, y0=0, y1=1, xref='x', yref='paper',
+                           line=dict(width=1, color='darkgray')))
+
+    # One step line per team; markers only on shots
+    for team, team_series in series.groupby('team', sort=False):
         fig.add_trace(go.Scatter(
-            x=plot_minutes,
-            y=plot_xg,
+            x=team_series['time'],
+            y=team_series['cumulative_xg'],
             mode='lines+markers',
+            line_shape='hv',
             name=f"{team} xG",
-            line=dict(width=3, color=team_colors[i % len(team_colors)]), # Assign distinct color
-            marker=dict(size=8, symbol='circle'),
-            hovertemplate='<b>%{fullData.name}</b><br>Minute: %{x}<br>Cumulative xG: %{y:.2f}<extra></extra>'
+            line=dict(width=3, color=color_for.get(team)), # Assign distinct color
+            marker=dict(size=np.where(team_series['is_shot'], 8, 0), symbol='circle'),
+            customdata=np.column_stack([team_series['clock'], team_series['player'].fillna(''), team_series['xg'].round(2)]),
+            hovertemplate='<b>%{fullData.name}</b><br>Minute: %{customdata[0]}<br>%{customdata[1]} (%{customdata[2]:.2f})<br>Cumulative xG: %{y:.2f}<extra></extra>'
         ))
 
-        # Find goals for this team
-        goals = team_shots[
-            (team_shots['shot_outcome'].apply(lambda x: x.get('name', '') if isinstance(x, dict) else str(x))) == 'Goal'
-        ]
-        
-        # Collect goals for later processing
-        for _, goal in goals.iterrows():
-            # Safely get player name
-            if isinstance(goal.get('player'), dict):
-                player_name = goal['player'].get('name', 'Unknown')
-            else:
-                player_name = str(goal.get('player', 'Unknown'))
-                
-            # Get only last name for brevity
-            if ' ' in player_name:
-                player_name = player_name.split(' ')[-1]
-                
-            # Make sure we include all goals, even at minute 0
-            all_goals.append({
-                'minute': float(goal['minute']),  # Convert to float to handle any potential string values
-                'player': player_name,
-                'team': team,
-                'team_index': i,  # Store team index for color reference
-                'color': team_colors[i % len(team_colors)],
-                'type': 'Goal'
-            })
-    
-    # Process own goals and add them to the all_goals list
-    # Only process Own Goal For events - to avoid double counting
-    processed_event_ids = set()  # Track which events we've already processed
-    
-    for _, og in own_goals_for.iterrows():
-        # Skip if we've already processed this event or its related event
-        if og['id'] in processed_event_ids:
-            continue
-            
-        # Add this event to processed list
-        processed_event_ids.add(og['id'])
-        
-        # Find the team that benefited
-        beneficiary_team = og['team'] if isinstance(og['team'], str) else og['team'].get('name', 'Unknown') if isinstance(og['team'], dict) else 'Unknown'
-        
-        # Try to find the other team involved
-        related_events = og.get('related_events', [])
-        scorer_team = None
-        scorer_name = 'Unknown'
-        
-        # Look for related Own Goal Against event to get the scorer
-        if related_events and not own_goals_against.empty:
-            for _, related_og in own_goals_against.iterrows():
-                if related_og['id'] in related_events:
-                    # Add the related event to processed list to avoid double counting
-                    processed_event_ids.add(related_og['id'])
-                    
-                    scorer_team = related_og['team'] if isinstance(related_og['team'], str) else related_og['team'].get('name', 'Unknown') if isinstance(related_og['team'], dict) else 'Unknown'
-                    scorer_name = related_og['player'] if isinstance(related_og['player'], str) else related_og['player'].get('name', 'Unknown') if isinstance(related_og['player'], dict) else 'Unknown'
-                    
-                    # Get last name only
-                    if ' ' in scorer_name:
-                        scorer_name = scorer_name.split(' ')[-1]
-                    break
-        
-        # Find the team index and color for the beneficiary team
-        team_index = -1
-        for i, team in enumerate(teams):
-            if team == beneficiary_team:
-                team_index = i
-                break
+    # Goal markers, grouped by time so goals in the same minute are staggered
+    goals = timeline['goals'].copy()
+    goals['team_index'] = goals['team'].map({team: i for i, team in enumerate(timeline['teams'])}).fillna(-1)
+    goals['color'] = goals['team'].map(color_for).fillna('gray')
+    # Own goals are drawn in the benefiting team's color
+    own_goals = goals['kind'] == 'Own Goal'
+    goals.loc[own_goals, 'color'] = goals.loc[own_goals, 'beneficiary'].map(color_for).fillna('gray')
+    goals['minute'] = goals['time'].round()
+    goals = goals.sort_values(['minute', 'team_index'])
+
+    minutes_with_goals = list(goals['minute'].unique())
+    for minute_idx, (minute, goals_at_minute) in enumerate(goals.groupby('minute', sort=True)):
+        # For minute 0 goals, slightly offset to make them visible
+        x_position = max(0.5, goals_at_minute['time'].iloc[0])
         
-        # Use a neutral gray if team not found
-        team_color = team_colors[team_index % len(team_colors)] if team_index >= 0 else 'gray'
+        # Use a neutral color for the line when multiple teams score in the same minute
+        line_color = goals_at_minute['color'].iloc[0] if len(goals_at_minute) == 1 else 'gray'
+        shapes.append(dict(
+            type='line', x0=x_position, x1=x_position, y0=0, y1=1, xref='x', yref='paper',
+            line=dict(width=1.5, dash='dash', color=line_color)
+        ))
         
-        # Add the own goal to the list
-        all_goals.append({
-            'minute': float(og['minute']),
-            'player': scorer_name,
-            'team': scorer_team if scorer_team else 'Unknown',
-            'beneficiary': beneficiary_team,
-            'team_index': team_index,
-            'color': team_color,
-            'type': 'Own Goal'
-        })
-    
-    # Process all goal markers from all teams together
-    all_goals_sorted = sorted(all_goals, key=lambda x: (x['minute'], x['team_index']))
-    
-    # Skip if no goals found
-    if not all_goals_sorted:
-        pass  # Continue without adding goal markers
-    else:
-        # Group goals by exact same minute to handle identical timing
-        minute_groups = {}
-        for goal in all_goals_sorted:
-            minute = goal['minute']
-            if minute not in minute_groups:
-                minute_groups[minute] = []
-            minute_groups[minute].append(goal)
+        # If close to previous minute with goals, shift the labels right to prevent overlapping
+        horizontal_shift = 0
+        if minute_idx > 0 and minute - minutes_with_goals[minute_idx-1] < 8:
+            horizontal_shift = 15
         
-        # Process each minute, handling cases where multiple goals occur at the same time
-        for minute, goals_at_minute in sorted(minute_groups.items()):
-            # For minute 0 goals, slightly offset to make them visible
-            x_position = max(0.5, minute) if minute == 0 else minute
-            
-            # Sort goals within the minute by team for consistent ordering
-            goals_at_minute.sort(key=lambda x: x['team_index'])
-            
-            # Create one vertical line for this minute
-            # Use a neutral color for the line when multiple teams score in the same minute
-            line_color = goals_at_minute[0]['color'] if len(goals_at_minute) == 1 else 'gray'
-            
-            # Add the vertical line
-            fig.add_vline(
-                x=x_position,
-                line_width=1.5,
-                line_dash="dash",
-                line_color=line_color
-            )
+        n_goals = len(goals_at_minute)
+        for i, goal in enumerate(goals_at_minute.itertuples()):
+            team_initial = goal.team[0].upper() if goal.team else '?'
+            # Get only last name for brevity
+            player_name = str(goal.player).split(' ')[-1] if goal.player else 'Unknown'
             
-            # For goals that are close together in time, we need to spread out the labels horizontally
-            # to prevent overlapping
+            # Format goal text based on goal type
+            if goal.kind == 'Own Goal':
+                beneficiary_initial = goal.beneficiary[0].upper() if goal.beneficiary else '?'
+                goal_text = f"OG: {player_name} ({team_initial}) → ({beneficiary_initial})"
+            else:
+                goal_text = f"{player_name} ({team_initial})"
             
-            # Calculate horizontal offset for goals in similar time periods
-            minutes_with_goals = list(sorted(minute_groups.keys()))
-            minute_idx = minutes_with_goals.index(minute)
+            # Calculate vertical position - stagger goals at same minute
+            if n_goals == 1:
+                y_pos = 1.05  # Single goal at top
+            elif n_goals % 2 == 1 and i == n_goals // 2:
+                y_pos = 0.5  # Middle position
+            elif i % 2 == 0:
+                y_pos = 1.05 - (0.15 * (i // 2))  # Top positions
+            else:
+                y_pos = 0.05 + (0.15 * (i // 2))  # Bottom positions
             
-            # Check if this minute is close to previous minutes with goals
-            horizontal_shift = 0
-            if minute_idx > 0 and minute - minutes_with_goals[minute_idx-1] < 8:
-                # If close to previous minute with goals, shift right
-                horizontal_shift = 15
+            # Alternate between 0 and 20 pixels offset for goals at the same minute
+            ax_offset = horizontal_shift + ((i % 2) * 20 if n_goals > 1 else 0)
             
-            # Add annotations for each goal at this minute
-            for i, goal in enumerate(goals_at_minute):
-                team_initial = goal['team'][0].upper() if goal['team'] else '?'
-                player_name = goal['player']
-                
-                # Format goal text based on goal type
-                if goal.get('type') == 'Own Goal':
-                    beneficiary_initial = goal.get('beneficiary', 'Unknown')[0].upper() if goal.get('beneficiary') else '?'
-                    goal_text = f"OG: {player_name} ({team_initial}) → ({beneficiary_initial})"
-                else:
-                    goal_text = f"{player_name} ({team_initial})"
-                
-                # Calculate vertical position - stagger goals at same minute
-                if len(goals_at_minute) == 1:
-                    y_pos = 1.05  # Single goal at top
-                else:
-                    # Distribute multiple goals vertically
-                    # For odd number of goals, center the middle one
-                    if len(goals_at_minute) % 2 == 1 and i == len(goals_at_minute) // 2:
-                        y_pos = 0.5  # Middle position
-                    else:
-                        # Alternate between top and bottom
-                        if i % 2 == 0:
-                            y_pos = 1.05 - (0.15 * (i // 2))  # Top positions
-                        else:
-                            y_pos = 0.05 + (0.15 * (i // 2))  # Bottom positions
-                
-                # For horizontal position, use slight offsets for alternating goals
-                # This spreads them out horizontally
-                ax_offset = horizontal_shift
-                if len(goals_at_minute) > 1:
-                    ax_offset += (i % 2) * 20  # Alternate between 0 and 20 pixels offset
-                
-                # Add the annotation
-                fig.add_annotation(
-                    x=x_position,
-                    y=y_pos,
-                    text=goal_text,
-                    showarrow=True,
-                    arrowhead=2,
-                    arrowsize=1,
-                    arrowwidth=1.5,
-                    arrowcolor=goal['color'],
-                    font=dict(color=goal['color'], size=10),
-                    align="center",
-                    xref="x",
-                    yref="paper",  # Use paper coordinates
-                    ax=ax_offset,  # Horizontal offset from the point
-                    ay=0  # No vertical offset in the arrow
-                )
+            annotations.append(dict(
+                x=x_position,
+                y=y_pos,
+                text=f"{goal_text} {goal.clock}",
+                showarrow=True,
+                arrowhead=2,
+                arrowsize=1,
+                arrowwidth=1.5,
+                arrowcolor=goal.color,
+                font=dict(color=goal.color, size=10),
+                align="center",
+                xref="x",
+                yref="paper",  # Use paper coordinates
+                ax=ax_offset,  # Horizontal offset from the point
+                ay=0  # No vertical offset in the arrow
+            ))
+
+    # Tick every 15 minutes of regulation time in each period, labelled with the match clock
+    tickvals, ticktext = [], []
+    for _, period in periods.iterrows():
+        nominal_start, nominal_end = PERIOD_MINUTES[period['period']]
+        for minute in range(nominal_start, nominal_end + 1, 15):
+            tickvals.append(period['start'] + minute - nominal_start)
+            ticktext.append(f"{minute}'")
     
     # Update layout with more space for annotations
     fig.update_layout(
@@ -869,14 +594,16 @@ def create_xg_timeline(events_df, match_info=None):
         legend=dict(x=0.01, y=0.99, bgcolor='rgba(255,255,255,0.7)', bordercolor='white', borderwidth=1),
         plot_bgcolor='white',
         paper_bgcolor='#E0E0E0',
-        margin=dict(t=120, b=80, l=50, r=80)  # Significantly increased margins for annotations
+        margin=dict(t=120, b=80, l=50, r=80),  # Significantly increased margins for annotations
+        shapes=shapes,
+        annotations=annotations
     )
     
     # Add extra padding for the goal annotations
     fig.update_yaxes(rangemode='tozero', automargin=True)
-    fig.update_xaxes(automargin=True)
+    fig.update_xaxes(automargin=True, range=[0, timeline['end']], tickvals=tickvals, ticktext=ticktext)
     
-    return fig
+    return compact_figure(fig, 'xg_timeline')
 def get_formation_offsets(formation: str) -> list:
     print(f"Getting formation offsets for: {formation}")
     xoffset_dict = {
@@ -895,7 +622,7 @@ def get_formation_offsets(formation: str) -> list:
     print(f"Offsets for {formation}: {out}")
     return out
 
-def create_formation_viz(event, related, freeze, tactics ,team_name,home=False):
+def create_formation_viz(event, related, freeze, tactics ,team_name,home=False, match_id=None):
     """Create formation visualization with player position heatmaps"""
     try:
         # Filter the events to get only the team's data
@@ -961,51 +688,24 @@ def create_formation_viz(event, related, freeze, tactics ,team_name,home=False):
             pitch.text(150, 40, player_name, va='top', ha='center', fontsize=15, ax=pitch_ax[position], color='#353535')
             x_vals = event.loc[event['position_id'] == position, 'x'].dropna()
             y_vals = event.loc[event['position_id'] == position, 'y'].dropna()
-            try:
-                pitch.kdeplot(
+            if len(x_vals) > 1 and len(y_vals) > 1:
+                # Binned + Gaussian-smoothed density (cached per player when the match is known)
+                if match_id is not None:
+                    player_id = starting_xi[starting_xi['position_id'] == position].player_id.iloc[0]
+                    density = player_receipt_density(match_id, team_name, player_id)
+                else:
+                    density = density_grid(x_vals, y_vals)
+                pitch.heatmap(density, cmap='Blues', vmin=0, ax=pitch_ax[position])
+            else:
+                pitch.scatter(
                     x=x_vals,
                     y=y_vals,
-                    fill=True,
-                    levels=100,
-                    cut=100,
-                    cmap='Blues',
-                    thresh=0,
+                    color='blue',
+                    s=50,
+                    alpha=0.5,
+                    edgecolors='black',
                     ax=pitch_ax[position]
                 )
-            except:
-                try:
-                    pitch.kdeplot(
-                        x=x_vals,
-                        y=y_vals,
-                        fill=True,
-                        levels=100,
-                        cut=50,
-                        cmap='Blues',
-                        thresh=0,
-                        ax=pitch_ax[position]
-                    )
-                except:
-                    if len(x_vals) > 1 and len(y_vals) > 1:
-                        pitch.kdeplot(
-                            x=x_vals,
-                            y=y_vals,
-                            fill=True,
-                            levels=100,
-                            cut=100,
-                            cmap='Blues',
-                            thresh=0,
-                            ax=pitch_ax[position]
-                        )
-                    else:
-                        pitch.scatter(
-                            x=x_vals,
-                            y=y_vals,
-                            color='blue',
-                            s=50,
-                            alpha=0.5,
-                            edgecolors='black',
-                            ax=pitch_ax[position]
-                        )
 
         return fig
     finally:
@@ -1049,10 +749,10 @@ def plotly_plot_as_base64(fig):
     encoded = base64.b64encode(buf.getvalue()).decode('utf-8')
     return f"data:image/png;base64,{encoded}"
 
-def matplotlib_plot_as_base64(fig):
-    """Convert matplotlib figure to base64 string"""
+def matplotlib_plot_as_base64(fig, tight=True):
+    """Convert matplotlib figure to base64 string (tight=False keeps the figure's own layout, skipping a second draw)"""
     buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight', dpi=150, facecolor=fig.get_facecolor()) # Preserve facecolor
+    fig.savefig(buf, format='png', bbox_inches='tight' if tight else None, dpi=150, facecolor=fig.get_facecolor()) # Preserve facecolor
     buf.seek(0)
     encoded = base64.b64encode(buf.getvalue()).decode('utf-8')
     plt.close(fig) # Close the figure to free memory
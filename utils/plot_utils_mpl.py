@@ -3,6 +3,9 @@ matplotlib.use('Agg') # <--- !! IMPORTANT: MUST be before pyplot import !!
 # -*- coding: utf-8 -*-
 # Import necessary packages
 from mplsoccer import Pitch, VerticalPitch
+from utils.shots import extract_shots, build_xg_timeline, get_xg_timeline, PERIOD_MINUTES
+from utils.spatial import heatmap_pyramid
+from utils.pass_network import compute_pass_network, get_pass_network_tables, edge_segments
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as path_effects
@@ -36,21 +39,16 @@ def create_shot_map(events_df, team_name, player_name=None):
         ax.text(0.5, 0.5, "Column 'type' not found in DataFrame.", ha='center', va='center', fontsize=12)
         return matplotlib_plot_as_base64(fig)
         
-    shots_df = events_df[events_df['type'] == 'Shot'].copy()
-
-    if team_name:
-        shots_df = shots_df[shots_df['team'].apply(get_entity_name) == team_name]
-    
-    if player_name:
-        shots_df = shots_df[shots_df['player'].apply(get_entity_name) == player_name]
-
-    # Check for necessary columns: x, y
-    if 'x' not in shots_df.columns or 'y' not in shots_df.columns:
+    # Check for necessary columns: x, y (or raw location lists)
+    if not {'x', 'y'}.issubset(events_df.columns) and 'location' not in events_df.columns:
         fig, ax = plt.subplots(figsize=(12, 8))
         ax.text(0.5, 0.5, "Missing required columns (x, y) for shot map.", 
                   ha='center', va='center', fontsize=10)
         ax.set_title(f"Shot Map - {team_name or 'None'}" + (f" - {player_name}" if player_name else ""), fontsize=16)
         return matplotlib_plot_as_base64(fig)
+
+    # Vectorized extraction of coordinates, xG (0 if missing) and outcome names
+    shots_df = extract_shots(events_df, team_name, player_name)
         
     if shots_df.empty:
         fig, ax = plt.subplots(figsize=(12, 8)) # Create a figure to return
@@ -61,20 +59,6 @@ def create_shot_map(events_df, team_name, player_name=None):
         ax.set_title(f"Shot Map - {team_name or 'None'}" + (f" - {player_name}" if player_name else ""), fontsize=16)
         return matplotlib_plot_as_base64(fig)
 
-    # Create a default xG value if not available
-    if 'shot_statsbomb_xg' not in shots_df.columns:
-        # Use a default value (0.05) if xG not available
-        shots_df['shot_statsbomb_xg'] = 0.05
-        print("Warning: shot_statsbomb_xg not found, using default value")
-    
-    # Create outcome field if not available
-    if 'shot_outcome' not in shots_df.columns:
-        shots_df['outcome_name'] = 'Off Target'
-        print("Warning: shot_outcome not found, using default value")
-    else:
-        # Ensure shot_outcome is parsed correctly if it's a dict
-        shots_df['outcome_name'] = shots_df['shot_outcome'].apply(lambda x: get_entity_name(x) if isinstance(x, dict) else str(x))
-
     # Setup the pitch
     pitch = VerticalPitch(pitch_type='statsbomb', half=True, pad_bottom=-10, line_zorder=2, line_color='grey')
     fig, ax = pitch.draw(figsize=(12, 8))
@@ -82,13 +66,14 @@ def create_shot_map(events_df, team_name, player_name=None):
     ax.set_facecolor('white')
 
     # Find goals based on outcome
-    goals = shots_df[shots_df['outcome_name'] == 'Goal']
-    other_shots = shots_df[shots_df['outcome_name'] != 'Goal']
+    is_goal = shots_df['outcome'] == 'Goal'
+    goals = shots_df[is_goal]
+    other_shots = shots_df[~is_goal]
 
     # Plot non-goal shots with hatch pattern
     if not other_shots.empty:
         pitch.scatter(other_shots.x, other_shots.y,
-                      s=(other_shots.shot_statsbomb_xg * 1900) + 100,  # Scale size by xG
+                      s=(other_shots.xg * 1900) + 100,  # Scale size by xG
                       edgecolors='#b94b75',  # Border color
                       c='None',  # No fill color
                       hatch='///',  # Diagonal hatch pattern
@@ -101,7 +86,7 @@ def create_shot_map(events_df, team_name, player_name=None):
     # Plot goals with football marker
     if not goals.empty:
         pitch.scatter(goals.x, goals.y,
-                      s=(goals.shot_statsbomb_xg * 1900) + 100,  # Scale size by xG
+                      s=(goals.xg * 1900) + 100,  # Scale size by xG
                       edgecolors='#b94b75',  # Border color  
                       linewidths=0.6,
                       c='white',  # White fill
@@ -122,21 +107,13 @@ def create_pass_network(events_df, team_name, match_id=None):
         ax.text(0.5, 0.5, "Column 'type' not found in DataFrame.", ha='center', va='center', fontsize=12)
         return matplotlib_plot_as_base64(fig)
 
-    passes_df = events_df[
-        (events_df['type'] == 'Pass') &
-        (events_df['team'].apply(get_entity_name) == team_name) &
-        (events_df['pass_outcome'].isna())  # Only successful passes
-    ].copy()
-
-    required_pass_cols = ['x', 'y', 'pass_end_x', 'pass_end_y', 'player', 'pass_recipient']
-    if not all(col in passes_df.columns for col in required_pass_cols):
-        fig, ax = plt.subplots(figsize=(11, 7))
-        ax.text(0.5, 0.5, "Missing required columns for pass network.", 
-                  ha='center', va='center', fontsize=10)
-        ax.set_title(f"Pass Network - {team_name}", fontsize=16)
-        return matplotlib_plot_as_base64(fig)
+    # Node and edge tables are precomputed per match; only compute them here when no match is given
+    if match_id is not None:
+        avg_positions, pass_connections = get_pass_network_tables(match_id, team_name)
+    else:
+        avg_positions, pass_connections = compute_pass_network(events_df, team_name)
 
-    if passes_df.empty:
+    if avg_positions.empty:
         fig, ax = plt.subplots(figsize=(11, 7))
         pitch = Pitch(pitch_type='statsbomb', line_zorder=2, line_color='grey')
         pitch.draw(ax=ax)
@@ -144,36 +121,21 @@ def create_pass_network(events_df, team_name, match_id=None):
         ax.set_title(f"Pass Network - {team_name}", fontsize=16)
         return matplotlib_plot_as_base64(fig)
 
-    # Get player names correctly
-    passes_df['player_name'] = passes_df['player'].apply(get_entity_name)
-    passes_df['recipient_name'] = passes_df['pass_recipient'].apply(get_entity_name)
-    
-    # Calculate average positions
-    avg_positions = passes_df.groupby('player_name').agg({
-        'x': 'mean',
-        'y': 'mean',
-        'id': 'count' # Count passes made by player
-    }).reset_index().rename(columns={'id': 'pass_count'})
-    
-    # Calculate pass connections (use names now)
-    pass_connections = passes_df.groupby(['player_name', 'recipient_name']).size().reset_index(name='passes_between')
     # Filter for minimum passes (e.g., >=3 from original code, or adjust)
-    min_passes_threshold = max(1, int(pass_connections['passes_between'].quantile(0.6))) # Dynamic threshold
-    pass_connections = pass_connections[pass_connections['passes_between'] >= min_passes_threshold]
+    if not pass_connections.empty:
+        min_passes_threshold = max(1, int(pass_connections['passes'].quantile(0.6))) # Dynamic threshold
+        pass_connections = pass_connections[pass_connections['passes'] >= min_passes_threshold]
+    pass_connections = edge_segments(avg_positions, pass_connections)
 
     pitch = Pitch(pitch_type='statsbomb', line_zorder=2, line_color='grey', pitch_color='#22312b')
     fig, ax = pitch.draw(figsize=(13.5, 9))
     fig.set_facecolor('#22312b')
 
-    # Plot pass connections
-    for _, row in pass_connections.iterrows():
-        passer = avg_positions[avg_positions['player_name'] == row['player_name']]
-        receiver = avg_positions[avg_positions['player_name'] == row['recipient_name']]
-        
-        if not passer.empty and not receiver.empty:
-            pitch.lines(passer.x.iloc[0], passer.y.iloc[0], 
-                        receiver.x.iloc[0], receiver.y.iloc[0],
-                        lw=row['passes_between'] / 2, color='white', alpha=0.6, ax=ax, zorder=1)
+    # Plot pass connections (one call draws every edge)
+    if not pass_connections.empty:
+        pitch.lines(pass_connections.x_start, pass_connections.y_start,
+                    pass_connections.x_end, pass_connections.y_end,
+                    lw=pass_connections.passes / 2, color='white', alpha=0.6, ax=ax, zorder=1)
 
     # Plot player positions
     # Scale node size by pass_count (number of passes made)
@@ -195,8 +157,43 @@ def create_pass_network(events_df, team_name, match_id=None):
     ax.set_title(f"Pass Network - {team_name}", fontsize=18, color='white', pad=15)
     return matplotlib_plot_as_base64(fig)
 
-def create_heatmap(events_df, player_name, event_types=None):
-    """Create a player heatmap using Matplotlib and mplsoccer"""
+def _draw_zone_heatmap(pitch, ax, bin_statistic, cmap=None, **kwargs):
+    """Draw a zone heatmap with percentage labels"""
+    # Simple red colormap
+    if cmap is None:
+        cmap = LinearSegmentedColormap.from_list("", ["white", "lightcoral", "red"])
+
+    # Draw the heatmap
+    pitch.heatmap(bin_statistic, ax=ax, cmap=cmap, edgecolor='grey', **kwargs)
+    
+    # Add percentage labels
+    pitch.label_heatmap(
+        bin_statistic, 
+        color='black', 
+        fontsize=10,
+        ax=ax, 
+        str_format='{:.0%}', 
+        ha='center', 
+        va='center',
+        path_effects=[path_effects.Stroke(linewidth=1, foreground='white')]
+    )
+
+def create_heatmap(events_df, player_name, event_types=None, bin_statistic=None):
+    """Create a player heatmap using Matplotlib and mplsoccer
+
+    Pass a precomputed 6x5 bin_statistic (e.g. from utils.touch_grid) to skip filtering events_df.
+    """
+    if bin_statistic is not None:
+        pitch = VerticalPitch(pitch_type='statsbomb', line_zorder=2, line_color='black', pitch_color='white')
+        fig, ax = pitch.draw(figsize=(10, 7))
+        fig.set_facecolor('white')
+        if bin_statistic['statistic'].sum() == 0:
+            ax.text(40, 60, "No event data for heatmap", ha='center', va='center', fontsize=12, color='red', transform=ax.transData)
+        else:
+            _draw_zone_heatmap(pitch, ax, bin_statistic)
+        ax.set_title(f"Touch Heatmap - {player_name}", fontsize=18, color='black', pad=15)
+        return matplotlib_plot_as_base64(fig)
+
     if event_types is None:
         event_types = ['Pass', 'Ball Receipt*', 'Carry', 'Clearance', 'Foul Won', 'Block',
                        'Ball Recovery', 'Duel', 'Dribble', 'Interception', 'Miscontrol', 'Shot']
@@ -237,32 +234,11 @@ def create_heatmap(events_df, player_name, event_types=None):
     
     # Create heatmap using bin_statistic
     try:
-        # Use smaller bins (more detailed) and only valid x,y data
-        bin_statistic = pitch.bin_statistic(
-            player_events.x.dropna(), 
-            player_events.y.dropna(), 
-            statistic='count', 
-            bins=(6, 5), 
-            normalize=True
-        )
-        
-        # Simple red colormap
-        cmap = LinearSegmentedColormap.from_list("", ["white", "lightcoral", "red"])
-
-        # Draw the heatmap
-        pitch.heatmap(bin_statistic, ax=ax, cmap=cmap, edgecolor='grey')
+        # 6x5 zones from the shared spatial binning engine (only valid x,y data)
+        bin_statistic = heatmap_pyramid(player_events.x, player_events.y, normalize=True,
+                                         resolutions=[(6, 5)])[(6, 5)]
         
-        # Add percentage labels
-        labels = pitch.label_heatmap(
-            bin_statistic, 
-            color='black', 
-            fontsize=10,
-            ax=ax, 
-            str_format='{:.0%}', 
-            ha='center', 
-            va='center',
-            path_effects=[path_effects.Stroke(linewidth=1, foreground='white')]
-        )
+        _draw_zone_heatmap(pitch, ax, bin_statistic)
     except Exception as e:
         # If something goes wrong with the heatmap, provide fallback visualization
         print(f"Error creating heatmap: {e}")
@@ -274,6 +250,20 @@ def create_heatmap(events_df, player_name, event_types=None):
     ax.set_title(f"Touch Heatmap - {player_name}", fontsize=18, color='black', pad=15)
     return matplotlib_plot_as_base64(fig)
 
+def create_heatmap_difference(player_name, comparison_name, difference_statistic):
+    """Create a zone heatmap of the difference in touch shares between two players"""
+    pitch = VerticalPitch(pitch_type='statsbomb', line_zorder=2, line_color='black', pitch_color='white')
+    fig, ax = pitch.draw(figsize=(10, 7))
+    fig.set_facecolor('white')
+
+    # Diverging colormap centred on zero: red where the player is more active, blue for the comparison
+    limit = max(abs(difference_statistic['statistic']).max(), 0.01)
+    cmap = LinearSegmentedColormap.from_list("", ["#3498db", "white", "#e74c3c"])
+    _draw_zone_heatmap(pitch, ax, difference_statistic, cmap=cmap, vmin=-limit, vmax=limit)
+
+    ax.set_title(f"Touch Difference - {player_name} vs {comparison_name}", fontsize=18, color='black', pad=15)
+    return matplotlib_plot_as_base64(fig)
+
 def create_progressive_passes_viz(events_df, team_name):
     """Create visualization for progressive passes using Matplotlib"""
     # Check for required type column
@@ -372,26 +362,20 @@ def create_xg_timeline(events_df, match_info=None, team_colors=None):
         ax.text(0.5, 0.5, "Column 'type' not found in DataFrame.", ha='center', va='center', fontsize=12)
         return matplotlib_plot_as_base64(fig)
 
-    shots_df = events_df[events_df['type'] == 'Shot'].copy()
+    # Use the cached per-match timeline when we know the match
+    if match_info is not None and 'match_id' in match_info:
+        timeline = get_xg_timeline(match_info['match_id'])
+    else:
+        timeline = build_xg_timeline(events_df)
 
-    required_xg_cols = ['minute', 'team', 'shot_statsbomb_xg']
-    if not all(col in shots_df.columns for col in required_xg_cols):
-        fig, ax = plt.subplots(figsize=(12, 7))
-        ax.text(0.5, 0.5, "Missing required columns for xG timeline.", 
-                  ha='center', va='center', fontsize=10)
-        ax.set_title("Expected Goals (xG) Timeline", fontsize=16)
-        return matplotlib_plot_as_base64(fig)
-        
-    if shots_df.empty or shots_df['shot_statsbomb_xg'].isnull().all():
+    series = timeline['series']
+    if not series['is_shot'].any():
         fig, ax = plt.subplots(figsize=(12, 7))
         ax.text(0.5, 0.5, "No shot data with xG available", ha='center', va='center', fontsize=12, color='red')
         ax.set_title("Expected Goals (xG) Timeline", fontsize=16)
         return matplotlib_plot_as_base64(fig)
 
-    shots_df['team_name'] = shots_df['team'].apply(get_entity_name)
-    shots_df = shots_df.sort_values('minute')
-    
-    teams = shots_df['team_name'].unique()
+    teams = timeline['teams']
     
     fig, ax = plt.subplots(figsize=(12, 7))
     
@@ -402,42 +386,50 @@ def create_xg_timeline(events_df, match_info=None, team_colors=None):
         default_colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
         colors = default_colors[:len(teams)] if len(teams) <= len(default_colors) else plt.cm.get_cmap('Set1', len(teams))
 
-    for i, team in enumerate(teams):
-        team_shots = shots_df[shots_df['team_name'] == team].copy()
-        if team_shots.empty:
-            continue
-        team_shots['cumulative_xg'] = team_shots['shot_statsbomb_xg'].cumsum()
-        
-        # Add a point at minute 0 with xG 0 for both teams to start lines from origin
-        # Also ensure line extends to full time (e.g., 95 mins) for better viz
-        plot_minutes = pd.concat([pd.Series([0]), team_shots['minute'], pd.Series([team_shots['minute'].max() if not team_shots['minute'].empty else 95])])
-        plot_xg = pd.concat([pd.Series([0]), team_shots['cumulative_xg'], pd.Series([team_shots['cumulative_xg'].iloc[-1] if not team_shots['cumulative_xg'].empty else 0]) ])
-        
-        # Ensure plot_xg and plot_minutes are correctly aligned after sorting by minute and forward filling
-        timeline_data = pd.DataFrame({'minute': plot_minutes, 'cumulative_xg': plot_xg}).sort_values('minute').drop_duplicates('minute',keep='last')
-        timeline_data['cumulative_xg'] = timeline_data['cumulative_xg'].ffill()
+    # Shade stoppage time and mark the breaks between periods
+    periods = timeline['periods']
+    for _, period in periods.iterrows():
+        if period['end'] > period['regulation_end']:
+            ax.axvspan(period['regulation_end'], period['end'], color='lightgray', alpha=0.4, zorder=0)
+    for boundary in periods['start'].iloc[1:]:
+        ax.axvline(boundary, color='darkgray', linewidth=1, zorder=1)
 
+    for i, team in enumerate(teams):
+        team_series = series[series['team'] == team]
         color = colors[i] if isinstance(colors, list) else colors(i)
-        ax.plot(timeline_data['minute'], timeline_data['cumulative_xg'], 
-                label=f"{team} xG ({timeline_data['cumulative_xg'].iloc[-1]:.2f})", 
-                linewidth=3, marker='o', markersize=6, 
-                color=color, alpha=0.8)
+        ax.step(team_series['time'], team_series['cumulative_xg'], where='post',
+                label=f"{team} xG ({timeline['totals'].get(team, 0):.2f})",
+                linewidth=3, color=color, alpha=0.8)
         
         # Add markers at shot events
-        for shot_minute in team_shots['minute']:
-            shot_idx = timeline_data[timeline_data['minute'] <= shot_minute].index[-1] if len(timeline_data[timeline_data['minute'] <= shot_minute]) > 0 else 0
-            if shot_idx < len(timeline_data):
-                ax.scatter(timeline_data.iloc[shot_idx]['minute'], timeline_data.iloc[shot_idx]['cumulative_xg'], 
-                          s=80, color=color, edgecolor='white', linewidth=2, zorder=3, alpha=0.9)
+        shots = team_series[team_series['is_shot']]
+        ax.scatter(shots['time'], shots['cumulative_xg'], 
+                   s=80, color=color, edgecolor='white', linewidth=2, zorder=3, alpha=0.9)
+
+    # Goals as dashed lines in the scoring (or, for own goals, benefiting) team's color
+    goals = timeline['goals']
+    for goal in goals.itertuples():
+        credited = goal.beneficiary if goal.kind == 'Own Goal' else goal.team
+        i = teams.index(credited) if credited in teams else None
+        color = 'gray' if i is None else (colors[i] if isinstance(colors, list) else colors(i))
+        ax.axvline(goal.time, color=color, linestyle='--', linewidth=1.5, alpha=0.8, zorder=2)
+
+    # Tick every 15 minutes of regulation time in each period, labelled with the match clock
+    tickvals, ticktext = [], []
+    for _, period in periods.iterrows():
+        nominal_start, nominal_end = PERIOD_MINUTES[period['period']]
+        for minute in range(nominal_start, nominal_end + 1, 15):
+            tickvals.append(period['start'] + minute - nominal_start)
+            ticktext.append(f"{minute}'")
+    ax.set_xticks(tickvals)
+    ax.set_xticklabels(ticktext)
 
     ax.set_xlabel("Minute", fontsize=12)
     ax.set_ylabel("Cumulative xG", fontsize=12)
     ax.set_title("Expected Goals (xG) Timeline", fontsize=16, pad=15)
     ax.legend(fontsize=10, loc='upper left')
     ax.grid(True, linestyle='--', alpha=0.7)
-    # Set x-axis limits, e.g., 0 to 95 or max minute + buffer
-    max_minute = shots_df['minute'].max()
-    ax.set_xlim(0, max_minute + 5 if not pd.isna(max_minute) else 95)
+    ax.set_xlim(0, timeline['end'])
     ax.set_ylim(bottom=0)
     plt.tight_layout()
 
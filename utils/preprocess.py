@@ -13,6 +13,26 @@ import pandas as pd
 import numpy as np
 
 
+# Set FIGURE_DATA_VERSION when the event data is refreshed to start a new generation
+# of everything stored from it (the precomputed tables here and the figure cache)
+DATA_VERSION = os.environ.get('FIGURE_DATA_VERSION', '1')
+
+
+def store_key(name: str, version: int, *parts) -> str:
+    """
+    Key of a precomputed table in the store, tied to its format and the data version
+
+    Args:
+        name: Table name, e.g. 'pass_network'
+        version: Format version of the table, bumped when its layout changes
+        *parts: Further key parts, e.g. a match id or matches_version()
+
+    Returns:
+        Key such as 'pass_network_v1.1_3942226'
+    """
+    return '_'.join([f"{name}_v{version}.{DATA_VERSION}", *map(str, parts)])
+
+
 class DataCache:
     """Simple caching mechanism for processed data"""
     
@@ -43,6 +63,21 @@ class DataCache:
             pickle.dump(data, f)
 
 
+def entity_names(series: pd.Series) -> pd.Series:
+    """
+    Return plain names for a column that may hold StatsBomb {'id', 'name'} dicts
+
+    Args:
+        series: Column of names or dicts
+
+    Returns:
+        Series of names (missing values stay missing)
+    """
+    if series.dtype == object and series.map(type).eq(dict).any():
+        return series.map(lambda x: x.get('name', 'Unknown') if isinstance(x, dict) else x)
+    return series
+
+
 def create_match_summary(events_df: pd.DataFrame) -> Dict[str, Any]:
     """
     Create high-level match summary statistics
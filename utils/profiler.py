@@ -0,0 +1,155 @@
+"""
+Callback profiler module
+Opt-in cProfile capture of the next N Dash callback requests, written to
+profiles/<callback>-<timestamp>.prof with an HTML summary next to it
+"""
+
+import cProfile
+import html
+import os
+import pstats
+import re
+import threading
+import time
+from typing import Optional
+from utils.metrics import callback_id, CALLBACK_PATH
+
+
+# Where profiles are written
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+
+# Functions listed in the HTML summary
+SUMMARY_ROWS = 60
+
+_state = {'remaining': 0, 'callback': None}
+_lock = threading.Lock()
+
+
+def arm_profiler(count: int, callback: Optional[str] = None) -> None:
+    """
+    Profile the next count callback requests
+
+    Args:
+        count: Number of requests to profile (0 disarms)
+        callback: Only profile callbacks whose id contains this text
+    """
+    with _lock:
+        _state['remaining'] = max(0, int(count))
+        _state['callback'] = callback or None
+    if count:
+        print(f"🔬 Profiling the next {count} callback(s){f' matching {callback!r}' if callback else ''}")
+
+
+def _claim(name: str) -> bool:
+    with _lock:
+        if _state['remaining'] <= 0 or (_state['callback'] and _state['callback'] not in name):
+            return False
+        _state['remaining'] -= 1
+        return True
+
+
+def write_html_summary(stats: pstats.Stats, path: str, title: str) -> None:
+    """
+    Write the top functions of a profile as an HTML table with cumulative-time bars
+
+    Args:
+        stats: Loaded profile
+        path: HTML file to write
+        title: Page heading (the callback id)
+    """
+    total = max(stats.total_tt, 1e-9)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:SUMMARY_ROWS]
+    body = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in rows:
+        share = min(cumulative / total * 100, 100)
+        where = f"{os.path.basename(filename)}:{line}" if line else filename
+        body.append(
+            f"<tr><td><div class='bar' style='width:{share:.1f}%'></div>{share:.1f}%</td>"
+            f"<td>{cumulative * 1000:.1f}</td><td>{own * 1000:.1f}</td><td>{calls}</td>"
+            f"<td><b>{html.escape(function)}</b> <span>{html.escape(where)}</span></td></tr>"
+        )
+    with open(path, 'w') as f:
+        f.write(
+            "<html><head><meta charset='utf-8'><title>Profile: " + html.escape(title) + "</title><style>"
+            "body{font-family:Arial,sans-serif;color:#2c3e50}table{border-collapse:collapse;width:100%}"
+            "td,th{padding:4px 8px;border-bottom:1px solid #ecf0f1;text-align:left;font-size:13px}"
+            "td:first-child{width:220px}.bar{display:inline-block;height:10px;background:#e74c3c;margin-right:6px}"
+            "span{color:#7f8c8d}</style></head><body>"
+            f"<h2>{html.escape(title)}</h2><p>Total {stats.total_tt * 1000:.1f} ms over "
+            f"{stats.total_calls} calls; open the .prof file in snakeviz for a flame graph.</p>"
+            "<table><tr><th>Cumulative share</th><th>Cumulative ms</th><th>Own ms</th><th>Calls</th>"
+            "<th>Function</th></tr>" + ''.join(body) + "</table></body></html>"
+        )
+
+
+def save_profile(profile: cProfile.Profile, name: str) -> str:
+    """
+    Dump a finished profile and its HTML summary to PROFILE_DIR
+
+    Args:
+        profile: Disabled cProfile.Profile
+        name: Callback id
+
+    Returns:
+        Path of the .prof file
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = f"{re.sub(r'[^A-Za-z0-9_.+-]+', '_', name)[:80]}-{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}"
+    path = os.path.join(PROFILE_DIR, f"{stem}.prof")
+    profile.dump_stats(path)
+    write_html_summary(pstats.Stats(path), os.path.join(PROFILE_DIR, f"{stem}.html"), name)
+    print(f"🔬 Profile written: {path}")
+    return path
+
+
+def register_profiler(server) -> None:
+    """
+    Profile Dash callback requests on demand
+
+    Set PROFILE_CALLBACKS=N (and optionally PROFILE_CALLBACK=<text>) to profile
+    the first N matching callbacks after start-up, or request
+    /profile?count=N&callback=<text> from the server machine to arm it while running.
+
+    Args:
+        server: Flask app behind the Dash app (app.server)
+    """
+    from flask import Response, request, g
+
+    if os.environ.get('PROFILE_CALLBACKS'):
+        arm_profiler(int(os.environ['PROFILE_CALLBACKS']), os.environ.get('PROFILE_CALLBACK'))
+
+    @server.before_request
+    def start_profile():
+        if not request.path.endswith(CALLBACK_PATH) or _state['remaining'] <= 0:
+            return
+        name = callback_id(request.get_json(silent=True))
+        if not _claim(name):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active on this thread
+            return
+        g.callback_profile = (profile, name)
+
+    @server.teardown_request
+    def finish_profile(error):
+        started = g.pop('callback_profile', None)
+        if started is None:
+            return
+        profile, name = started
+        profile.disable()
+        try:
+            save_profile(profile, name)
+        except OSError as e:
+            print(f"❌ Could not write profile for {name}: {e}")
+
+    @server.route('/profile')
+    def profile_callbacks():
+        # Arming is limited to requests from the server machine itself
+        if request.remote_addr not in ('127.0.0.1', '::1'):
+            return Response("Profiling can only be enabled locally", status=403, mimetype='text/plain')
+        count = request.args.get('count', default=1, type=int)
+        arm_profiler(count, request.args.get('callback'))
+        return Response(f"Profiling the next {count} callback(s)\n", mimetype='text/plain')
@@ -0,0 +1,225 @@
+"""
+Shot data module
+Vectorized extraction of shots from event data for the shot map and xG
+timeline renderers
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from utils.metrics import timed
+from typing import Dict, Any, Optional
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_match_data
+from utils.preprocess import entity_names
+
+
+SHOT_COLUMNS = ['x', 'y', 'xg', 'outcome', 'player', 'team', 'minute']
+
+# Regulation start/end minute of each period; later minutes in a period are stoppage time.
+# Period 5 (penalty shootout) is left out of the xG timeline and totals, like the
+# match score; its xG is reported separately.
+PERIOD_MINUTES = {1: (0, 45), 2: (45, 90), 3: (90, 105), 4: (105, 120)}
+SHOOTOUT_PERIOD = 5
+
+XG_SERIES_COLUMNS = ['team', 'period', 'time', 'clock', 'xg', 'cumulative_xg', 'player', 'outcome', 'is_shot']
+XG_GOAL_COLUMNS = ['team', 'period', 'time', 'clock', 'player', 'kind', 'beneficiary']
+PERIOD_COLUMNS = ['period', 'start', 'regulation_end', 'end']
+
+
+def extract_shots(events_df: pd.DataFrame, team_name: Optional[str] = None,
+                  player_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Extract shots with flat coordinate, xG and outcome columns
+
+    Args:
+        events_df: Events DataFrame (a single match or the whole tournament)
+        team_name: Only keep shots by this team
+        player_name: Only keep shots by this player
+
+    Returns:
+        DataFrame with x, y, xg, outcome, player, team and minute columns,
+        one row per shot with a valid location
+    """
+    if events_df.empty or 'type' not in events_df.columns:
+        return pd.DataFrame(columns=SHOT_COLUMNS)
+
+    mask = events_df['type'] == 'Shot'
+    if team_name:
+        mask &= entity_names(events_df['team']) == team_name
+    if player_name:
+        mask &= entity_names(events_df['player']) == player_name
+    shots_df = events_df[mask]
+
+    if 'x' in shots_df.columns and 'y' in shots_df.columns:
+        x, y = shots_df['x'], shots_df['y']
+    elif 'location' in shots_df.columns:
+        valid = shots_df['location'].map(lambda loc: isinstance(loc, list) and len(loc) >= 2)
+        # Only the first two values (a shot's location may carry a height as well)
+        locations = [loc[:2] for loc in shots_df.loc[valid, 'location']]
+        coords = pd.DataFrame(locations, index=shots_df.index[valid], columns=[0, 1]).reindex(shots_df.index)
+        x, y = coords[0], coords[1]
+    else:
+        return pd.DataFrame(columns=SHOT_COLUMNS)
+
+    def column(name, default):
+        return shots_df[name] if name in shots_df.columns else pd.Series(default, index=shots_df.index)
+
+    shots = pd.DataFrame({
+        'x': x,
+        'y': y,
+        'xg': pd.to_numeric(column('shot_statsbomb_xg', 0), errors='coerce').fillna(0),
+        'outcome': entity_names(column('shot_outcome', 'Unknown')).fillna('Unknown').astype(str),
+        'player': entity_names(column('player', 'Unknown')),
+        'team': entity_names(column('team', 'Unknown')),
+        'minute': column('minute', np.nan),
+    })
+    return shots.dropna(subset=['x', 'y']).reset_index(drop=True)
+
+
+def _match_clock(events_df: pd.DataFrame) -> tuple:
+    """
+    Place events on a continuous match timeline with stoppage time kept in its period
+
+    StatsBomb restarts the second half at minute 45 even when the first half ran
+    to 45+3, so each period is shifted right by the stoppage time played before it.
+
+    Args:
+        events_df: Events for a single match with period, minute and second columns
+
+    Returns:
+        Tuple of (time, clock, periods): time in minutes on the continuous axis and
+        the broadcast clock label (e.g. "45+2'") for every in-play event, plus a
+        table of period start, regulation end and actual end on the same axis
+    """
+    events = events_df[events_df['period'].isin(list(PERIOD_MINUTES))]
+    period = events['period'].astype(int)
+    minute = events['minute'].astype(float)
+    elapsed = minute + events['second'].fillna(0).astype(float) / 60
+
+    periods = pd.DataFrame({'period': sorted(period.unique())})
+    periods['nominal_start'] = periods['period'].map(lambda p: PERIOD_MINUTES[p][0])
+    periods['nominal_end'] = periods['period'].map(lambda p: PERIOD_MINUTES[p][1])
+    last = elapsed.groupby(period).max().reindex(periods['period']).to_numpy()
+    stoppage = np.maximum(last - periods['nominal_end'].to_numpy(), 0)
+    # Each period is pushed back by all stoppage time played before it
+    periods['offset'] = np.concatenate([[0], np.cumsum(stoppage)[:-1]])
+    periods['start'] = periods['nominal_start'] + periods['offset']
+    periods['regulation_end'] = periods['nominal_end'] + periods['offset']
+    periods['end'] = periods['regulation_end'] + stoppage
+
+    by_period = periods.set_index('period')
+    time = elapsed + period.map(by_period['offset'])
+    nominal_end = period.map(by_period['nominal_end'])
+    added = (minute - nominal_end + 1).clip(lower=0).astype(int)
+    clock = np.where(
+        minute >= nominal_end,
+        nominal_end.astype(int).astype(str) + '+' + added.astype(str) + "'",
+        (minute.astype(int) + 1).astype(str) + "'"
+    )
+    return time, pd.Series(clock, index=events.index), periods[PERIOD_COLUMNS]
+
+
+def build_xg_timeline(events_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Build per-team cumulative xG step series for a match in one groupby/cumsum pass
+
+    Args:
+        events_df: Events for a single match
+
+    Returns:
+        Dictionary with 'series' (one row per shot plus a kick-off and a final
+        whistle row per team, ordered for drawing as a step line), 'goals'
+        (goals and own goals, credited to the scoring player's team),
+        'periods' (period boundaries on the timeline), 'teams' (in order of
+        appearance), 'totals' (in-play xG per team), 'shootout_xg' (penalty
+        shootout xG per team, empty without a shootout) and 'end' (length of
+        the timeline)
+    """
+    empty = {
+        'series': pd.DataFrame(columns=XG_SERIES_COLUMNS), 'goals': pd.DataFrame(columns=XG_GOAL_COLUMNS),
+        'periods': pd.DataFrame(columns=PERIOD_COLUMNS), 'teams': [], 'totals': {}, 'shootout_xg': {}, 'end': 90.0,
+    }
+    if events_df.empty or not {'type', 'team', 'period', 'minute'}.issubset(events_df.columns):
+        return empty
+
+    time, clock, periods = _match_clock(events_df)
+    if periods.empty:
+        return empty
+    end = float(periods['end'].iloc[-1])
+    teams = list(entity_names(events_df['team']).dropna().unique())
+
+    in_play = events_df.loc[time.index]
+    team = entity_names(in_play['team'])
+    player = entity_names(in_play['player']) if 'player' in in_play.columns else pd.Series(None, index=in_play.index)
+
+    is_shot = in_play['type'] == 'Shot'
+    shots = pd.DataFrame({
+        'team': team[is_shot],
+        'period': in_play.loc[is_shot, 'period'].astype(int),
+        'time': time[is_shot],
+        'clock': clock[is_shot],
+        'xg': pd.to_numeric(in_play.loc[is_shot, 'shot_statsbomb_xg'], errors='coerce').fillna(0)
+              if 'shot_statsbomb_xg' in in_play.columns else 0.0,
+        'player': player[is_shot],
+        'outcome': entity_names(in_play.loc[is_shot, 'shot_outcome']).fillna('Unknown')
+                   if 'shot_outcome' in in_play.columns else 'Unknown',
+        'is_shot': True,
+    })
+
+    # Kick-off and final whistle rows so every team's line spans the whole match
+    bounds = pd.DataFrame({
+        'team': teams * 2,
+        'period': [int(periods['period'].iloc[0])] * len(teams) + [int(periods['period'].iloc[-1])] * len(teams),
+        'time': [0.0] * len(teams) + [end] * len(teams),
+        'clock': ["0'"] * len(teams) + ['FT'] * len(teams),
+        'xg': 0.0, 'player': None, 'outcome': None, 'is_shot': False,
+    })
+    # Stable sort keeps kick-off rows first and final whistle rows last at equal times
+    series = pd.concat([bounds.iloc[:len(teams)], shots, bounds.iloc[len(teams):]], ignore_index=True)
+    series = series.sort_values(['team', 'time'], kind='stable').reset_index(drop=True)
+    series['cumulative_xg'] = series.groupby('team')['xg'].cumsum()
+
+    # Goals: scoring shots plus own goals (the 'Against' event carries the scorer)
+    is_goal = shots['outcome'] == 'Goal'
+    goals = shots.loc[is_goal, ['team', 'period', 'time', 'clock', 'player']].assign(kind='Goal', beneficiary=shots.loc[is_goal, 'team'])
+    is_own_goal = in_play['type'] == 'Own Goal Against'
+    if is_own_goal.any():
+        own_team = team[is_own_goal]
+        opponent = {t: next((o for o in teams if o != t), 'Unknown') for t in teams}
+        own_goals = pd.DataFrame({
+            'team': own_team,
+            'period': in_play.loc[is_own_goal, 'period'].astype(int),
+            'time': time[is_own_goal],
+            'clock': clock[is_own_goal],
+            'player': player[is_own_goal],
+            'kind': 'Own Goal',
+            'beneficiary': own_team.map(opponent),
+        })
+        goals = pd.concat([goals, own_goals])
+    goals = goals.sort_values('time', kind='stable').reset_index(drop=True)[XG_GOAL_COLUMNS]
+
+    shootout_xg = {}
+    is_shootout_shot = (events_df['period'] == SHOOTOUT_PERIOD) & (events_df['type'] == 'Shot')
+    if is_shootout_shot.any() and 'shot_statsbomb_xg' in events_df.columns:
+        shootout = events_df[is_shootout_shot]
+        shootout_xg = (pd.to_numeric(shootout['shot_statsbomb_xg'], errors='coerce').fillna(0)
+                       .groupby(entity_names(shootout['team'])).sum().reindex(teams, fill_value=0).to_dict())
+
+    return {
+        'series': series[XG_SERIES_COLUMNS],
+        'goals': goals,
+        'periods': periods.reset_index(drop=True),
+        'teams': teams,
+        'totals': shots.groupby('team')['xg'].sum().reindex(teams, fill_value=0).to_dict(),
+        'shootout_xg': shootout_xg,
+        'end': end,
+    }
+
+
+@single_flight
+@lru_cache(maxsize=64)
+def get_xg_timeline(match_id: int) -> Dict[str, Any]:
+    """Cached xG timeline for a match (see build_xg_timeline)"""
+    with timed('xg_timeline.build'):
+        return build_xg_timeline(load_match_data(match_id))
@@ -0,0 +1,95 @@
+"""
+Single-flight module
+Coalesces concurrent identical calls to expensive loaders and renderers: the
+first caller computes, the others wait for it and share its result
+"""
+
+import functools
+import threading
+from collections import defaultdict
+from typing import Dict, Any, Callable
+from utils.metrics import increment
+
+
+# Per-function key tables are dropped once they grow past this; calls already
+# running keep their entry, later calls for those keys just are not coalesced with them
+MAX_KEYS = 4096
+
+
+class _Key:
+    """Lock held by the caller computing one key, and the error of its last run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.error = None
+
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'coalesced': 0})
+
+
+def single_flight(func: Callable) -> Callable:
+    """
+    Decorate a function so concurrent calls with the same arguments run it once
+
+    Put it above lru_cache. Each key has its own lock: a call that finds it free
+    (every cache hit, and the first miss) takes it without blocking and calls the
+    function, so hits share no lock with other keys. Calls that find it held wait
+    for the running call, then read its result from the cache. Arguments must be
+    hashable. An exception raised by the computation is re-raised in the callers
+    that waited on it and nothing is remembered.
+
+    Args:
+        func: Function to wrap
+
+    Returns:
+        Wrapped function (cache_info/cache_clear of an lru_cache are kept)
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    keys = {}
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        state = keys.get(key)
+        if state is None:
+            state = keys.setdefault(key, _Key())
+
+        if state.lock.acquire(blocking=False):
+            try:
+                state.error = None
+                return func(*args, **kwargs)
+            except Exception as e:
+                state.error = e
+                raise
+            finally:
+                state.lock.release()
+                if len(keys) > MAX_KEYS:
+                    keys.clear()
+
+        increment('singleflight_coalesced_total', function=name)
+        with _stats_lock:
+            _stats[name]['coalesced'] += 1
+        with state.lock:
+            error = state.error
+        if error is not None:
+            raise error
+        return func(*args, **kwargs)
+
+    for attribute in ('cache_info', 'cache_clear'):
+        if hasattr(func, attribute):
+            setattr(wrapper, attribute, getattr(func, attribute))
+    return wrapper
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Coalesced call counts per wrapped function
+
+    Returns:
+        Dictionary of function name -> {'coalesced'}, the number of calls that
+        waited on another caller's computation instead of starting their own
+        (cache hits and misses are counted by the wrapped lru_cache's cache_info)
+    """
+    with _stats_lock:
+        return {name: dict(counts) for name, counts in sorted(_stats.items())}
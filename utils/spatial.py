@@ -0,0 +1,152 @@
+"""
+Spatial aggregation module
+Bins event locations on the StatsBomb pitch (120 x 80) with NumPy and smooths
+them with SciPy, replacing per-request KDE fits
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict, Any
+import numpy as np
+from scipy.ndimage import gaussian_filter
+from utils.data_loader import load_sbopen_match_data
+
+
+PITCH_LENGTH = 120
+PITCH_WIDTH = 80
+
+
+# Heatmap pyramid levels (bins along x, y); each divides the 1-unit base grid evenly
+HEATMAP_RESOLUTIONS = [(6, 5), (12, 8), (24, 16), (60, 40)]
+BASE_BINS = (PITCH_LENGTH, PITCH_WIDTH)
+
+
+def _grid_edges(bins: tuple) -> tuple:
+    return np.linspace(0, PITCH_LENGTH, bins[0] + 1), np.linspace(0, PITCH_WIDTH, bins[1] + 1)
+
+
+def grid_statistic(counts: np.ndarray, normalize: bool = False) -> Dict[str, Any]:
+    """
+    Wrap an (nx, ny) grid of counts in mplsoccer's bin_statistic layout
+
+    Args:
+        counts: Counts per bin, indexed [x_bin, y_bin]
+        normalize: Divide by the total so the grid sums to 1
+
+    Returns:
+        Dictionary with statistic (ny, nx), x_grid/y_grid (bin edges) and cx/cy (bin centers),
+        drawable with pitch.heatmap / pitch.label_heatmap or a Plotly Heatmap
+    """
+    x_edges, y_edges = _grid_edges(counts.shape)
+    total = counts.sum()
+    statistic = (counts / total if normalize and total > 0 else counts).T
+    x_grid, y_grid = np.meshgrid(x_edges, y_edges)
+    cx, cy = np.meshgrid((x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2)
+    return {'statistic': statistic, 'x_grid': x_grid, 'y_grid': y_grid, 'cx': cx, 'cy': cy}
+
+
+def bin_counts(x: np.ndarray, y: np.ndarray, bins: tuple = BASE_BINS) -> np.ndarray:
+    """
+    Count locations per pitch bin with np.histogram2d
+
+    Args:
+        x: x coordinates (0-120); NaNs are ignored
+        y: y coordinates (0-80); NaNs are ignored
+        bins: Number of bins along (x, y)
+
+    Returns:
+        Array of counts indexed [x_bin, y_bin]
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x_edges, y_edges = _grid_edges(bins)
+    counts, _, _ = np.histogram2d(
+        np.clip(x[valid], 0, PITCH_LENGTH), np.clip(y[valid], 0, PITCH_WIDTH), bins=[x_edges, y_edges]
+    )
+    return counts
+
+
+def coarsen(counts: np.ndarray, bins: tuple) -> np.ndarray:
+    """Sum a fine grid of counts down to a coarser resolution that divides it evenly"""
+    fx, fy = counts.shape[0] // bins[0], counts.shape[1] // bins[1]
+    return counts.reshape(bins[0], fx, bins[1], fy).sum(axis=(1, 3))
+
+
+def heatmap_pyramid(x: np.ndarray, y: np.ndarray, normalize: bool = False,
+                    resolutions: list = HEATMAP_RESOLUTIONS) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Bin locations once at 1-unit resolution and aggregate to every pyramid level
+
+    Args:
+        x: x coordinates (0-120)
+        y: y coordinates (0-80)
+        normalize: Return shares of the total instead of counts
+        resolutions: (nx, ny) levels to build
+
+    Returns:
+        Dictionary mapping (nx, ny) to a grid_statistic dictionary
+    """
+    base = bin_counts(x, y)
+    return {bins: grid_statistic(coarsen(base, bins), normalize=normalize) for bins in resolutions}
+
+
+def density_grid(x: np.ndarray, y: np.ndarray, bins: tuple = BASE_BINS) -> Dict[str, Any]:
+    """
+    Smoothed 2D density of locations, a fast stand-in for a Gaussian KDE
+
+    The locations are binned with np.histogram2d and smoothed with a Gaussian
+    filter whose width follows Scott's rule, the bandwidth seaborn's kdeplot uses.
+
+    Args:
+        x: x coordinates (0-120); NaNs are ignored
+        y: y coordinates (0-80); NaNs are ignored
+        bins: Number of bins along (x, y)
+
+    Returns:
+        Dictionary in mplsoccer's bin_statistic layout (see grid_statistic)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    counts = bin_counts(x, y, bins)
+    # Scott's rule is over the locations bin_counts kept, not the NaNs it dropped
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = int(valid.sum())
+
+    if n > 1:
+        # Scott's rule bandwidth, converted from pitch units to bins
+        factor = n ** (-1 / 6)
+        sigma = (
+            max(np.std(x[valid]) * factor * bins[0] / PITCH_LENGTH, 1.0),
+            max(np.std(y[valid]) * factor * bins[1] / PITCH_WIDTH, 1.0),
+        )
+        counts = gaussian_filter(counts, sigma=sigma, mode='constant')
+
+    return grid_statistic(counts, normalize=True)
+
+
+@single_flight
+@lru_cache(maxsize=512)
+def player_receipt_density(match_id: int, team_name: str, player_id: int) -> Dict[str, Any]:
+    """
+    Cached ball-receipt density for one player in a match (used by the formation view)
+
+    Args:
+        match_id: StatsBomb match id
+        team_name: Team the player played for
+        player_id: StatsBomb player id
+
+    Returns:
+        Density grid from density_grid, plus 'n' (number of receipts)
+    """
+    event, _, _, _ = load_sbopen_match_data(match_id)
+    receipts = event.loc[
+        (event['type_name'] == 'Ball Receipt') &
+        (event['outcome_name'].isnull()) &
+        (event['team_name'] == team_name) &
+        (event['player_id'] == player_id),
+        ['x', 'y']
+    ].dropna()
+    grid = density_grid(receipts['x'].to_numpy(), receipts['y'].to_numpy())
+    grid['n'] = len(receipts)
+    return grid
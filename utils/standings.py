@@ -0,0 +1,120 @@
+"""
+Tournament standings module
+Melts the matches frame into one row per (team, match) and aggregates
+standings, goal statistics and clean sheets with a single groupby
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches
+
+
+STANDINGS_COLUMNS = ['team', 'matches_played', 'wins', 'draws', 'losses', 'goals_scored',
+                     'goals_conceded', 'goal_difference', 'points', 'win_percentage',
+                     'draw_percentage', 'loss_percentage', 'goals_per_match',
+                     'goals_conceded_per_match', 'clean_sheets', 'form']
+
+# Number of most recent results shown in the form column
+FORM_LENGTH = 5
+
+
+def team_match_table(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn the matches frame into a long table with one row per team per match
+
+    Args:
+        matches: Matches DataFrame with home/away team and score columns
+
+    Returns:
+        DataFrame with match_id, match_date, team, opponent, venue, goals_for,
+        goals_against, result ('W'/'D'/'L'), points and clean_sheet, sorted by date
+    """
+    sides = []
+    for venue, other in [('home', 'away'), ('away', 'home')]:
+        sides.append(pd.DataFrame({
+            'match_id': matches['match_id'],
+            'match_date': matches['match_date'],
+            'team': matches[f'{venue}_team'],
+            'opponent': matches[f'{other}_team'],
+            'venue': venue,
+            'goals_for': matches[f'{venue}_score'],
+            'goals_against': matches[f'{other}_score'],
+        }))
+    long = pd.concat(sides, ignore_index=True)
+
+    margin = np.sign(long['goals_for'] - long['goals_against'])
+    long['result'] = np.select([margin > 0, margin == 0], ['W', 'D'], default='L')
+    long['points'] = np.select([margin > 0, margin == 0], [3, 1], default=0)
+    long['clean_sheet'] = long['goals_against'] == 0
+    return long.sort_values(['match_date', 'match_id'], kind='stable').reset_index(drop=True)
+
+
+def compute_standings(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate the long (team, match) table into tournament standings
+
+    Args:
+        long: Output of team_match_table
+
+    Returns:
+        DataFrame with one row per team (see STANDINGS_COLUMNS), ordered by
+        points, goal difference and goals scored
+    """
+    results = long.assign(
+        win=long['result'] == 'W', draw=long['result'] == 'D', loss=long['result'] == 'L'
+    )
+    standings = results.groupby('team').agg(
+        matches_played=('match_id', 'size'),
+        wins=('win', 'sum'),
+        draws=('draw', 'sum'),
+        losses=('loss', 'sum'),
+        goals_scored=('goals_for', 'sum'),
+        goals_conceded=('goals_against', 'sum'),
+        points=('points', 'sum'),
+        clean_sheets=('clean_sheet', 'sum'),
+    )
+    standings['goal_difference'] = standings['goals_scored'] - standings['goals_conceded']
+    played = standings['matches_played']
+    for column, source in [('win_percentage', 'wins'), ('draw_percentage', 'draws'), ('loss_percentage', 'losses')]:
+        standings[column] = standings[source] / played * 100
+    standings['goals_per_match'] = standings['goals_scored'] / played
+    standings['goals_conceded_per_match'] = standings['goals_conceded'] / played
+    # Rows are in date order, so the last results of each group are the most recent
+    standings['form'] = long.groupby('team').tail(FORM_LENGTH).groupby('team')['result'].sum()
+
+    standings = standings.reset_index().sort_values(
+        ['points', 'goal_difference', 'goals_scored', 'team'], ascending=[False, False, False, True]
+    )
+    return standings.reset_index(drop=True)[STANDINGS_COLUMNS]
+
+
+def matches_version(matches: pd.DataFrame) -> int:
+    """Hash of the match list and its scores, used to memoize derived tables"""
+    return int(pd.util.hash_pandas_object(
+        matches[['match_id', 'home_team', 'away_team', 'home_score', 'away_score']], index=False
+    ).sum())
+
+
+@single_flight
+@lru_cache(maxsize=4)
+def _tournament_tables(version: int) -> Dict[str, pd.DataFrame]:
+    long = team_match_table(load_euro_2024_matches())
+    return {'team_matches': long, 'standings': compute_standings(long)}
+
+
+def get_tournament_tables() -> Dict[str, pd.DataFrame]:
+    """
+    Standings and the long (team, match) table, memoized on the match list version
+
+    Returns:
+        Dictionary with 'standings' and 'team_matches' DataFrames
+    """
+    return _tournament_tables(matches_version(load_euro_2024_matches()))
+
+
+def get_standings() -> pd.DataFrame:
+    """Tournament standings (see compute_standings)"""
+    return get_tournament_tables()['standings']
@@ -0,0 +1,131 @@
+"""
+Player touch-grid module
+Precomputes a (family x player x-bin x y-bin) tensor of touch counts for the
+whole tournament so player heatmaps and comparisons become array slices
+"""
+
+from functools import lru_cache
+from utils.singleflight import single_flight
+from typing import Dict, Any, List, Optional
+import pandas as pd
+import numpy as np
+from utils.data_loader import load_euro_2024_matches, load_tournament_data
+from utils.preprocess import cache, entity_names, store_key
+from utils.standings import matches_version
+from utils.spatial import grid_statistic, coarsen, PITCH_LENGTH, PITCH_WIDTH
+
+
+# Event types counted as touches, grouped into families. Together they are the
+# default event types of the player heatmap.
+TOUCH_FAMILIES = {
+    'passing': ['Pass', 'Ball Receipt*'],
+    'carrying': ['Carry', 'Dribble', 'Miscontrol'],
+    'defending': ['Clearance', 'Block', 'Ball Recovery', 'Duel', 'Interception'],
+    'shooting': ['Shot'],
+    'fouls': ['Foul Won'],
+}
+
+# Base resolution of the tensor; 6x5 and 12x8 heatmaps are coarsened from it
+TOUCH_GRID_BINS = (60, 40)
+
+# Bump when the tensor layout changes so stale pickles in the store are ignored
+TOUCH_GRID_STORE_VERSION = 1
+
+
+def build_touch_grid(events_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Count touches per family, player and pitch bin in a single np.add.at pass
+
+    Args:
+        events_df: Tournament events with type, player and x/y columns
+
+    Returns:
+        Dictionary with 'counts' (families x players x nx x ny, uint16),
+        'players' (sorted names, index along axis 1), 'families' and 'bins'
+    """
+    families = list(TOUCH_FAMILIES)
+    type_to_family = {event_type: i for i, family in enumerate(families) for event_type in TOUCH_FAMILIES[family]}
+
+    touches = pd.DataFrame({
+        'family': events_df['type'].map(type_to_family),
+        'player': entity_names(events_df['player']),
+        'x': events_df['x'],
+        'y': events_df['y'],
+    }).dropna()
+
+    player_idx, players = pd.factorize(touches['player'], sort=True)
+    nx, ny = TOUCH_GRID_BINS
+    x_bin = np.clip((touches['x'].to_numpy() * nx / PITCH_LENGTH).astype(int), 0, nx - 1)
+    y_bin = np.clip((touches['y'].to_numpy() * ny / PITCH_WIDTH).astype(int), 0, ny - 1)
+
+    counts = np.zeros((len(families), len(players), nx, ny), dtype=np.uint16)
+    np.add.at(counts, (touches['family'].to_numpy(int), player_idx, x_bin, y_bin), 1)
+
+    return {'counts': counts, 'players': list(players), 'families': families, 'bins': TOUCH_GRID_BINS}
+
+
+@single_flight
+@lru_cache(maxsize=1)
+def load_touch_grid() -> Dict[str, Any]:
+    """Load the tournament touch grid from the store, building and saving it on a miss"""
+    # Tournament-wide, so also keyed on the match list like the standings
+    key = store_key('touch_grid', TOUCH_GRID_STORE_VERSION, matches_version(load_euro_2024_matches()))
+    touch_grid = cache.get(key)
+    if touch_grid is None:
+        touch_grid = build_touch_grid(load_tournament_data())
+        cache.set(key, touch_grid)
+    # Name -> row lookup for slicing
+    touch_grid['player_index'] = {name: i for i, name in enumerate(touch_grid['players'])}
+    return touch_grid
+
+
+def _player_counts(player_name: str, families: Optional[List[str]] = None) -> np.ndarray:
+    touch_grid = load_touch_grid()
+    nx, ny = touch_grid['bins']
+    idx = touch_grid['player_index'].get(player_name)
+    if idx is None:
+        return np.zeros((nx, ny))
+    family_idx = [touch_grid['families'].index(f) for f in (families or touch_grid['families'])]
+    return touch_grid['counts'][family_idx, idx].sum(axis=0, dtype=np.int64)
+
+
+def player_touch_grid(player_name: str, families: Optional[List[str]] = None,
+                      bins: tuple = (6, 5), normalize: bool = True) -> Dict[str, Any]:
+    """
+    Heatmap grid for one player, sliced from the precomputed tensor
+
+    Args:
+        player_name: Player to slice
+        families: Touch families to include (default: all)
+        bins: Output resolution; must divide the tensor's 60x40 base
+        normalize: Return zone shares instead of counts
+
+    Returns:
+        Dictionary in mplsoccer's bin_statistic layout (see spatial.grid_statistic)
+    """
+    return grid_statistic(coarsen(_player_counts(player_name, families), bins), normalize=normalize)
+
+
+def touch_grid_difference(player_a: str, player_b: str, families: Optional[List[str]] = None,
+                          bins: tuple = (6, 5)) -> Dict[str, Any]:
+    """
+    Difference of zone shares between two players (positive where player_a is more active)
+
+    Args:
+        player_a: First player
+        player_b: Second player
+        families: Touch families to include (default: all)
+        bins: Output resolution; must divide the tensor's 60x40 base
+
+    Returns:
+        Dictionary in mplsoccer's bin_statistic layout holding share differences
+    """
+    grid_a = player_touch_grid(player_a, families, bins)
+    grid_b = player_touch_grid(player_b, families, bins)
+    grid_a['statistic'] = grid_a['statistic'] - grid_b['statistic']
+    return grid_a
+
+
+if __name__ == '__main__':
+    load_touch_grid()
+    print("✅ Touch grid stored")
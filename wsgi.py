@@ -0,0 +1,48 @@
+"""
+Production WSGI entry point
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+With preload_app the master imports this module once. The tournament-wide,
+read-only data is loaded here, before the workers are forked, so every worker
+shares those pages copy-on-write instead of loading its own copy.
+Set PRELOAD_DATA=0 to skip the preload (e.g. for quick local checks).
+"""
+
+import gc
+import os
+import time
+from app import app, server
+from utils.data_loader import load_euro_2024_matches, load_tournament_data, get_all_players, get_all_teams, get_team_players
+from utils.standings import get_tournament_tables
+from utils.leaderboards import load_leaderboards
+from utils.touch_grid import load_touch_grid
+from utils.player_metrics import load_player_metrics
+
+
+def preload_shared_data():
+    """Load the data every worker reads, in the master process"""
+    print("🔥 Preloading shared data before fork...")
+    start = time.perf_counter()
+    try:
+        matches = load_euro_2024_matches()
+        events = load_tournament_data()
+        get_all_players()
+        for team in get_all_teams():
+            get_team_players(team)
+        get_tournament_tables()
+        load_leaderboards()
+        load_touch_grid()
+        load_player_metrics()
+        print(f"✅ Preloaded {len(matches)} matches and {len(events)} events in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        print(f"❌ Error preloading data: {e}")
+        print("⚠️  Workers will load data on first use instead")
+
+    # Move everything allocated so far out of the collector's reach, so
+    # collections in the workers do not touch (and copy) the shared pages
+    gc.freeze()
+
+
+if os.environ.get('PRELOAD_DATA', '1') != '0':
+    preload_shared_data()